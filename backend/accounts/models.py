@@ -40,6 +40,8 @@ class VolunteerProfile(models.Model):
     city = models.CharField(max_length=100, blank=True)
     points = models.IntegerField(default=0)
     reliability_score = models.DecimalField(max_digits=2, decimal_places=1, default=0, validators=[MinValueValidator(0), MaxValueValidator(5)],)
+    # ETag של /api/me/; עדכונים ב-update() (reliability_score) לא מזיזים אותו - הם לא ב-/me/
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.full_name
@@ -11,6 +11,8 @@ from google.auth.transport import requests as google_requests
 
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from config import conditional
+
 from .serializers import RegisterVolunteerSerializer, RegisterOrgSerializer, VolunteerProfileSerializer
 from .models import VolunteerProfile
 
@@ -37,27 +39,36 @@ class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        u = request.user
+        # ה-SPA מושך את זה כל הזמן; ETag לפי user + updated_at של הפרופיל -> 304 כשלא השתנה
+        user = request.user
+        profile = getattr(user, "vol_profile", None)
+        version = f"{user.email}|{profile.updated_at.isoformat() if profile else ''}"
+        return conditional.user_response(request, version, lambda: me_payload(user))
 
-        full_name = None
-        city = None
-        points = 0
 
-        # רק אם יש פרופיל מתנדב
-        vol = getattr(u, "vol_profile", None)
-        if vol:
-            full_name = vol.full_name
-            city = vol.city
-            points = vol.points
+def me_payload(u):
+    """
+    גוף התשובה של /api/me/ (משמש גם את /api/dashboard/).
+    """
+    full_name = None
+    city = None
+    points = 0
 
-        return Response({
-            "id": u.id,
-            "email": u.email,
-            "role": getattr(u, "role", None),
-            "full_name": full_name,
-            "city": city,
-            "points": points,
-        })
+    # רק אם יש פרופיל מתנדב
+    vol = getattr(u, "vol_profile", None)
+    if vol:
+        full_name = vol.full_name
+        city = vol.city
+        points = vol.points
+
+    return {
+        "id": u.id,
+        "email": u.email,
+        "role": getattr(u, "role", None),
+        "full_name": full_name,
+        "city": city,
+        "points": points,
+    }
 
 
 # ======================
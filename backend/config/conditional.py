@@ -0,0 +1,119 @@
+"""
+Conditional GET: ETag / Last-Modified ו-304, בלי לבנות את גוף התשובה.
+
+- ל-list / retrieve של ResponseCacheMixin ה-validators נבנים מגרסאות ה-namespaces
+  (config/response_cache.py, קריאה אחת ל-cache, בלי DB) + path / query + למי
+  התשובה (אנונימי / user), כך שמשתמש אחד לא מקבל 304 על תשובה של משתמש אחר.
+  Last-Modified = הזמן שבו הוקפצה לאחרונה אחת הגרסאות.
+  תשובה שתלויה בתאריך (קרובים / היסטוריה) מוסיפה את היום (with_date): בחצות
+  ה-ETag משתנה ו-Last-Modified לא קודם לתחילת היום, גם בלי שום כתיבה.
+  הגרסאות חייבות להיות משותפות לכל ה-workers (Redis): ב-LocMemCache כל תהליך
+  רואה רק את ההקפצות שלו ויחזיר 304 על תוכן ישן. לכן רק כש-CONDITIONAL_GET
+  (ברירת מחדל: יש REDIS_URL, ראו settings).
+- לתשובות קטנות לפי משתמש (/api/me/) ה-ETag נבנה מ-user + גרסה מה-DB
+  (updated_at של הפרופיל) - לא תלוי ב-cache, ולא בונים את הגוף בשביל 304.
+- If-None-Match קודם ל-If-Modified-Since (RFC 9110).
+- Cache-Control: תשובה משותפת -> public + s-maxage (CDN), הדפדפן מאמת מחדש;
+  תשובה אישית -> private, no-cache. תמיד Vary: Authorization.
+"""
+import hashlib
+from datetime import datetime, time
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+DATE_KEY = "date"
+
+
+def enabled():
+    return getattr(settings, "CONDITIONAL_GET", False)
+
+
+def _digest(raw):
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def scope_of(request, shared):
+    if shared:
+        return "anon"
+    user = getattr(request, "user", None)
+    if not (user and user.is_authenticated):
+        return "anon"
+    return f"user:{user.pk}:{getattr(user, 'role', '')}"
+
+
+def namespace_etag(request, versions, scope):
+    params = sorted(request.query_params.lists())
+    raw = f"{request.path}?{params}|{scope}|" + "|".join(
+        f"{ns}={versions[ns]}" for ns in sorted(versions)
+    )
+    # weak: אותו תוכן, לא בהכרח אותם bytes (gzip / renderer)
+    return f'W/"{_digest(raw)}"'
+
+
+def with_date(current, last_modified):
+    """
+    (versions, last_modified) של תשובה שתלויה ב-localdate -> אותו דבר + היום.
+    """
+    today = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+    return {**current, DATE_KEY: today.isoformat()}, max(last_modified, int(day_start.timestamp()))
+
+
+def user_etag(request, version):
+    return f'W/"{_digest(f"{scope_of(request, shared=False)}|{version}")}"'
+
+
+def _opaque(tag):
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request, etag, last_modified=None):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        tags = parse_etags(if_none_match)
+        return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+    if last_modified is not None:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+        return since is not None and int(last_modified) <= since
+    return False
+
+
+def finalize(response, etag, last_modified=None, shared=False, s_maxage=None):
+    """
+    מוסיף validators ו-Cache-Control לתשובה 200 / 304. Cache-Control שה-view כבר
+    קבע (למשל /page/) נשאר.
+    """
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        if etag is not None:
+            response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        if not response.has_header("Cache-Control"):
+            if shared:
+                patch_cache_control(response, public=True, max_age=0, s_maxage=s_maxage or 0)
+            else:
+                patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
+
+
+def not_modified(etag, last_modified=None, shared=False, s_maxage=None):
+    return finalize(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified, shared, s_maxage)
+
+
+def user_response(request, version, build):
+    """
+    Response(build()) אישי, או 304 בלי לקרוא ל-build().
+    version: משתנה בכל שינוי של מה שהתשובה נבנית ממנו.
+    """
+    etag = user_etag(request, version)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return finalize(Response(build()), etag)
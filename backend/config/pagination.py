@@ -0,0 +1,169 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination לפי ה-ordering האמיתי של כל view.
+
+    ה-cursor שומר את ערכי שדות ה-ordering של השורה האחרונה בעמוד,
+    והעמוד הבא מסונן ב-WHERE (date, id) > (...) במקום OFFSET,
+    כך שעלות עמוד נשארת קבועה גם בעומק.
+
+    Opt-in: בלי ?cursor= / ?page_size= / ?paginate=1 מוחזרת רשימה שטוחה
+    (תאימות לקליינטים ישנים בזמן המעבר).
+
+    ה-view קובע ordering דרך get_cursor_ordering() או cursor_ordering,
+    והשדה האחרון חייב להיות ייחודי (בד"כ id).
+    """
+
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    opt_in_query_param = "paginate"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def is_requested(self, request):
+        params = request.query_params
+        if self.cursor_query_param in params or self.page_size_query_param in params:
+            return True
+        return str(params.get(self.opt_in_query_param, "")).lower() in ("1", "true", "yes")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(view)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+
+        qs = queryset.order_by(*ordering)
+        if cursor:
+            try:
+                qs = qs.filter(self._after(ordering, cursor["v"]))
+            except (ValidationError, TypeError, ValueError):
+                # ערך שלא מתאים לסוג השדה (למשל תאריך לא תקין) -> 404 ולא 500
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(qs[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    # ======================
+    # helpers
+    # ======================
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw else self.page_size
+        except (TypeError, ValueError):
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, view):
+        getter = getattr(view, "get_cursor_ordering", None)
+        if callable(getter):
+            ordering = getter()
+        else:
+            ordering = getattr(view, "cursor_ordering", None) or self.ordering
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, instance, reverse):
+        values = [self._dump(getattr(instance, f.lstrip("-"))) for f in self.ordering]
+        raw = json.dumps({"v": values, "r": 1 if reverse else 0}, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            values = data["v"]
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return {"v": values, "r": bool(data.get("r"))}
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+            return value.isoformat()
+        if value is None or isinstance(value, (int, str, bool)):
+            return value
+        return str(value)
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+    @staticmethod
+    def _after(ordering, values):
+        """
+        (a, b) > (x, y)  ->  a > x OR (a = x AND b > y)
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip("-")
+            op = "lt" if field.startswith("-") else "gt"
+            term = Q(**{f"{name}__{op}": values[i]})
+            for prev, value in zip(ordering[:i], values[:i]):
+                term &= Q(**{prev.lstrip("-"): value})
+            condition |= term
+        return condition
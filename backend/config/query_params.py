@@ -0,0 +1,18 @@
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+def parse_date_param(params, name):
+    """
+    ?date_from= / ?date_to= -> date או None; פורמט שגוי -> 400.
+    """
+    raw = (params.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = parse_date(raw)
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Expected YYYY-MM-DD"})
+    return value
@@ -0,0 +1,271 @@
+"""
+Cache לתשובות ציבוריות (אנונימיות) של list / retrieve, מעל Django cache framework
+(CACHES["responses"]: LocMemCache עם LRU חסום בגודל כברירת מחדל, Redis בפרודקשן).
+
+- לכל namespace ("events", "campaigns", "orgs", "org:<profile id>") יש מונה גרסה.
+  המפתח של כל תשובה כולל את הגרסאות של ה-namespaces שלה, כך ש-invalidate(ns)
+  הוא increment אחד - הרשומות הישנות פשוט לא נקראות יותר ויוצאות ב-LRU / TTL.
+- הגרסאות מוקפצות מ-signals (post_save / post_delete) ומקוד שמעדכן ב-update()
+  (מונים), תמיד אחרי commit.
+- TTL לכל רשומה (response_cache_ttl ב-view, ברירת מחדל RESPONSE_CACHE_TTL).
+- stampede: רק בקשה אחת מחשבת רשומה חסרה (cache.add כמנעול); האחרות
+  מחכות לה עד LOCK_WAIT ורק אז מחשבות בעצמן.
+- מוני hit / miss לכל namespace (בתהליך), ו-X-Cache בתשובה.
+- ETag / Last-Modified ו-304 מאותן גרסאות, לכל משתמש (config/conditional.py) -
+  רק עם cache משותף (CONDITIONAL_GET).
+"""
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from . import conditional
+
+
+CACHE_ALIAS = "responses"
+KEY_PREFIX = "rc"
+LOCK_TTL = 10
+LOCK_WAIT = 2.0
+LOCK_POLL = 0.05
+
+# כותרות שנשמרות יחד עם הנתונים (למשל Cache-Control של /page/)
+KEPT_HEADERS = ("Cache-Control",)
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def default_ttl():
+    return getattr(settings, "RESPONSE_CACHE_TTL", 60)
+
+
+# ======================
+# גרסאות
+# ======================
+def _version_key(namespace):
+    return f"{KEY_PREFIX}:v:{namespace}"
+
+
+def _initial_version():
+    # לא מתחילים מ-1: אם מפתח הגרסה נזרק מה-cache, גרסה חדשה לא תתנגש ברשומות ישנות
+    return int(time.time() * 1000)
+
+
+def _modified_key(namespace):
+    return f"{KEY_PREFIX}:t:{namespace}"
+
+
+def _stored(cache, found, key, initial):
+    value = found.get(key)
+    if value is None:
+        value = initial()
+        if not cache.add(key, value, timeout=None):
+            value = cache.get(key, value)
+    return value
+
+
+def namespace_state(namespaces):
+    """
+    -> ({namespace: version}, last_modified) בקריאה אחת ל-cache.
+    last_modified: unix time של ההקפצה האחרונה באחד ה-namespaces
+    (אם אין - עכשיו, כך שלקוח עם תאריך ישן מקבל 200).
+    """
+    cache = get_cache()
+    found = cache.get_many(
+        [_version_key(ns) for ns in namespaces] + [_modified_key(ns) for ns in namespaces]
+    )
+    current = {}
+    last_modified = 0
+    for ns in namespaces:
+        current[ns] = _stored(cache, found, _version_key(ns), _initial_version)
+        last_modified = max(
+            last_modified, _stored(cache, found, _modified_key(ns), lambda: int(time.time()))
+        )
+    return current, last_modified
+
+
+def versions(namespaces):
+    return namespace_state(namespaces)[0]
+
+
+def bump(namespace):
+    cache = get_cache()
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # אין גרסה עדיין - כל ערך חדש טוב
+        cache.set(key, _initial_version(), timeout=None)
+    cache.set(_modified_key(namespace), int(time.time()), timeout=None)
+
+
+def invalidate(*namespaces):
+    """
+    מקפיץ גרסאות אחרי commit (בתוך transaction: רק אם היא מצליחה).
+    """
+    namespaces = {ns for ns in namespaces if ns}
+    if not namespaces:
+        return
+
+    def run():
+        for ns in sorted(namespaces):
+            bump(ns)
+
+    transaction.on_commit(run)
+
+
+# ======================
+# מונים
+# ======================
+def _count(namespace, outcome):
+    with _counters_lock:
+        _counters[(namespace, outcome)] += 1
+
+
+def stats():
+    """
+    -> {namespace: {"hit": n, "miss": n}}
+    """
+    with _counters_lock:
+        items = list(_counters.items())
+    out = {}
+    for (namespace, outcome), n in items:
+        out.setdefault(namespace, {"hit": 0, "miss": 0})[outcome] = n
+    return out
+
+
+def reset_stats():
+    with _counters_lock:
+        _counters.clear()
+
+
+# ======================
+# תשובות
+# ======================
+def entry_key(request, namespaces, current=None):
+    current = current or versions(namespaces)
+    params = sorted(request.query_params.lists())
+    raw = f"{request.get_host()}{request.path}?{params}|" + "|".join(
+        f"{ns}={current[ns]}" for ns in sorted(current)
+    )
+    return f"{KEY_PREFIX}:e:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+def _from_entry(entry, outcome):
+    status_code, data, headers = entry
+    response = Response(data, status=status_code)
+    for name, value in headers.items():
+        response[name] = value
+    response["X-Cache"] = outcome
+    return response
+
+
+def cached_response(request, namespaces, compute, ttl=None, current=None):
+    """
+    compute() -> Response. נשמרות רק תשובות 200.
+    current: גרסאות שכבר נקראו (namespace_state).
+    """
+    cache = get_cache()
+    label = namespaces[0]
+    key = entry_key(request, namespaces, current)
+
+    entry = cache.get(key)
+    if entry is not None:
+        _count(label, "hit")
+        return _from_entry(entry, "HIT")
+
+    lock_key = f"{key}:lock"
+    if not cache.add(lock_key, 1, timeout=LOCK_TTL):
+        # מישהו אחר כבר מחשב - מחכים לתוצאה שלו
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            entry = cache.get(key)
+            if entry is not None:
+                _count(label, "hit")
+                return _from_entry(entry, "HIT")
+        lock_key = None
+
+    _count(label, "miss")
+    try:
+        response = compute()
+        if response.status_code == 200:
+            headers = {name: response[name] for name in KEPT_HEADERS if response.has_header(name)}
+            cache.set(key, (response.status_code, response.data, headers), timeout=ttl or default_ttl())
+        response["X-Cache"] = "MISS"
+        return response
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+class ResponseCacheMixin:
+    """
+    list / retrieve (ו-actions ב-response_cache_actions):
+    - ETag / Last-Modified לפי גרסאות ה-namespaces (+ היום אם
+      response_depends_on_date); 304 לפני שה-view רץ בכלל. רק כש-CONDITIONAL_GET
+    - משתמשים לא מחוברים (ו-response_cache_shared_actions) עוברים דרך cached_response
+    ה-view מגדיר response_cache_namespaces().
+    """
+    response_cache_actions = ("list", "retrieve")
+    # actions שהתשובה שלהן זהה גם למשתמשים מחוברים
+    response_cache_shared_actions = ()
+    response_cache_ttl = None
+
+    def response_cache_namespaces(self):
+        raise NotImplementedError
+
+    def response_depends_on_date(self, request):
+        """
+        True כשהתשובה משתנה עם timezone.localdate() (למשל ?status=upcoming).
+        """
+        return False
+
+    def is_response_shared(self, request):
+        if self.action in self.response_cache_shared_actions:
+            return True
+        user = getattr(request, "user", None)
+        return not (user and user.is_authenticated)
+
+    def cached(self, request, compute):
+        if request.method != "GET" or self.action not in self.response_cache_actions:
+            return compute()
+
+        namespaces = self.response_cache_namespaces()
+        shared = self.is_response_shared(request)
+        ttl = self.response_cache_ttl or default_ttl()
+        current, last_modified = namespace_state(namespaces)
+        if self.response_depends_on_date(request):
+            # גם רשומות ה-cache: בחצות "קרובים" הופך ל"היסטוריה"
+            current, last_modified = conditional.with_date(current, last_modified)
+
+        etag = None
+        if conditional.enabled():
+            etag = conditional.namespace_etag(request, current, conditional.scope_of(request, shared))
+            if conditional.is_not_modified(request, etag, last_modified):
+                return conditional.not_modified(etag, last_modified, shared, s_maxage=ttl)
+        else:
+            last_modified = None
+
+        if shared:
+            response = cached_response(request, namespaces, compute, ttl=ttl, current=current)
+        else:
+            response = compute()
+        return conditional.finalize(response, etag, last_modified, shared, s_maxage=ttl)
+
+    def list(self, request, *args, **kwargs):
+        handler = super().list
+        return self.cached(request, lambda: handler(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        handler = super().retrieve
+        return self.cached(request, lambda: handler(request, *args, **kwargs))
@@ -78,6 +78,7 @@ from corsheaders.defaults import default_headers
 
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "authorization",
+    "idempotency-key",
 ]
 # -----------------------------
 # REST / JWT
@@ -89,6 +90,9 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # Keyset pagination (opt-in: ?cursor= / ?page_size= / ?paginate=1)
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
 SIMPLE_JWT = {
@@ -104,6 +108,11 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 # -----------------------------
 DATABASE_URL = os.getenv("DATABASE_URL")
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "")
+STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "")
+# לבדיקות / benchmark מקומי מול manage.py fake_stripe
+STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE", "https://api.stripe.com")
+# תרומות PENDING ישנות מזה מנוקות ע"י manage.py sweep_pending_donations
+DONATION_PENDING_TTL_HOURS = int(os.environ.get("DONATION_PENDING_TTL_HOURS", "24"))
 
 if DATABASE_URL:
     # Supabase/Render Postgres
@@ -154,3 +163,41 @@ STORAGES = {
 
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# -----------------------------
+# Cache
+# -----------------------------
+# "responses": config/response_cache.py (תשובות ציבוריות, מפתחות לפי גרסה).
+# מקומית: LocMemCache - LRU; CULL_FREQUENCY == MAX_ENTRIES -> כשמתמלא נזרקת רק
+# הרשומה שהכי מזמן לא נקראה. בפרודקשן עם כמה workers: REDIS_URL (חבילת redis).
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", "60"))
+REDIS_URL = os.environ.get("REDIS_URL", "")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default",
+    },
+    "responses": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "voluntrack",
+        }
+        if REDIS_URL
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "responses",
+            "OPTIONS": {
+                "MAX_ENTRIES": RESPONSE_CACHE_MAX_ENTRIES,
+                "CULL_FREQUENCY": RESPONSE_CACHE_MAX_ENTRIES,
+            },
+        }
+    ),
+}
+
+# Conditional GET (ETag / 304) ב-list / retrieve נבנה מגרסאות ה-namespaces ב-"responses".
+# ב-LocMemCache הגרסאות הן לכל תהליך: worker שלא ראה שינוי יחזיר 304 על תוכן ישן.
+# לכן כברירת מחדל רק עם REDIS_URL; CONDITIONAL_GET=1 בלי Redis - רק לתהליך יחיד.
+CONDITIONAL_GET = os.environ.get("CONDITIONAL_GET", "1" if REDIS_URL else "0") == "1"
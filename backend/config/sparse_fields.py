@@ -0,0 +1,113 @@
+"""
+Sparse fieldsets ב-GET: ?fields=a,b (רק אלה) / ?omit=c,d (הכל חוץ מאלה).
+
+- SparseFieldsMixin (serializer): מוריד שדות מהתשובה. "id" נשאר תמיד;
+  שמות לא מוכרים מתעלמים מהם.
+- SparseQuerysetMixin (view): מצמצם גם את ה-SELECT ל-.only() של העמודות שהשדות
+  שנשארו צריכים. שדה שהוא עמודה באותו שם - העמודה; שדה שקורא עמודות אחרות
+  (דרך יחס) מצהיר עליהן ב-Meta.sparse_sources; שאר השדות (annotations,
+  SerializerMethodField על annotation) לא מוסיפים עמודות.
+  נוספים תמיד: pk, עמודות המיון (keyset) ומסלולי select_related.
+"""
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+ALWAYS = ("id",)
+
+
+def _names(raw):
+    names = {name.strip() for name in (raw or "").split(",") if name.strip()}
+    return names or None
+
+
+def requested(request):
+    """
+    -> (fields, omit), כל אחד set או None.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    params = request.query_params
+    return _names(params.get("fields")), _names(params.get("omit"))
+
+
+def selected(available, request):
+    """
+    available: שמות השדות של ה-serializer לפי הסדר -> השמות שנשארים.
+    """
+    fields, omit = requested(request)
+    return [
+        name for name in available
+        if name in ALWAYS or ((fields is None or name in fields) and name not in (omit or ()))
+    ]
+
+
+class SparseFieldsMixin:
+    def get_fields(self):
+        fields = super().get_fields()
+        # רק ה-serializer הראשי (גם many=True), לא שדות מקוננים
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+        return {name: fields[name] for name in selected(list(fields), self.context.get("request"))}
+
+
+def columns(serializer_class, names):
+    """
+    העמודות שהשדות names של serializer_class צריכים (בלי pk / מיון / יחסים).
+    """
+    meta = serializer_class.Meta
+    concrete = {field.name for field in meta.model._meta.concrete_fields}
+    sources = getattr(meta, "sparse_sources", {})
+    out = set()
+    for name in names:
+        if name in sources:
+            out.update(sources[name])
+        elif name in concrete:
+            out.add(name)
+    return out
+
+
+def _select_related_paths(related, prefix=""):
+    if not isinstance(related, dict):
+        return []
+    paths = []
+    for name, nested in related.items():
+        path = f"{prefix}{name}"
+        paths.append(path)
+        paths.extend(_select_related_paths(nested, f"{path}__"))
+    return paths
+
+
+class SparseQuerysetMixin:
+    """
+    ב-get_queryset של list / retrieve: return self.sparse_queryset(qs).
+    """
+
+    def sparse_field_names(self, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        serializer = serializer_class(context=self.get_serializer_context())
+        return list(serializer.fields)
+
+    def sparse_queryset(self, qs, serializer_class=None, extra=()):
+        if self.request.method not in SAFE_METHODS:
+            return qs
+
+        serializer_class = serializer_class or self.get_serializer_class()
+        model = serializer_class.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+
+        needed = columns(serializer_class, self.sparse_field_names(serializer_class))
+        needed.add(model._meta.pk.name)
+        needed.update(extra)
+        ordering = list(qs.query.order_by or model._meta.ordering)
+        getter = getattr(self, "get_cursor_ordering", None)
+        ordering += list(getter() if callable(getter) else getattr(self, "cursor_ordering", None) or ())
+        needed.update(
+            name.lstrip("-") for name in ordering
+            if isinstance(name, str) and name.lstrip("-") in concrete
+        )
+        needed.update(_select_related_paths(qs.query.select_related))
+        return qs.only(*sorted(needed))
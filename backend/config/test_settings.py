@@ -0,0 +1,17 @@
+"""
+הגדרות להרצת הטסטים (manage.py test בוחר אותן כברירת מחדל).
+
+SQLite מקומי: SignupCapacityTests מריץ הרשמות / ביטולים במקביל מכמה threads.
+- DB טסטים בקובץ: ב-in-memory (shared cache) נעילה תפוסה נכשלת מיד
+  ("database table is locked"), בלי busy timeout
+- transaction_mode=IMMEDIATE + timeout: נעילת הכתיבה נלקחת ב-BEGIN ומחכים לה,
+  במקום ששדרוג נעילה באמצע טרנזקציה ייכשל ב-"database is locked"
+בפיתוח (runserver) ובפרודקשן (Postgres) זה לא נדרש, ולכן לא ב-settings.py.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"]["OPTIONS"] = {"transaction_mode": "IMMEDIATE", "timeout": 20}
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db.sqlite3"}
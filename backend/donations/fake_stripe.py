@@ -0,0 +1,236 @@
+"""
+שרת HTTP מקומי שמחקה את החלק של Stripe API שאנחנו משתמשים בו (PaymentIntents),
+לבדיקות ול-benchmark בלי רשת:
+
+    with FakeStripe() as fake:          # מפנה את stripe.api_base לשרת
+        fake.add_intent(status="succeeded", metadata={"donation_id": "1"})
+        sync_payment_intents(make_client(api_key="sk_test", api_base=fake.url))
+
+או כשרת עצמאי: manage.py fake_stripe --port 12111 --intents 5000
+(ואז STRIPE_API_BASE=http://127.0.0.1:12111).
+
+נתמך: create (עם Idempotency-Key), retrieve, update, list
+(limit / starting_after / created[gte], מהחדש לישן). rate_limit_every=N מחזיר 429
+לכל בקשה N-ית. requests / connections נספרים (לבדיקת keep-alive).
+"""
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import stripe
+
+
+_INTENT_PATH = re.compile(r"^/v1/payment_intents/(?P<id>[^/]+)$")
+_KEY = re.compile(r"^([^\[]+)((?:\[[^\]]*\])*)$")
+
+
+def decode_params(raw):
+    """
+    "metadata[donation_id]=5&created[gte]=10" -> {"metadata": {"donation_id": "5"}, "created": {"gte": "10"}}
+    """
+    out = {}
+    for name, value in parse_qsl(raw, keep_blank_values=True):
+        match = _KEY.match(name)
+        if not match:
+            continue
+        parts = [match.group(1)] + re.findall(r"\[([^\]]*)\]", match.group(2))
+        node = out
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+    return out
+
+
+class FakeStripe:
+    def __init__(self, rate_limit_every=0, latency=0.0):
+        self.rate_limit_every = rate_limit_every
+        self.latency = latency
+        self.intents = {}
+        self.idempotency = {}
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._server = None
+        self._thread = None
+        self._saved_api_base = None
+
+    # ======================
+    # data
+    # ======================
+    def add_intent(self, amount=1000, currency="ils", status="requires_payment_method",
+                   metadata=None, created=None, **extra):
+        with self.lock:
+            number = next(self._ids)
+            intent = {
+                "id": f"pi_fake_{number:08d}",
+                "object": "payment_intent",
+                "amount": int(amount),
+                "currency": currency,
+                "status": status,
+                "client_secret": f"pi_fake_{number:08d}_secret_{number}",
+                "metadata": dict(metadata or {}),
+                "created": int(created if created is not None else time.time()),
+                "last_payment_error": None,
+                **extra,
+            }
+            self.intents[intent["id"]] = intent
+            return intent
+
+    def list_intents(self, params):
+        limit = max(1, min(int(params.get("limit") or 10), 100))
+        gte = (params.get("created") or {}).get("gte")
+        rows = sorted(
+            (i for i in self.intents.values() if gte is None or i["created"] >= int(gte)),
+            key=lambda i: (i["created"], i["id"]),
+            reverse=True,
+        )
+        after = params.get("starting_after")
+        if after:
+            ids = [i["id"] for i in rows]
+            rows = rows[ids.index(after) + 1:] if after in ids else []
+        return {
+            "object": "list",
+            "url": "/v1/payment_intents",
+            "data": rows[:limit],
+            "has_more": len(rows) > limit,
+        }
+
+    # ======================
+    # server
+    # ======================
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self, port=0, patch_stripe=True):
+        fake = self
+
+        class Handler(_Handler):
+            pass
+
+        Handler.fake = fake
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        if patch_stripe:
+            self._saved_api_base = stripe.api_base
+            stripe.api_base = self.url
+        return self
+
+    def stop(self):
+        if self._saved_api_base is not None:
+            stripe.api_base = self._saved_api_base
+            self._saved_api_base = None
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake = None
+    protocol_version = "HTTP/1.1"  # keep-alive, כמו Stripe
+
+    def setup(self):
+        super().setup()
+        with self.fake.lock:
+            self.fake.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        fake = self.fake
+        split = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+        params = decode_params(split.query if method == "GET" else body)
+
+        with fake.lock:
+            fake.requests += 1
+            limited = fake.rate_limit_every and fake.requests % fake.rate_limit_every == 0
+        if fake.latency:
+            time.sleep(fake.latency)
+        if limited:
+            return self._send(429, _error("rate_limit_error", "Too many requests", code="rate_limit"),
+                              {"Retry-After": "0"})
+
+        if split.path == "/v1/payment_intents":
+            if method == "GET":
+                with fake.lock:
+                    return self._send(200, fake.list_intents(params))
+            return self._create(params)
+
+        match = _INTENT_PATH.match(split.path)
+        if not match:
+            return self._send(404, _error("invalid_request_error", f"Unrecognized request URL ({split.path})"))
+
+        with fake.lock:
+            intent = fake.intents.get(match.group("id"))
+            if intent is None:
+                return self._send(404, _error("invalid_request_error", "No such payment_intent",
+                                              code="resource_missing"))
+            if method == "POST":
+                if "amount" in params:
+                    intent["amount"] = int(params["amount"])
+                if "currency" in params:
+                    intent["currency"] = params["currency"]
+                if "metadata" in params:
+                    intent["metadata"].update(params["metadata"])
+            return self._send(200, intent)
+
+    def _create(self, params):
+        fake = self.fake
+        key = self.headers.get("Idempotency-Key")
+        if key:
+            with fake.lock:
+                existing = fake.idempotency.get(key)
+            if existing:
+                return self._send(200, fake.intents[existing], {"Idempotent-Replayed": "true"})
+
+        intent = fake.add_intent(
+            amount=params.get("amount") or 0,
+            currency=params.get("currency") or "ils",
+            metadata=params.get("metadata"),
+        )
+        if key:
+            with fake.lock:
+                fake.idempotency[key] = intent["id"]
+        return self._send(200, intent)
+
+    def _send(self, code, payload, headers=None):
+        raw = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("Request-Id", f"req_fake_{self.fake.requests}")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def _error(kind, message, code=None):
+    error = {"type": kind, "message": message}
+    if code:
+        error["code"] = code
+    return {"error": error}
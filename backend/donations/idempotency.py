@@ -0,0 +1,94 @@
+"""
+Idempotency-Key ל-POST /api/donations/ (כמו ב-Stripe):
+
+- אותו מפתח + אותו גוף -> התשובה השמורה, עם Idempotent-Replayed: true
+- אותו מפתח + גוף אחר -> 422
+- ה-scope: user מחובר -> המפתחות שלו; אנונימי -> hash של הלקוח (IP) + הגוף,
+  כך שאורח אחר עם אותו מפתח לא מקבל את התשובה השמורה (ואת פרטי התרומה).
+  לאנונימי גוף אחר הוא פשוט scope אחר (בקשה חדשה), לא 422.
+- המפתח נשמר באותה transaction עם התרומה: בקשה מקבילה עם אותו מפתח
+  נחסמת על ה-unique עד שהראשונה מסתיימת, ואז מקבלת את התשובה שלה.
+- מפתחות ישנים מ-IDEMPOTENCY_KEY_TTL לא נחשבים (ונמחקים כשנתקלים בהם).
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .models import IdempotencyKey
+
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+def key_from(request):
+    key = (request.headers.get(HEADER) or "").strip()
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError({HEADER: f"At most {MAX_KEY_LENGTH} characters"})
+    return key
+
+
+def fingerprint(data):
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def scope_of(request, request_hash):
+    user = request.user
+    if user and user.is_authenticated:
+        return f"user:{user.pk}"
+    # אותו זיהוי לקוח כמו ב-throttling של DRF (X-Forwarded-For / REMOTE_ADDR)
+    client = BaseThrottle().get_ident(request)
+    return "anon:" + hashlib.sha256(f"{client}|{request_hash}".encode("utf-8")).hexdigest()[:32]
+
+
+def _replay(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return Response(
+            {"detail": f"{HEADER} was already used with a different request body"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(stored.response_body, status=stored.response_status)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def run_once(request, key, create):
+    """
+    create() -> (Response, donation) ; רץ רק אם המפתח לא נראה קודם.
+    """
+    request_hash = fingerprint(request.data)
+    scope = scope_of(request, request_hash)
+
+    IdempotencyKey.objects.filter(
+        scope=scope, key=key, created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL
+    ).delete()
+
+    stored = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+    if stored is not None:
+        return _replay(stored, request_hash)
+
+    try:
+        with transaction.atomic():
+            row = IdempotencyKey.objects.create(scope=scope, key=key, request_hash=request_hash)
+            response, donation = create()
+            row.donation = donation
+            row.response_status = response.status_code
+            row.response_body = json.loads(json.dumps(response.data, default=str))
+            row.save(update_fields=["donation", "response_status", "response_body"])
+    except IntegrityError:
+        # בקשה מקבילה עם אותו מפתח הספיקה לפנינו
+        stored = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+        if stored is None:
+            raise
+        return _replay(stored, request_hash)
+
+    return response
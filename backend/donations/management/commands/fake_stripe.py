@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from donations.fake_stripe import FakeStripe
+
+
+class Command(BaseCommand):
+    help = "Run a local fake Stripe API (PaymentIntents) for offline testing and benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=12111)
+        parser.add_argument("--intents", type=int, default=0, help="Seed N succeeded payment intents.")
+        parser.add_argument("--rate-limit-every", type=int, default=0, help="Return 429 for every Nth request.")
+        parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+
+    def handle(self, *args, **options):
+        fake = FakeStripe(rate_limit_every=options["rate_limit_every"], latency=options["latency"])
+        for _ in range(options["intents"]):
+            fake.add_intent(status="succeeded")
+        fake.start(port=options["port"], patch_stripe=False)
+
+        self.stdout.write(self.style.SUCCESS(f"Fake Stripe on {fake.url} - set STRIPE_API_BASE={fake.url}"))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            fake.stop()
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from donations.webhooks import process_inbox
+
+
+class Command(BaseCommand):
+    help = "Process pending Stripe webhook events from the StripeEvent inbox in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the inbox.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_inbox(batch_size=options["batch_size"])
+            if processed or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(f"Processed {processed} events"))
+            if not options["loop"]:
+                return
+            time.sleep(options["sleep"])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from donations.totals import reconcile_donation_totals
+
+
+class Command(BaseCommand):
+    help = "Recompute campaign raised_amount / donors_count and per-org donation totals from PAID donations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        campaigns, orgs = reconcile_donation_totals(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Fixed {campaigns} campaigns, rebuilt totals for {orgs} organizations"))
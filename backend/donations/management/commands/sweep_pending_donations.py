@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from donations.sweeper import SWEEP_CHUNK_SIZE, pending_ttl, sweep_stale_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark old PENDING donations FAILED (abandoned without a PaymentIntent, or expired), "
+        "in small keyset-ordered chunks. Run from cron, or with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-hours", type=float, default=None,
+            help="Default: DONATION_PENDING_TTL_HOURS.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=SWEEP_CHUNK_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds between chunks.")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--loop", action="store_true", help="Sweep again every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=3600.0)
+
+    def handle(self, *args, **options):
+        older_than = pending_ttl()
+        if options["older_than_hours"] is not None:
+            older_than = timedelta(hours=options["older_than_hours"])
+
+        while True:
+            result = sweep_stale_pending(
+                older_than=older_than,
+                chunk_size=options["chunk_size"],
+                pause=options["pause"],
+                dry_run=options["dry_run"],
+            )
+            prefix = "[dry run] " if options["dry_run"] else ""
+            self.stdout.write(self.style.SUCCESS(
+                f"{prefix}{result['abandoned']} abandoned, {result['expired']} expired, "
+                f"{result['idempotency_keys']} idempotency keys removed ({result['chunks']} chunks)"
+            ))
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
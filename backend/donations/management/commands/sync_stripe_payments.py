@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from donations.stripe_sync import PAGE_SIZE, make_client, sync_payment_intents
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconcile Donation.status / stripe_payment_status with recent Stripe PaymentIntents, "
+        "page by page (resumes from the last checkpoint)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+        parser.add_argument("--max-pages", type=int, default=None, help="Stop after N pages; the next run resumes.")
+        parser.add_argument("--since-hours", type=float, default=None, help="Ignore the checkpoint and start from N hours ago.")
+        parser.add_argument("--api-base", default=None, help="Stripe API base URL (e.g. manage.py fake_stripe).")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since_hours"] is not None:
+            since = timezone.now() - timedelta(hours=options["since_hours"])
+
+        result = sync_payment_intents(
+            client=make_client(api_base=options["api_base"]),
+            since=since,
+            page_size=options["page_size"],
+            max_pages=options["max_pages"],
+        )
+        state = "done" if result["done"] else "paused (checkpoint saved)"
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['pages']} pages, {result['intents']} payment intents, "
+            f"{result['updated']} donations updated - {state}"
+        ))
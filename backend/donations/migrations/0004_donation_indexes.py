@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+
+from config.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('donations', '0003_donation_currency_donation_status_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['organization', '-created_at'], name='donation_org_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['donor_user', '-created_at'], name='donation_donor_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['status', 'created_at'], name='donation_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='donationcampaign',
+            index=models.Index(fields=['is_active', '-created_at'], name='campaign_active_created_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from config.migration_operations import AddIndexConcurrently
+
+
+def fill_totals(apps, schema_editor):
+    Donation = apps.get_model('donations', 'Donation')
+    DonationCampaign = apps.get_model('donations', 'DonationCampaign')
+    OrgDonationStats = apps.get_model('donations', 'OrgDonationStats')
+
+    paid = Donation.objects.filter(campaign=OuterRef('pk'), status='PAID').order_by().values('campaign')
+    DonationCampaign.objects.update(
+        raised_amount=Coalesce(Subquery(paid.annotate(t=Sum('amount')).values('t')[:1]), 0),
+        donors_count=Coalesce(Subquery(
+            paid.annotate(
+                d=Count('donor_user', distinct=True) + Count('pk', filter=Q(donor_user__isnull=True))
+            ).values('d')[:1]
+        ), 0),
+    )
+
+    rows = (
+        Donation.objects
+        .filter(status='PAID', organization__isnull=False)
+        .order_by()
+        .values('organization_id')
+        .annotate(total=Sum('amount'), count=Count('pk'))
+    )
+    OrgDonationStats.objects.bulk_create(
+        [
+            OrgDonationStats(
+                organization_id=row['organization_id'],
+                raised_amount=row['total'],
+                donations_count=row['count'],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('donations', '0004_donation_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrgDonationStats',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='donation_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('raised_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('donations_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='donationcampaign',
+            name='donors_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='donationcampaign',
+            name='raised_amount',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AlterField(
+            model_name='donation',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PAID', 'Paid'), ('FAILED', 'Failed'), ('REFUNDED', 'Refunded')], default='PENDING', max_length=20),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['campaign', 'donor_user', 'status'], name='donation_campaign_donor_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='donation',
+            index=models.Index(fields=['stripe_payment_intent_id'], name='donation_stripe_pi_idx'),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -20,9 +20,31 @@ class DonationCampaign(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # --- מונים (donations/totals.py) ---
+    # מתעדכנים ב-webhook כשתרומה עוברת ל/מ-PAID; לתיקון: manage.py reconcile_donation_totals
+    raised_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    # תורמים שונים (מחובר = לפי משתמש, אנונימי = כל תרומה)
+    donors_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("raised_amount", "donors_count")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_active", "-created_at"], name="campaign_active_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.organization_id})"
 
+    def save(self, *args, **kwargs):
+        if kwargs.get("update_fields") is None and not self._state.adding:
+            # המונים מתעדכנים רק ב-UPDATE אטומי; save() רגיל לא דורס אותם
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 
 class Donation(models.Model):
     """
@@ -46,6 +68,7 @@ class Donation(models.Model):
             ("PENDING", "Pending"),
             ("PAID", "Paid"),
             ("FAILED", "Failed"),
+            ("REFUNDED", "Refunded"),
         ],
     )
 
@@ -80,6 +103,120 @@ class Donation(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["organization", "-created_at"], name="donation_org_created_idx"),
+            models.Index(fields=["donor_user", "-created_at"], name="donation_donor_created_idx"),
+            models.Index(fields=["status", "created_at"], name="donation_status_created_idx"),
+            # donors_count: האם לתורם כבר יש תרומה ששולמה בקמפיין
+            models.Index(fields=["campaign", "donor_user", "status"], name="donation_campaign_donor_idx"),
+            # charge.refunded מגיע עם payment_intent בלבד
+            models.Index(fields=["stripe_payment_intent_id"], name="donation_stripe_pi_idx"),
+        ]
+
     def __str__(self):
         who = self.donor_name or "אנונימי"
         return f"Donation ₪{self.amount} to org#{self.organization_id} by {who}"
+
+
+class OrgDonationStats(models.Model):
+    """
+    סך התרומות ששולמו לעמותה, מתוחזק ב-donations/totals.py.
+    לתיקון: manage.py reconcile_donation_totals
+    """
+    organization = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="donation_stats",
+    )
+
+    raised_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    donations_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"donation stats for org#{self.organization_id}"
+
+
+class StripeEvent(models.Model):
+    """
+    Inbox של אירועי Stripe: ה-webhook רק שומר (append-only, ייחודי לפי event id)
+    ומחזיר 200; donations/webhooks.py מעבד במנות (manage.py process_stripe_events).
+    """
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    # event.created של Stripe - הסדר בין אירועים של אותה תרומה
+    stripe_created = models.DateTimeField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # תור הממתינים בלבד (partial index)
+            models.Index(
+                fields=["stripe_created", "id"],
+                name="stripe_event_pending_idx",
+                condition=models.Q(processed_at__isnull=True),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.event_id}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Idempotency-Key של POST /api/donations/: התשובה הראשונה נשמרת
+    ומוחזרת שוב ב-replay (לחיצה כפולה / retry של הקליינט) במקום תרומה PENDING נוספת.
+    """
+    key = models.CharField(max_length=255)
+    # "user:<id>" למחוברים, "anon" לאורחים
+    scope = models.CharField(max_length=64)
+    request_hash = models.CharField(max_length=64)
+
+    donation = models.ForeignKey(
+        Donation,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="idempotency_keys",
+    )
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "key"], name="idempotency_key_scope_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotency_key_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}"
+
+
+class StripeSyncCheckpoint(models.Model):
+    """
+    התקדמות manage.py sync_stripe_payments: ריצה שנקטעה ממשיכה מ-starting_after,
+    וריצה חדשה מתחילה מ-synced_until (פחות חפיפה).
+    """
+    name = models.CharField(max_length=50, unique=True)
+
+    # ריצה בתהליך: חלון ה-created והעמוד האחרון שסונכרן
+    run_started = models.DateTimeField(null=True, blank=True)
+    window_start = models.DateTimeField(null=True, blank=True)
+    starting_after = models.CharField(max_length=255, blank=True, default="")
+
+    # עד לאן כל ה-PaymentIntents כבר סונכרנו (תחילת הריצה המלאה האחרונה)
+    synced_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"stripe sync {self.name} until {self.synced_until}"
@@ -1,7 +1,26 @@
 from rest_framework import serializers
+
+from config.sparse_fields import SparseFieldsMixin
 from .models import DonationCampaign, Donation
 
 
+# בתרומה ששולמה אלה כבר נספרו במונים (donations/totals.py) - לא משנים בדיעבד
+PAID_LOCKED_FIELDS = ("organization", "campaign", "amount")
+
+
+def paid_changes(donation, attrs):
+    """
+    -> {field: error} לשדות ב-attrs שמשנים תרומה ששולמה ({} אם אין).
+    """
+    if donation is None or donation.status != "PAID":
+        return {}
+    return {
+        name: "אי אפשר לשנות תרומה ששולמה"
+        for name in PAID_LOCKED_FIELDS
+        if name in attrs and attrs[name] != getattr(donation, name)
+    }
+
+
 class DonationCampaignSerializer(serializers.ModelSerializer):
     organization_name = serializers.CharField(source="organization.email", read_only=True)
 
@@ -14,13 +33,16 @@ class DonationCampaignSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "goal_amount",
+            "raised_amount",
+            "donors_count",
             "is_active",
             "created_at",
         ]
-        read_only_fields = ["organization", "created_at"]
+        read_only_fields = ["organization", "created_at", "raised_amount", "donors_count"]
 
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    org_name = serializers.SerializerMethodField()
     donor_display_name = serializers.SerializerMethodField()
     campaign_title = serializers.SerializerMethodField()
 
@@ -29,6 +51,7 @@ class DonationSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "organization",
+            "org_name",
             "campaign",
             "campaign_title",
             "amount",
@@ -44,16 +67,33 @@ class DonationSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "created_at",
             "donor_display_name",
+            "org_name",
             "status",
             "stripe_payment_intent_id",
             "stripe_payment_status",
             "campaign_title",
         ]
 
+    # ברשימות השמות מגיעים כ-annotations (donations.views.with_display_names);
+    # בלעדיהם (למשל אחרי create) - fallback לגישה דרך היחסים
+
+    def get_org_name(self, obj):
+        if hasattr(obj, "org_name"):
+            return obj.org_name
+        org = obj.organization
+        if not org:
+            return ""
+        profile = getattr(org, "org_profile", None)
+        return getattr(profile, "org_name", "") or org.email
+
     def get_campaign_title(self, obj):
+        if hasattr(obj, "campaign_title"):
+            return obj.campaign_title
         return getattr(obj.campaign, "title", "")
 
     def get_donor_display_name(self, obj):
+        if hasattr(obj, "donor_display_name"):
+            return obj.donor_display_name
         if obj.donor_user:
             vol = getattr(obj.donor_user, "vol_profile", None)
             if vol and getattr(vol, "full_name", ""):
@@ -61,6 +101,12 @@ class DonationSerializer(serializers.ModelSerializer):
             return obj.donor_user.email
         return obj.donor_name or "אנונימי"
 
+    def validate(self, attrs):
+        errors = paid_changes(self.instance, attrs)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def validate_amount(self, value):
         if value <= 0:
             raise serializers.ValidationError("סכום התרומה חייב להיות גדול מאפס")
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import response_cache
+from orgs.cache import invalidate_orgs
+from .models import Donation, DonationCampaign
+
+
+# ======================
+# invalidation של תשובות ציבוריות (config/response_cache.py).
+# מונים שמתעדכנים ב-update() (donations/totals.py) מקפיצים בעצמם.
+# ======================
+CAMPAIGNS_NAMESPACE = "campaigns"
+
+
+@receiver([post_save, post_delete], sender=DonationCampaign)
+def invalidate_campaign_responses(sender, instance, **kwargs):
+    response_cache.invalidate(CAMPAIGNS_NAMESPACE)
+    invalidate_orgs(instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=Donation)
+def invalidate_donation_responses(sender, instance, **kwargs):
+    response_cache.invalidate(CAMPAIGNS_NAMESPACE if instance.campaign_id else None)
+    invalidate_orgs(instance.organization_id, directory=False)
@@ -0,0 +1,158 @@
+"""
+סנכרון תרומות מול PaymentIntents ב-Stripe (manage.py sync_stripe_payments),
+לתרומות שנשארו PENDING כי webhook הלך לאיבוד.
+
+- עוברים על PaymentIntents שנוצרו מאז הסנכרון האחרון (created[gte]) בעמודים של
+  עד 100 (starting_after), דרך StripeClient עם requests.Session אחת לכל הריצה
+- כל עמוד: נעילה + bulk_update אחד + מונים (webhooks.apply_status_changes),
+  עם אותם כללים כמו ה-webhook (סטטוס רק מתקדם)
+- מרווח מינימלי בין בקשות, ו-429 -> המתנה (Retry-After / backoff) וניסיון חוזר
+- אחרי כל עמוד נשמר checkpoint (StripeSyncCheckpoint), כך שריצה שנקטעה ממשיכה מאותו מקום
+"""
+import time
+from datetime import timedelta
+
+import requests
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import StripeSyncCheckpoint
+from . import webhooks
+
+
+CHECKPOINT_NAME = "payment_intents"
+PAGE_SIZE = 100
+# ריצה ראשונה (בלי checkpoint) מסתכלת אחורה עד כאן
+DEFAULT_LOOKBACK = timedelta(days=3)
+# חפיפה בין ריצות - intents שנוצרו ממש לפני תחילת הריצה הקודמת
+OVERLAP = timedelta(hours=1)
+
+# Stripe: 25 בקשות לשנייה ב-test mode; נשארים מתחת
+MIN_REQUEST_INTERVAL = 0.05
+MAX_RATE_LIMIT_RETRIES = 5
+MAX_BACKOFF = 30.0
+
+# סטטוס PaymentIntent -> סטטוס תרומה (השאר נשארים PENDING, מתעדכן רק stripe_payment_status)
+INTENT_STATUSES = {
+    "succeeded": "PAID",
+    "canceled": "FAILED",
+}
+
+
+def make_client(api_key=None, api_base=None, session=None):
+    """
+    StripeClient עם חיבור HTTP אחד (keep-alive) לכל הבקשות של הריצה.
+    """
+    return stripe.StripeClient(
+        api_key or settings.STRIPE_SECRET_KEY,
+        base_addresses={"api": api_base or settings.STRIPE_API_BASE},
+        http_client=stripe.RequestsClient(session=session or requests.Session()),
+        max_network_retries=2,
+    )
+
+
+def target_of_intent(intent):
+    status = INTENT_STATUSES.get(intent.get("status"), "PENDING")
+    if status == "PENDING" and intent.get("last_payment_error"):
+        status = "FAILED"
+    return webhooks.lookup_of(intent), status, intent.get("status", "")
+
+
+class _Throttle:
+    def __init__(self, interval, sleep):
+        self.interval = interval
+        self.sleep = sleep
+        self.last = None
+
+    def wait(self):
+        if self.last is not None:
+            delay = self.interval - (time.monotonic() - self.last)
+            if delay > 0:
+                self.sleep(delay)
+        self.last = time.monotonic()
+
+
+def _retry_after(error, attempt):
+    raw = (getattr(error, "headers", None) or {}).get("Retry-After")
+    try:
+        return min(float(raw), MAX_BACKOFF)
+    except (TypeError, ValueError):
+        return min(2 ** attempt * 0.5, MAX_BACKOFF)
+
+
+def _list_page(client, params, throttle, sleep):
+    for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+        throttle.wait()
+        try:
+            return client.v1.payment_intents.list(params=params)
+        except stripe.error.RateLimitError as e:
+            if attempt == MAX_RATE_LIMIT_RETRIES:
+                raise
+            sleep(_retry_after(e, attempt))
+
+
+def _timestamp(value):
+    return int(value.timestamp())
+
+
+def sync_payment_intents(client=None, since=None, page_size=PAGE_SIZE, max_pages=None,
+                         min_interval=MIN_REQUEST_INTERVAL, sleep=time.sleep):
+    """
+    -> {"pages", "intents", "updated", "done"}
+    since: datetime - מתעלם מה-checkpoint ומתחיל ריצה חדשה מהזמן הזה.
+    max_pages: עוצרים אחרי כך וכך עמודים; הריצה הבאה ממשיכה מה-checkpoint.
+    """
+    client = client or make_client()
+    throttle = _Throttle(min_interval, sleep)
+    checkpoint, _ = StripeSyncCheckpoint.objects.get_or_create(name=CHECKPOINT_NAME)
+
+    if since is None and checkpoint.starting_after and checkpoint.window_start:
+        # ממשיכים ריצה שנקטעה
+        window_start = checkpoint.window_start
+        run_started = checkpoint.run_started or timezone.now()
+        cursor = checkpoint.starting_after
+    else:
+        run_started = timezone.now()
+        if since is not None:
+            window_start = since
+        elif checkpoint.synced_until:
+            window_start = checkpoint.synced_until - OVERLAP
+        else:
+            window_start = run_started - DEFAULT_LOOKBACK
+        cursor = ""
+
+    result = {"pages": 0, "intents": 0, "updated": 0, "done": False}
+    while True:
+        params = {"limit": page_size, "created": {"gte": _timestamp(window_start)}}
+        if cursor:
+            params["starting_after"] = cursor
+        page = _list_page(client, params, throttle, sleep)
+        intents = [intent.to_dict() for intent in page.data]
+
+        with transaction.atomic():
+            result["updated"] += webhooks.apply_status_changes([target_of_intent(i) for i in intents])
+        result["pages"] += 1
+        result["intents"] += len(intents)
+
+        if not page.has_more or not intents:
+            break
+
+        cursor = intents[-1]["id"]
+        checkpoint.run_started = run_started
+        checkpoint.window_start = window_start
+        checkpoint.starting_after = cursor
+        checkpoint.save(update_fields=["run_started", "window_start", "starting_after", "updated_at"])
+
+        if max_pages and result["pages"] >= max_pages:
+            return result
+
+    checkpoint.synced_until = run_started
+    checkpoint.run_started = None
+    checkpoint.window_start = None
+    checkpoint.starting_after = ""
+    checkpoint.save()
+    result["done"] = True
+    return result
+
@@ -0,0 +1,104 @@
+"""
+ניקוי תרומות PENDING ישנות (manage.py sweep_pending_donations, כ-cron job).
+
+POST /api/donations/ פתוח לכולם ו-Donate.jsx יוצר את התרומה לפני ה-PaymentIntent,
+כך שתשלומים שננטשו (ובוטים) משאירים שורות PENDING לתמיד:
+- בלי PaymentIntent -> FAILED / stripe_payment_status="abandoned" (לא התחיל תשלום)
+- עם PaymentIntent -> FAILED / stripe_payment_status="expired"; אם Stripe עוד ישלח
+  succeeded, ה-webhook יעביר ל-PAID (סטטוס רק מתקדם)
+לא מוחקים: השורה נשארת לדוחות / תמיכה (מי ניסה לתרום ומתי), ו-FAILED כבר
+לא נכנס למונים ולא נסרק שוב.
+
+עובדים במנות קטנות לפי (created_at, id) על האינדקס (status, created_at),
+כל מנה ב-transaction קצרה, כך שאין נעילות ארוכות.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .idempotency import IDEMPOTENCY_KEY_TTL
+from .models import Donation, IdempotencyKey
+
+
+SWEEP_CHUNK_SIZE = 500
+EXPIRED_STRIPE_STATUS = "expired"
+ABANDONED_STRIPE_STATUS = "abandoned"
+
+
+def pending_ttl():
+    return timedelta(hours=getattr(settings, "DONATION_PENDING_TTL_HOURS", 24))
+
+
+def stale_chunk(stale, after, size):
+    """
+    המנה הבאה אחרי (created_at, id) -> [(pk, created_at, stripe_payment_intent_id), ...]
+    """
+    if after is not None:
+        created_at, pk = after
+        stale = stale.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+    return stale.order_by("created_at", "pk").values_list("pk", "created_at", "stripe_payment_intent_id")[:size]
+
+
+def sweep_stale_pending(older_than=None, chunk_size=SWEEP_CHUNK_SIZE, pause=0.0, sleep=time.sleep, dry_run=False):
+    """
+    -> {"abandoned", "expired", "idempotency_keys", "chunks"}
+    dry_run: רק סופרים מה היה מטופל.
+    """
+    cutoff = timezone.now() - (older_than or pending_ttl())
+    stale = Donation.objects.filter(status="PENDING", created_at__lt=cutoff)
+
+    result = {"abandoned": 0, "expired": 0, "idempotency_keys": 0, "chunks": 0}
+    last = None
+    while True:
+        chunk = list(stale_chunk(stale, last, chunk_size))
+        if not chunk:
+            break
+
+        last = (chunk[-1][1], chunk[-1][0])
+        without_intent = [pk for pk, _, intent in chunk if not intent]
+        with_intent = [pk for pk, _, intent in chunk if intent]
+        result["chunks"] += 1
+
+        if dry_run:
+            result["abandoned"] += len(without_intent)
+            result["expired"] += len(with_intent)
+            continue
+
+        with transaction.atomic():
+            # הסטטוס נבדק שוב - ייתכן שה-webhook עדכן בינתיים
+            if without_intent:
+                result["abandoned"] += stale.filter(pk__in=without_intent, stripe_payment_intent_id="").update(
+                    status="FAILED", stripe_payment_status=ABANDONED_STRIPE_STATUS
+                )
+            if with_intent:
+                result["expired"] += stale.filter(pk__in=with_intent).update(
+                    status="FAILED", stripe_payment_status=EXPIRED_STRIPE_STATUS
+                )
+
+        if len(chunk) < chunk_size:
+            break
+        if pause:
+            sleep(pause)
+
+    if not dry_run:
+        result["idempotency_keys"] = _sweep_idempotency_keys(chunk_size)
+    return result
+
+
+def _sweep_idempotency_keys(chunk_size):
+    cutoff = timezone.now() - IDEMPOTENCY_KEY_TTL
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects
+            .filter(created_at__lt=cutoff)
+            .order_by("created_at", "pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
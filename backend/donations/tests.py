@@ -1,3 +1,713 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import stripe
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User, VolunteerProfile
+from orgs.models import OrganizationProfile
+from events.tests import prefer_indexes, seq_scanned_tables
+from . import stripe_sync, sweeper, totals, webhooks
+from .fake_stripe import FakeStripe
+from .models import Donation, DonationCampaign, OrgDonationStats, StripeEvent, StripeSyncCheckpoint
+from .views import DonationCampaignViewSet, DonationViewSet
+
+
+LARGE_TABLES = (Donation._meta.db_table, DonationCampaign._meta.db_table)
+
+
+class QueryPlanTests(TestCase):
+    """
+    מוודא שה-querysets של תרומות/קמפיינים נשענים על האינדקסים.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.orgs = User.objects.bulk_create(
+            [User(email=f"org{i}@example.com", role="ORG") for i in range(20)]
+        )
+        cls.donors = User.objects.bulk_create(
+            [User(email=f"donor{i}@example.com", role="VOLUNTEER") for i in range(50)]
+        )
+        campaigns = DonationCampaign.objects.bulk_create([
+            DonationCampaign(
+                organization=cls.orgs[i % len(cls.orgs)],
+                title=f"campaign {i}",
+                is_active=i % 4 == 0,
+            )
+            for i in range(500)
+        ])
+        statuses = ("PENDING", "PAID", "PAID", "FAILED")
+        Donation.objects.bulk_create([
+            Donation(
+                organization=cls.orgs[i % len(cls.orgs)],
+                campaign=campaigns[i % len(campaigns)] if i % 2 else None,
+                donor_user=cls.donors[i % len(cls.donors)] if i % 3 else None,
+                amount=Decimal("50.00"),
+                status=statuses[i % len(statuses)],
+            )
+            for i in range(3000)
+        ])
+
+        prefer_indexes()
+
+    def view_queryset(self, viewset_cls, user, params=None):
+        view = viewset_cls()
+        view.request = Request(APIRequestFactory().get("/", params or {}))
+        view.request.user = user
+        view.action = "list"
+        view.format_kwarg = None
+        return view.get_queryset()
+
+    def assertNoSeqScan(self, queryset):
+        scanned = seq_scanned_tables(queryset) & set(LARGE_TABLES)
+        self.assertFalse(scanned, f"seq scan on {scanned}:\n{queryset.explain()}")
+
+    def test_org_donations(self):
+        self.assertNoSeqScan(self.view_queryset(DonationViewSet, self.orgs[0]))
+
+    def test_donor_donations(self):
+        self.assertNoSeqScan(self.view_queryset(DonationViewSet, self.donors[0]))
+
+    def test_org_donations_in_date_range(self):
+        today = timezone.localdate()
+        self.assertNoSeqScan(self.view_queryset(
+            DonationViewSet,
+            self.orgs[0],
+            {"date_from": (today - timedelta(days=365)).isoformat(), "date_to": today.isoformat()},
+        ))
+
+    def test_pending_donations_by_age(self):
+        self.assertNoSeqScan(
+            Donation.objects
+            .filter(status="PENDING", created_at__lt=timezone.now() - timedelta(days=1))
+            .order_by("created_at")
+        )
+
+    def test_pending_sweeper_chunk(self):
+        stale = Donation.objects.filter(status="PENDING", created_at__lt=timezone.now() - timedelta(days=1))
+        self.assertNoSeqScan(sweeper.stale_chunk(stale, (timezone.now() - timedelta(days=30), 1), 500))
+
+    # SQLite מקבל "WHERE is_active" (בלי "= 1") ולא משתמש באינדקס על boolean
+    @skipUnless(connection.vendor == "postgresql", "boolean index lookup is Postgres-only")
+    def test_active_campaigns(self):
+        self.assertNoSeqScan(self.view_queryset(DonationCampaignViewSet, AnonymousUser()))
+
+
+class DonationListTests(TestCase):
+    def test_list_queries_do_not_grow_with_rows(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        OrganizationProfile.objects.create(user=org, org_name="עמותה")
+        admin = User.objects.create(email="admin@example.com", role="ADMIN")
+        campaign = DonationCampaign.objects.create(organization=org, title="קמפיין")
+
+        for i in range(30):
+            donor = User.objects.create(email=f"donor{i}@example.com", role="VOLUNTEER")
+            VolunteerProfile.objects.create(user=donor, full_name=f"תורם {i}")
+            Donation.objects.create(organization=org, campaign=campaign, donor_user=donor, amount=10)
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        with self.assertNumQueries(1):
+            response = client.get("/api/donations/", {"status": "pending"})
+
+        self.assertEqual(len(response.data), 30)
+        row = response.data[0]
+        self.assertEqual(row["org_name"], "עמותה")
+        self.assertEqual(row["campaign_title"], "קמפיין")
+        self.assertTrue(row["donor_display_name"].startswith("תורם"))
+
+    def test_display_name_fallbacks_and_filters(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        OrganizationProfile.objects.create(user=org, org_name="עמותה")
+        other_org = User.objects.create(email="other@example.com", role="ORG")
+        admin = User.objects.create(email="admin@example.com", role="ADMIN")
+        with_profile = User.objects.create(email="named@example.com", role="VOLUNTEER")
+        VolunteerProfile.objects.create(user=with_profile, full_name="מתנדבת")
+        without_profile = User.objects.create(email="plain@example.com", role="VOLUNTEER")
+
+        Donation.objects.create(organization=org, donor_user=with_profile, amount=10, status="PAID")
+        Donation.objects.create(organization=org, donor_user=without_profile, amount=10)
+        Donation.objects.create(organization=org, amount=5, donor_name="דני")
+        Donation.objects.create(organization=other_org, amount=5, donor_name="")
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        rows = client.get("/api/donations/").data
+        self.assertEqual(
+            sorted((row["org_name"], row["donor_display_name"]) for row in rows),
+            sorted([
+                ("עמותה", "מתנדבת"),
+                ("עמותה", "plain@example.com"),
+                ("עמותה", "דני"),
+                ("other@example.com", "אנונימי"),
+            ]),
+        )
+
+        today = timezone.localdate().isoformat()
+        self.assertEqual(len(client.get("/api/donations/", {"status": "paid"}).data), 1)
+        self.assertEqual(len(client.get("/api/donations/", {"organization": other_org.id}).data), 1)
+        self.assertEqual(len(client.get("/api/donations/", {"date_from": today, "date_to": today}).data), 4)
+        self.assertEqual(
+            len(client.get("/api/donations/", {"date_from": "2020-01-01", "date_to": "2020-12-31"}).data), 0
+        )
+        self.assertEqual(client.get("/api/donations/", {"status": "x"}).status_code, 400)
+
+    def test_create_response_has_display_names(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        OrganizationProfile.objects.create(user=org, org_name="עמותה")
+
+        response = APIClient().post(
+            "/api/donations/", {"organization": org.id, "amount": "5", "currency": "ils"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["org_name"], "עמותה")
+        self.assertEqual(response.data["donor_display_name"], "אנונימי")
+
+    def test_sparse_fields(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        Donation.objects.create(organization=org, amount=10, donor_name="דנה")
+
+        client = APIClient()
+        client.force_authenticate(org)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/donations/", {"fields": "amount,status,donor_display_name"})
+
+        self.assertEqual(set(response.data[0]), {"id", "amount", "status", "donor_display_name"})
+        self.assertEqual(response.data[0]["donor_display_name"], "דנה")
+        self.assertNotIn('"stripe_payment_intent_id"', ctx.captured_queries[0]["sql"])
+
+
+class DonationTotalsTests(TestCase):
+    """
+    המונים זזים רק דרך המסלול האמיתי: store_event (inbox) -> process_batch.
+    """
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.donor = User.objects.create(email="donor@example.com", role="VOLUNTEER")
+        self.campaign = DonationCampaign.objects.create(organization=self.org, title="קמפיין")
+        self.events = 0
+
+    def donate(self, amount, donor=None):
+        donation = Donation.objects.create(
+            organization=self.org, campaign=self.campaign, donor_user=donor, amount=Decimal(amount)
+        )
+        donation.stripe_payment_intent_id = f"pi_{donation.pk}"
+        donation.save(update_fields=["stripe_payment_intent_id"])
+        return donation
+
+    def store(self, donation, event_type, created=None):
+        self.events += 1
+        created = created or 1700000000 + self.events
+        intent_id = donation.stripe_payment_intent_id
+        if event_type == "charge.refunded":
+            obj = {"id": f"ch_{donation.pk}", "object": "charge", "refunded": True, "payment_intent": intent_id}
+        else:
+            obj = {
+                "id": intent_id,
+                "object": "payment_intent",
+                "status": "succeeded" if event_type == "payment_intent.succeeded" else "requires_payment_method",
+                "metadata": {"donation_id": str(donation.pk)},
+            }
+        webhooks.store_event({
+            "id": f"evt_{self.events}", "type": event_type, "created": created, "data": {"object": obj},
+        })
+
+    def deliver(self, donation, event_type, created=None):
+        self.store(donation, event_type, created)
+        while webhooks.process_batch():
+            pass
+
+    def assertTotals(self, raised, donors, org_count):
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.raised_amount, Decimal(raised))
+        self.assertEqual(self.campaign.donors_count, donors)
+        stats = OrgDonationStats.objects.get(pk=self.org.pk)
+        self.assertEqual(stats.raised_amount, Decimal(raised))
+        self.assertEqual(stats.donations_count, org_count)
+
+    def test_paid_refund_and_failure_move_totals(self):
+        first = self.donate("100", self.donor)
+        second = self.donate("50", self.donor)
+        anonymous = self.donate("20")
+
+        for donation in (first, second, anonymous):
+            self.store(donation, "payment_intent.succeeded")
+        self.assertEqual(webhooks.process_batch(), 3)
+        # אותו תורם פעמיים -> תורם אחד; אנונימי נספר בנפרד
+        self.assertTotals("170", 2, 3)
+
+        # succeeded נוסף (אירוע אחר לאותה תרומה) לא סופר פעמיים
+        self.deliver(first, "payment_intent.succeeded")
+        self.assertTotals("170", 2, 3)
+
+        self.deliver(first, "charge.refunded")
+        self.assertTotals("70", 2, 2)
+
+        # כישלון אחרי תשלום לא מוריד (סטטוס רק מתקדם); החזר כן
+        self.deliver(second, "payment_intent.payment_failed")
+        self.assertTotals("70", 2, 2)
+        self.deliver(second, "charge.refunded")
+        self.assertTotals("20", 1, 1)
+
+    def test_out_of_order_events(self):
+        paid = self.donate("100", self.donor)
+        refunded = self.donate("30")
+
+        # באותה מנה: נשמרו הפוך מהסדר של Stripe -> מעובדים לפי created
+        self.store(paid, "payment_intent.succeeded", created=1700000020)
+        self.store(paid, "payment_intent.payment_failed", created=1700000010)
+        # במנות נפרדות: ההחזר הגיע לפני ה-succeeded
+        self.store(refunded, "charge.refunded", created=1700000050)
+        webhooks.process_batch()
+        self.deliver(refunded, "payment_intent.succeeded", created=1700000040)
+
+        paid.refresh_from_db()
+        refunded.refresh_from_db()
+        self.assertEqual((paid.status, refunded.status), ("PAID", "REFUNDED"))
+        self.assertTotals("100", 1, 1)
+
+    def test_paid_amount_and_campaign_are_locked(self):
+        donation = self.donate("100", self.donor)
+        other = DonationCampaign.objects.create(organization=self.org, title="אחר")
+        client = APIClient()
+        client.force_authenticate(self.org)
+        url = f"/api/donations/{donation.pk}/"
+
+        # לפני התשלום מותר
+        self.assertEqual(client.patch(url, {"amount": "80"}, format="json").status_code, 200)
+        self.deliver(donation, "payment_intent.succeeded")
+
+        for body in ({"amount": "500"}, {"campaign": other.pk}, {"amount": "90", "campaign": None}):
+            with self.subTest(body=body):
+                response = client.patch(url, body, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(set(response.data), set(body))
+
+        # אותו ערך / שדות אחרים - מותר, והמונים לא זזים
+        response = client.patch(url, {"amount": "80.00", "donor_name": "דנה"}, format="json")
+        self.assertEqual((response.status_code, response.data["status"]), (200, "PAID"))
+        self.assertTotals("80", 1, 1)
+
+    def test_update_does_not_overwrite_a_concurrent_status(self):
+        donation = self.donate("40", self.donor)
+        client = APIClient()
+        client.force_authenticate(self.org)
+        view_get_object = DonationViewSet.get_object
+
+        def stale_get_object(view):
+            # ה-view טוען PENDING, וה-webhook מסמן PAID לפני ה-save
+            instance = view_get_object(view)
+            self.deliver(donation, "payment_intent.succeeded")
+            return instance
+
+        with mock.patch.object(DonationViewSet, "get_object", stale_get_object):
+            stale_amount = client.patch(f"/api/donations/{donation.pk}/", {"amount": "400"}, format="json")
+        self.assertEqual(stale_amount.status_code, 400)
+
+        donation.refresh_from_db()
+        self.assertEqual((donation.status, donation.amount), ("PAID", Decimal("40")))
+        self.assertTotals("40", 1, 1)
+
+    def test_plain_save_does_not_overwrite_counters(self):
+        stale = DonationCampaign.objects.get(pk=self.campaign.pk)
+        self.deliver(self.donate("30", self.donor), "payment_intent.succeeded")
+
+        stale.title = "כותרת חדשה"
+        stale.save()
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.raised_amount, Decimal("30"))
+        self.assertEqual(self.campaign.title, "כותרת חדשה")
+
+    def test_reconcile_fixes_drift(self):
+        self.deliver(self.donate("40", self.donor), "payment_intent.succeeded")
+        DonationCampaign.objects.filter(pk=self.campaign.pk).update(raised_amount=999, donors_count=7)
+        OrgDonationStats.objects.filter(pk=self.org.pk).update(raised_amount=1, donations_count=9)
+
+        fixed, orgs = totals.reconcile_donation_totals()
+
+        self.assertEqual((fixed, orgs), (1, 1))
+        self.assertTotals("40", 1, 1)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET="whsec_test")
+class StripeWebhookTests(TestCase):
+    """
+    אירועים מזויפים חתומים (כמו ש-Stripe שולח) -> inbox -> worker.
+    """
+    url = "/api/payments/stripe/webhook/"
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.campaign = DonationCampaign.objects.create(organization=self.org, title="קמפיין")
+        self.donation = Donation.objects.create(
+            organization=self.org,
+            campaign=self.campaign,
+            amount=Decimal("25.00"),
+            stripe_payment_intent_id="pi_123",
+        )
+
+    def send(self, event_id, event_type, obj, created=1700000000, secret="whsec_test"):
+        payload = json.dumps({
+            "id": event_id,
+            "object": "event",
+            "type": event_type,
+            "created": created,
+            "data": {"object": obj},
+        })
+        return self.client.post(
+            self.url,
+            data=payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=webhooks.signature_header(payload, secret),
+        )
+
+    def intent(self, status):
+        return {
+            "id": "pi_123",
+            "object": "payment_intent",
+            "status": status,
+            "metadata": {"donation_id": str(self.donation.pk)},
+        }
+
+    def assertDonation(self, status, raised):
+        self.donation.refresh_from_db()
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.donation.status, status)
+        self.assertEqual(self.campaign.raised_amount, Decimal(raised))
+
+    def test_bad_signature_is_rejected(self):
+        response = self.send("evt_1", "payment_intent.succeeded", self.intent("succeeded"), secret="whsec_other")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StripeEvent.objects.exists())
+
+    def test_webhook_only_stores_and_retries_are_deduplicated(self):
+        for _ in range(3):
+            response = self.send("evt_1", "payment_intent.succeeded", self.intent("succeeded"))
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(StripeEvent.objects.count(), 1)
+        self.assertDonation("PENDING", "0")
+
+        self.assertEqual(webhooks.process_inbox(), 1)
+        self.assertDonation("PAID", "25.00")
+        self.assertEqual(webhooks.process_inbox(), 0)
+        self.assertDonation("PAID", "25.00")
+
+    def test_late_failure_does_not_regress_paid(self):
+        self.send("evt_ok", "payment_intent.succeeded", self.intent("succeeded"), created=1700000010)
+        webhooks.process_inbox()
+
+        # payment_failed ישן שהגיע באיחור
+        self.send("evt_fail", "payment_intent.payment_failed", self.intent("requires_payment_method"), created=1700000000)
+        webhooks.process_inbox()
+
+        self.assertDonation("PAID", "25.00")
+
+    def test_out_of_order_batch_uses_event_time(self):
+        self.send("evt_ok", "payment_intent.succeeded", self.intent("succeeded"), created=1700000010)
+        self.send("evt_fail", "payment_intent.payment_failed", self.intent("requires_payment_method"), created=1700000000)
+
+        webhooks.process_inbox()
+
+        self.assertDonation("PAID", "25.00")
+        self.assertEqual(StripeEvent.objects.filter(processed_at__isnull=True).count(), 0)
+
+    def test_full_refund_reverses_totals(self):
+        self.send("evt_ok", "payment_intent.succeeded", self.intent("succeeded"), created=1700000000)
+        webhooks.process_inbox()
+        self.assertDonation("PAID", "25.00")
+
+        self.send(
+            "evt_refund",
+            "charge.refunded",
+            {"id": "ch_1", "object": "charge", "payment_intent": "pi_123", "refunded": True},
+            created=1700000100,
+        )
+
+        webhooks.process_inbox()
+
+        self.assertDonation("REFUNDED", "0.00")
+        self.assertEqual(OrgDonationStats.objects.get(pk=self.org.pk).donations_count, 0)
+
+
+class DonationIdempotencyTests(TestCase):
+    url = "/api/donations/"
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.client = APIClient()
+
+    def post(self, key, amount="30.00", client=None, **extra):
+        return (client or self.client).post(
+            self.url,
+            {"organization": self.org.pk, "amount": amount, "donor_name": "דנה"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+            **extra,
+        )
+
+    def test_replay_returns_first_response(self):
+        first = self.post("key-1")
+        second = self.post("key-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_same_key_with_other_body_is_rejected(self):
+        self.client.force_authenticate(User.objects.create(email="donor@example.com", role="VOLUNTEER"))
+        self.post("key-1")
+        response = self.post("key-1", amount="50.00")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_anonymous_keys_are_not_shared_between_clients(self):
+        first = self.post("key-1", REMOTE_ADDR="10.0.0.1")
+        other = self.post("key-1", client=APIClient(), REMOTE_ADDR="10.0.0.2")
+
+        self.assertEqual((first.status_code, other.status_code), (201, 201))
+        self.assertNotEqual(other.data["id"], first.data["id"])
+        self.assertFalse(other.has_header("Idempotent-Replayed"))
+
+        # אותו לקוח, גוף אחר: בקשה חדשה ולא התשובה של הראשונה
+        changed = self.post("key-1", amount="50.00", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(changed.status_code, 201)
+        self.assertFalse(changed.has_header("Idempotent-Replayed"))
+        self.assertEqual(Donation.objects.count(), 3)
+
+    def test_without_key_every_post_creates(self):
+        for _ in range(2):
+            self.client.post(self.url, {"organization": self.org.pk, "amount": "30.00"}, format="json")
+        self.assertEqual(Donation.objects.count(), 2)
+
+
+@override_settings(STRIPE_SECRET_KEY="sk_test_dummy")
+class PaymentIntentReuseTests(TestCase):
+    url = "/api/payments/donations/create-intent/"
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.donation = Donation.objects.create(organization=self.org, amount=Decimal("30.00"))
+        self.stripe = FakeStripe().start()
+        self.addCleanup(self.stripe.stop)
+
+    def create_intent(self):
+        return self.client.post(self.url, {"donation_id": self.donation.pk}, content_type="application/json")
+
+    def test_repeated_calls_reuse_the_open_intent(self):
+        first = self.create_intent()
+        second = self.create_intent()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.data["client_secret"], first.data["client_secret"])
+        self.assertEqual(len(self.stripe.intents), 1)
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.stripe_payment_intent_id, next(iter(self.stripe.intents)))
+
+    def test_create_uses_deterministic_idempotency_key(self):
+        self.create_intent()
+        self.assertEqual(set(self.stripe.idempotency), {f"donation-{self.donation.pk}-new-3000-ils"})
+
+    def test_changed_amount_updates_the_intent(self):
+        self.create_intent()
+        Donation.objects.filter(pk=self.donation.pk).update(amount=Decimal("45.00"))
+
+        self.create_intent()
+
+        (intent,) = self.stripe.intents.values()
+        self.assertEqual(intent["amount"], 4500)
+
+    def test_canceled_intent_is_replaced(self):
+        old = self.stripe.add_intent(amount=3000, status="canceled")
+        Donation.objects.filter(pk=self.donation.pk).update(stripe_payment_intent_id=old["id"])
+
+        self.create_intent()
+
+        self.donation.refresh_from_db()
+        self.assertNotEqual(self.donation.stripe_payment_intent_id, old["id"])
+        self.assertEqual(len(self.stripe.intents), 2)
+
+
+@override_settings(STRIPE_SECRET_KEY="sk_test_dummy")
+class PaymentIntentObjectTests(TestCase):
+    """
+    stripe-python מחזיר StripeObject (לא dict) - ה-view חייב לעבוד עם הטיפוס האמיתי.
+    """
+    url = "/api/payments/donations/create-intent/"
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.donation = Donation.objects.create(organization=self.org, amount=Decimal("30.00"))
+
+    def intent(self, **fields):
+        data = {
+            "id": "pi_1", "object": "payment_intent", "status": "requires_payment_method",
+            "amount": 3000, "currency": "ils", "client_secret": "pi_1_secret", **fields,
+        }
+        return stripe.PaymentIntent.construct_from(data, "sk_test_dummy")
+
+    def create_intent(self):
+        return self.client.post(self.url, {"donation_id": self.donation.pk}, content_type="application/json")
+
+    def test_create_returns_stripe_object(self):
+        with mock.patch("stripe.PaymentIntent.create", return_value=self.intent()) as create:
+            response = self.create_intent()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["client_secret"], "pi_1_secret")
+        self.assertEqual(create.call_args.kwargs["idempotency_key"], f"donation-{self.donation.pk}-new-3000-ils")
+
+    def test_reused_intent_with_changed_amount_is_modified(self):
+        Donation.objects.filter(pk=self.donation.pk).update(stripe_payment_intent_id="pi_1", amount=45)
+
+        with mock.patch("stripe.PaymentIntent.retrieve", return_value=self.intent()), \
+                mock.patch("stripe.PaymentIntent.modify", return_value=self.intent(amount=4500)) as modify, \
+                mock.patch("stripe.PaymentIntent.create") as create:
+            response = self.create_intent()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(modify.call_args.kwargs["amount"], 4500)
+        create.assert_not_called()
+
+
+class StripeSyncTests(TestCase):
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.campaign = DonationCampaign.objects.create(organization=self.org, title="קמפיין")
+        self.stripe = FakeStripe().start()
+        self.addCleanup(self.stripe.stop)
+
+    def donations_with_intents(self, count, status="succeeded"):
+        donations = []
+        for _ in range(count):
+            donation = Donation.objects.create(
+                organization=self.org, campaign=self.campaign, amount=Decimal("10.00")
+            )
+            intent = self.stripe.add_intent(
+                amount=1000, status=status, metadata={"donation_id": str(donation.pk)}
+            )
+            Donation.objects.filter(pk=donation.pk).update(stripe_payment_intent_id=intent["id"])
+            donations.append(donation)
+        return donations
+
+    def sync(self, **kwargs):
+        client = stripe_sync.make_client(api_key="sk_test_dummy", api_base=self.stripe.url)
+        return stripe_sync.sync_payment_intents(client=client, min_interval=0, sleep=lambda s: None, **kwargs)
+
+    def test_pages_through_intents_with_one_connection(self):
+        self.donations_with_intents(25)
+        self.donations_with_intents(5, status="canceled")
+
+        result = self.sync(page_size=10)
+
+        self.assertEqual((result["pages"], result["intents"], result["updated"]), (3, 30, 30))
+        self.assertEqual(Donation.objects.filter(status="PAID").count(), 25)
+        self.assertEqual(Donation.objects.filter(status="FAILED").count(), 5)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.raised_amount, Decimal("250.00"))
+        self.assertEqual(self.stripe.requests, 3)
+        self.assertEqual(self.stripe.connections, 1)
+
+    def test_one_bulk_update_per_page(self):
+        self.donations_with_intents(10)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.sync(page_size=10)
+
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "donations_donation"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_resumes_from_checkpoint(self):
+        self.donations_with_intents(30)
+
+        first = self.sync(page_size=10, max_pages=1)
+        self.assertFalse(first["done"])
+        self.assertEqual(Donation.objects.filter(status="PAID").count(), 10)
+
+        second = self.sync(page_size=10)
+        self.assertTrue(second["done"])
+        self.assertEqual(second["intents"], 20)
+        self.assertEqual(Donation.objects.filter(status="PAID").count(), 30)
+        self.assertIsNotNone(StripeSyncCheckpoint.objects.get().synced_until)
+
+    def test_retries_after_rate_limit(self):
+        self.donations_with_intents(20)
+        self.stripe.rate_limit_every = 2
+
+        result = self.sync(page_size=10)
+
+        self.assertTrue(result["done"])
+        self.assertEqual(Donation.objects.filter(status="PAID").count(), 20)
+
+    def test_does_not_undo_refund(self):
+        (donation,) = self.donations_with_intents(1)
+        Donation.objects.filter(pk=donation.pk).update(status="REFUNDED")
+
+        self.sync()
+
+        donation.refresh_from_db()
+        self.assertEqual(donation.status, "REFUNDED")
+
+
+class PendingSweeperTests(TestCase):
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+
+    def donation(self, hours_ago, status="PENDING", intent=""):
+        donation = Donation.objects.create(
+            organization=self.org, amount=Decimal("10.00"), status=status, stripe_payment_intent_id=intent
+        )
+        Donation.objects.filter(pk=donation.pk).update(created_at=timezone.now() - timedelta(hours=hours_ago))
+        return donation
+
+    def test_sweeps_only_old_pending_in_chunks(self):
+        abandoned = [self.donation(48) for _ in range(5)]
+        with_intent = self.donation(48, intent="pi_1")
+        recent = self.donation(1)
+        paid = self.donation(48, status="PAID")
+
+        result = sweeper.sweep_stale_pending(older_than=timedelta(hours=24), chunk_size=2)
+
+        self.assertEqual((result["abandoned"], result["expired"], result["chunks"]), (5, 1, 3))
+        # נשארות, כ-FAILED
+        self.assertEqual(
+            set(Donation.objects.filter(pk__in=[d.pk for d in abandoned]).values_list("status", "stripe_payment_status")),
+            {("FAILED", "abandoned")},
+        )
+        with_intent.refresh_from_db()
+        self.assertEqual((with_intent.status, with_intent.stripe_payment_status), ("FAILED", "expired"))
+        self.assertEqual(Donation.objects.get(pk=recent.pk).status, "PENDING")
+        self.assertEqual(Donation.objects.get(pk=paid.pk).status, "PAID")
+
+    def test_dry_run_changes_nothing(self):
+        self.donation(48)
+
+        result = sweeper.sweep_stale_pending(older_than=timedelta(hours=24), dry_run=True)
+
+        self.assertEqual(result["abandoned"], 1)
+        self.assertEqual(Donation.objects.get().status, "PENDING")
+
+    def test_second_sweep_finds_nothing(self):
+        self.donation(48)
+        self.donation(48, intent="pi_1")
+        sweeper.sweep_stale_pending(older_than=timedelta(hours=24))
+
+        result = sweeper.sweep_stale_pending(older_than=timedelta(hours=24))
+
+        self.assertEqual((result["abandoned"], result["expired"], result["chunks"]), (0, 0, 0))
+        self.assertEqual(Donation.objects.filter(status="FAILED").count(), 2)
@@ -0,0 +1,225 @@
+"""
+מוני תרומות מתוחזקים:
+- DonationCampaign.raised_amount / donors_count
+- OrgDonationStats (סכום ומספר תרומות ששולמו לעמותה)
+
+מתעדכנים רק במעבר סטטוס אל PAID או ממנו (worker של ה-webhook), ב-UPDATE עם F(),
+כך שרשימת הקמפיינים לא מסכמת תרומות בכל בקשה.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from config import response_cache
+from orgs.cache import invalidate_orgs
+from .models import Donation, DonationCampaign, OrgDonationStats
+from .signals import CAMPAIGNS_NAMESPACE
+
+
+PAID = "PAID"
+
+
+def apply(donation, sign):
+    """
+    sign=1: התרומה שולמה; sign=-1: בוטלה (החזר / כישלון / מחיקה).
+    חייב לרוץ בתוך transaction.
+    """
+    amount = donation.amount * sign
+
+    if donation.campaign_id:
+        # נועלים את הקמפיין כדי שבדיקת "תורם חדש" לא תרוץ במקביל לאותו תורם
+        DonationCampaign.objects.select_for_update().filter(pk=donation.campaign_id).only("pk").first()
+
+        donor_delta = sign
+        if donation.donor_user_id is not None:
+            has_other = (
+                Donation.objects
+                .filter(campaign_id=donation.campaign_id, donor_user_id=donation.donor_user_id, status=PAID)
+                .exclude(pk=donation.pk)
+                .exists()
+            )
+            if has_other:
+                donor_delta = 0
+
+        DonationCampaign.objects.filter(pk=donation.campaign_id).update(
+            raised_amount=F("raised_amount") + amount,
+            donors_count=Greatest(F("donors_count") + donor_delta, 0),
+        )
+
+    if donation.organization_id:
+        _bump_org(donation.organization_id, amount, sign)
+
+    _invalidate_responses([donation])
+
+
+def apply_many(changes):
+    """
+    כמו apply לכמה תרומות יחד (worker של ה-webhook), אחרי שהסטטוסים כבר נכתבו.
+    changes = [(donation, sign), ...]
+    raised_amount: UPDATE אחד עם CASE; donors_count: מחושב מחדש לקמפיינים שנגעו בהם
+    (כמה תרומות של אותו תורם באותה מנה לא נספרות פעמיים).
+    חייב לרוץ בתוך transaction.
+    """
+    by_campaign = defaultdict(Decimal)
+    by_org = defaultdict(lambda: [Decimal("0"), 0])
+    for donation, sign in changes:
+        if donation.campaign_id:
+            by_campaign[donation.campaign_id] += donation.amount * sign
+        if donation.organization_id:
+            by_org[donation.organization_id][0] += donation.amount * sign
+            by_org[donation.organization_id][1] += sign
+
+    if by_campaign:
+        ids = sorted(by_campaign)
+        list(DonationCampaign.objects.select_for_update().filter(pk__in=ids).order_by("pk").values_list("pk"))
+        output = DecimalField(max_digits=12, decimal_places=2)
+        DonationCampaign.objects.filter(pk__in=ids).update(
+            raised_amount=F("raised_amount") + Case(
+                *[When(pk=pk, then=Value(amount, output_field=output)) for pk, amount in by_campaign.items()],
+                default=Value(Decimal("0"), output_field=output),
+            ),
+            donors_count=_paid_donors(),
+        )
+
+    for organization_id, (amount, count) in sorted(by_org.items()):
+        _bump_org(organization_id, amount, count)
+
+    _invalidate_responses([donation for donation, _ in changes])
+
+
+def _invalidate_responses(donations):
+    """
+    המונים מתעדכנים ב-update() (בלי signals) - מקפיצים את גרסאות ה-cache בעצמנו.
+    """
+    if not donations:
+        return
+    if any(d.campaign_id for d in donations):
+        response_cache.invalidate(CAMPAIGNS_NAMESPACE)
+    invalidate_orgs(*{d.organization_id for d in donations}, directory=False)
+
+
+def _paid_donors():
+    """
+    מספר התורמים השונים בתרומות ששולמו לקמפיין (OuterRef("pk") = הקמפיין).
+    """
+    paid = Donation.objects.filter(campaign=OuterRef("pk"), status=PAID).order_by().values("campaign")
+    return Coalesce(
+        Subquery(
+            paid.annotate(
+                donors=Count("donor_user", distinct=True) + Count("pk", filter=Q(donor_user__isnull=True))
+            ).values("donors")[:1]
+        ),
+        0,
+    )
+
+
+def _bump_org(organization_id, amount, count):
+    changes = {
+        "raised_amount": F("raised_amount") + amount,
+        "donations_count": Greatest(F("donations_count") + count, 0),
+    }
+    if OrgDonationStats.objects.filter(pk=organization_id).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            OrgDonationStats.objects.create(
+                pk=organization_id,
+                raised_amount=max(amount, Decimal("0")),
+                donations_count=max(count, 0),
+            )
+    except IntegrityError:
+        # נוצרה במקביל
+        OrgDonationStats.objects.filter(pk=organization_id).update(**changes)
+
+
+# ======================
+# reconciliation
+# ======================
+def reconcile_donation_totals(batch_size=1000):
+    """
+    מחשב מחדש את המונים מ-Donation:
+    קמפיינים - UPDATE אחד לכל טווח ids (רק שורות שסטו);
+    עמותות - שאילתה מקובצת אחת + upsert במנות.
+    -> (קמפיינים שתוקנו, עמותות שנכתבו)
+    """
+    paid = Donation.objects.filter(campaign=OuterRef("pk"), status=PAID).order_by().values("campaign")
+    raised = Coalesce(
+        Subquery(paid.annotate(total=Sum("amount")).values("total")[:1]),
+        Decimal("0"),
+    )
+    donors = _paid_donors()
+
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = list(
+            DonationCampaign.objects
+            .filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+
+        with transaction.atomic():
+            fixed += (
+                DonationCampaign.objects
+                .filter(pk__in=ids)
+                .alias(actual_raised=raised, actual_donors=donors)
+                .filter(~Q(raised_amount=F("actual_raised")) | ~Q(donors_count=F("actual_donors")))
+                .update(raised_amount=raised, donors_count=donors)
+            )
+        last_id = ids[-1]
+
+    return fixed, _rebuild_org_stats(batch_size)
+
+
+def _rebuild_org_stats(batch_size):
+    rows = (
+        Donation.objects
+        .filter(status=PAID, organization__isnull=False)
+        .order_by()
+        .values("organization_id")
+        .annotate(total=Sum("amount"), count=Count("pk"))
+        .order_by("organization_id")
+    )
+
+    written = 0
+    batch = []
+
+    def flush():
+        OrgDonationStats.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["organization"],
+            update_fields=["raised_amount", "donations_count"],
+        )
+
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(OrgDonationStats(
+            organization_id=row["organization_id"],
+            raised_amount=row["total"],
+            donations_count=row["count"],
+        ))
+        if len(batch) >= batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+    if batch:
+        flush()
+        written += len(batch)
+
+    # עמותות שכבר אין להן תרומות ששולמו
+    OrgDonationStats.objects.exclude(
+        organization_id__in=(
+            Donation.objects
+            .filter(status=PAID, organization__isnull=False)
+            .values("organization_id")
+        )
+    ).update(raised_amount=0, donations_count=0)
+
+    return written
@@ -1,23 +1,37 @@
 # donations/views.py
+import json
+from datetime import datetime, time, timedelta
+
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, CharField, F, Q, Value, When
+from django.db.models.functions import Coalesce, NullIf
 from django.http import HttpResponse
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 
 import stripe
 
 from rest_framework import viewsets, permissions, status, serializers, generics
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from accounts.permissions import IsOrganization
+from config.query_params import parse_date_param
+from config.response_cache import ResponseCacheMixin
+from config.sparse_fields import SparseQuerysetMixin
 from .models import DonationCampaign, Donation
-from .serializers import DonationCampaignSerializer, DonationSerializer
+from .serializers import DonationCampaignSerializer, DonationSerializer, paid_changes
+from . import idempotency, totals, webhooks
+from .signals import CAMPAIGNS_NAMESPACE
 
 
 # ======================
 # Stripe config
 # ======================
 stripe.api_key = getattr(settings, "STRIPE_SECRET_KEY", "")
+stripe.api_base = getattr(settings, "STRIPE_API_BASE", stripe.api_base)
 
 
 def to_minor_units(amount_decimal):
@@ -34,9 +48,13 @@ class CreateDonationIntentSerializer(serializers.Serializer):
 # ======================
 # Donation Campaigns
 # ======================
-class DonationCampaignViewSet(viewsets.ModelViewSet):
+class DonationCampaignViewSet(ResponseCacheMixin, viewsets.ModelViewSet):
     queryset = DonationCampaign.objects.all().order_by("-created_at")
     serializer_class = DonationCampaignSerializer
+    cursor_ordering = ("-created_at", "-id")
+
+    def response_cache_namespaces(self):
+        return [CAMPAIGNS_NAMESPACE]
 
     def get_permissions(self):
         if self.action in ["create", "update", "partial_update", "destroy"]:
@@ -65,8 +83,62 @@ class DonationCampaignViewSet(viewsets.ModelViewSet):
 # ======================
 # Donations
 # ======================
-class DonationViewSet(viewsets.ModelViewSet):
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+DONATION_STATUSES = {value for value, _ in Donation._meta.get_field("status").choices}
+
+
+def with_display_names(qs):
+    """
+    שם העמותה / שם התורם / כותרת הקמפיין כ-annotations באותה שאילתה
+    (במקום גישה ל-vol_profile / org_profile לכל שורה).
+    """
+    full_name = F("donor_user__vol_profile__full_name")
+    return qs.annotate(
+        org_name=Coalesce(
+            NullIf(F("organization__org_profile__org_name"), Value("")),
+            F("organization__email"),
+            Value(""),
+            output_field=CharField(),
+        ),
+        donor_display_name=Case(
+            When(
+                Q(donor_user__vol_profile__full_name__isnull=False)
+                & ~Q(donor_user__vol_profile__full_name=""),
+                then=full_name,
+            ),
+            When(donor_user__isnull=False, then=F("donor_user__email")),
+            When(~Q(donor_name=""), then=F("donor_name")),
+            default=Value("אנונימי"),
+            output_field=CharField(),
+        ),
+        campaign_title=Coalesce(F("campaign__title"), Value(""), output_field=CharField()),
+    )
+
+
+def donations_for_user(user):
+    """
+    התרומות שמשתמש רשאי לראות (משמש גם את /api/dashboard/).
+    """
+    qs = with_display_names(Donation.objects.all()).order_by("-created_at")
+
+    if not user or not user.is_authenticated:
+        return Donation.objects.none()
+
+    if user.role == user.Role.ORG:
+        return qs.filter(organization=user)
+
+    if user.role == user.Role.ADMIN:
+        return qs
+
+    return qs.filter(donor_user=user)
+
+
+class DonationViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = DonationSerializer
+    cursor_ordering = ("-created_at", "-id")
 
     def get_permissions(self):
         if self.action == "create":
@@ -81,21 +153,60 @@ class DonationViewSet(viewsets.ModelViewSet):
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
-        qs = Donation.objects.select_related(
-            "organization", "campaign", "donor_user"
-        ).order_by("-created_at")
-
         user = getattr(self.request, "user", None)
-        if not user or not user.is_authenticated:
-            return Donation.objects.none()
+        qs = donations_for_user(user)
+        if self.action == "retrieve":
+            return self.sparse_queryset(qs)
+        if self.action != "list":
+            return qs
+        # ?fields= / ?omit= (config/sparse_fields.py)
+        return self.sparse_queryset(self.filter_list(qs, user))
+
+    def filter_list(self, qs, user):
+        """
+        ?date_from= / ?date_to= (לפי created_at, בשעון המקומי), ?status=,
+        ?organization= (אדמין). עם organization נשען על (organization, created_at).
+        """
+        params = self.request.query_params
+
+        date_from = parse_date_param(params, "date_from")
+        if date_from:
+            qs = qs.filter(created_at__gte=start_of_day(date_from))
+
+        date_to = parse_date_param(params, "date_to")
+        if date_to:
+            qs = qs.filter(created_at__lt=start_of_day(date_to + timedelta(days=1)))
+
+        status_param = (params.get("status") or "").strip().upper()
+        if status_param:
+            if status_param not in DONATION_STATUSES:
+                raise ValidationError({"status": f"Expected one of: {', '.join(sorted(DONATION_STATUSES))}"})
+            qs = qs.filter(status=status_param)
+
+        org_param = params.get("organization")
+        if org_param and user.role == user.Role.ADMIN:
+            try:
+                qs = qs.filter(organization_id=int(org_param))
+            except ValueError:
+                raise ValidationError({"organization": "Expected an id"})
 
-        if user.role == user.Role.ORG:
-            return qs.filter(organization=user)
+        return qs
 
-        if user.role == user.Role.ADMIN:
-            return qs
+    def create(self, request, *args, **kwargs):
+        """
+        עם Idempotency-Key: replay מחזיר את התשובה הראשונה בלי ליצור תרומה נוספת.
+        """
+        key = idempotency.key_from(request)
+        if not key:
+            return super().create(request, *args, **kwargs)
 
-        return qs.filter(donor_user=user)
+        def create_once():
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED), serializer.instance
+
+        return idempotency.run_once(request, key, create_once)
 
     def perform_create(self, serializer):
         user = getattr(self.request, "user", None)
@@ -104,6 +215,26 @@ class DonationViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
 
+    def perform_update(self, serializer):
+        # ה-webhook יכול לסמן PAID במקביל: בודקים שוב מול השורה הנעולה,
+        # ו-save() לא דורס את הסטטוס שכבר נכתב
+        with transaction.atomic():
+            donation = serializer.instance
+            current = Donation.objects.select_for_update().get(pk=donation.pk)
+            for name in ("status", "stripe_payment_status", "stripe_payment_intent_id"):
+                setattr(donation, name, getattr(current, name))
+
+            errors = paid_changes(donation, serializer.validated_data)
+            if errors:
+                raise ValidationError(errors)
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            if instance.status == totals.PAID:
+                totals.apply(instance, -1)
+            instance.delete()
+
 
 # ======================
 # Stripe: Create PaymentIntent for Donation
@@ -111,9 +242,52 @@ class DonationViewSet(viewsets.ModelViewSet):
 # body: { "donation_id": 123 }
 # returns: { "client_secret": "..." }
 # ======================
+# PaymentIntent במצבים האלה עדיין אפשר לשלם דרכו - מחזירים אותו במקום ליצור חדש
+REUSABLE_INTENT_STATUSES = {
+    "requires_payment_method",
+    "requires_confirmation",
+    "requires_action",
+    "processing",
+}
+
+
+def intent_idempotency_key(donation):
+    """
+    מפתח דטרמיניסטי ל-Stripe: בקשות מקבילות (לחיצה כפולה) מקבלות את אותו PaymentIntent.
+    ה-intent הקודם (שבוטל) והסכום בתוך המפתח, כדי שאחריהם ייווצר intent חדש.
+    """
+    previous = donation.stripe_payment_intent_id or "new"
+    currency = (donation.currency or "ils").lower()
+    return f"donation-{donation.id}-{previous}-{to_minor_units(donation.amount)}-{currency}"
+
+
 class CreateDonationPaymentIntent(APIView):
     permission_classes = [permissions.AllowAny]
 
+    @staticmethod
+    def reusable_intent(donation):
+        """
+        ה-PaymentIntent הקיים של התרומה אם עוד פתוח (או כבר שולם); None אם צריך חדש.
+        אם הסכום בתרומה השתנה - מעדכנים את ה-intent הקיים.
+        """
+        if not donation.stripe_payment_intent_id:
+            return None
+
+        intent = stripe.PaymentIntent.retrieve(donation.stripe_payment_intent_id).to_dict()
+        intent_status = intent.get("status")
+        if intent_status == "succeeded":
+            return intent
+        if intent_status not in REUSABLE_INTENT_STATUSES:
+            return None
+
+        amount = to_minor_units(donation.amount)
+        currency = (donation.currency or "ils").lower()
+        if intent_status != "processing" and (
+            intent.get("amount") != amount or (intent.get("currency") or "").lower() != currency
+        ):
+            intent = stripe.PaymentIntent.modify(intent["id"], amount=amount, currency=currency).to_dict()
+        return intent
+
     def post(self, request):
         if not getattr(settings, "STRIPE_SECRET_KEY", ""):
             return Response(
@@ -134,16 +308,19 @@ class CreateDonationPaymentIntent(APIView):
             return Response({"detail": "Donation already paid"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            intent = stripe.PaymentIntent.create(
-                amount=to_minor_units(donation.amount),
-                currency=(donation.currency or "ils"),
-                automatic_payment_methods={"enabled": True},
-                metadata={
-                    "donation_id": str(donation.id),
-                    "org_id": str(donation.organization_id or ""),
-                    "campaign_id": str(donation.campaign_id or ""),
-                },
-            )
+            intent = self.reusable_intent(donation)
+            if intent is None:
+                intent = stripe.PaymentIntent.create(
+                    amount=to_minor_units(donation.amount),
+                    currency=(donation.currency or "ils"),
+                    automatic_payment_methods={"enabled": True},
+                    metadata={
+                        "donation_id": str(donation.id),
+                        "org_id": str(donation.organization_id or ""),
+                        "campaign_id": str(donation.campaign_id or ""),
+                    },
+                    idempotency_key=intent_idempotency_key(donation),
+                ).to_dict()
         except stripe.error.StripeError as e:
             return Response(
                 {"detail": "Stripe error creating PaymentIntent", "stripe": str(e)},
@@ -155,10 +332,18 @@ class CreateDonationPaymentIntent(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        donation.stripe_payment_intent_id = intent.get("id", "")
-        donation.stripe_payment_status = intent.get("status", "")
-        donation.status = "PENDING"
-        donation.save()
+        if intent.get("status") == "succeeded":
+            return Response({"detail": "Donation already paid"}, status=status.HTTP_400_BAD_REQUEST)
+
+        fields = {
+            "stripe_payment_intent_id": intent.get("id", ""),
+            "stripe_payment_status": intent.get("status", ""),
+            "status": "PENDING",
+        }
+        if any(getattr(donation, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(donation, name, value)
+            donation.save(update_fields=list(fields))
 
         return Response({"client_secret": intent.get("client_secret")})
 
@@ -177,7 +362,7 @@ def stripe_webhook(request):
     sig_header = request.META.get("HTTP_STRIPE_SIGNATURE", "")
 
     try:
-        event = stripe.Webhook.construct_event(
+        stripe.Webhook.construct_event(
             payload=payload,
             sig_header=sig_header,
             secret=webhook_secret,
@@ -185,20 +370,7 @@ def stripe_webhook(request):
     except Exception:
         return HttpResponse(status=400)
 
-    event_type = event.get("type", "")
-    data_object = (event.get("data") or {}).get("object") or {}
-
-    if event_type in ("payment_intent.succeeded", "payment_intent.payment_failed"):
-        donation_id = ((data_object.get("metadata") or {}).get("donation_id")) or None
-
-        if donation_id:
-            try:
-                donation = Donation.objects.get(id=int(donation_id))
-                donation.stripe_payment_status = data_object.get("status", "")
-                donation.status = "PAID" if event_type == "payment_intent.succeeded" else "FAILED"
-                donation.save()
-            except Donation.DoesNotExist:
-                pass
-
+    # רק שומרים ב-inbox (אידמפוטנטי לפי event id); העיבוד ב-process_stripe_events
+    webhooks.store_event(json.loads(payload))
     return HttpResponse(status=200)
 
@@ -0,0 +1,192 @@
+"""
+עיבוד אסינכרוני ואידמפוטנטי של אירועי Stripe.
+
+1. stripe_webhook מאמת חתימה, שומר את האירוע ב-StripeEvent (ייחודי לפי event id,
+   כפילויות נבלעות) ומחזיר 200 מיד.
+2. process_batch (manage.py process_stripe_events) מעבד את הממתינים במנות:
+   לפי סדר event.created, נועל את התרומות, מחשב סטטוס סופי לכל תרומה,
+   כותב ב-bulk_update אחד ומעדכן את המונים (totals.apply_many).
+
+סטטוס רק "מתקדם" לפי STATUS_RANK, כך שאירוע שהגיע באיחור
+(payment_failed אחרי succeeded, succeeded אחרי refund) לא מחזיר אחורה.
+"""
+import datetime
+
+import stripe
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Donation, StripeEvent
+from . import totals
+
+
+MAX_ATTEMPTS = 5
+
+STATUS_RANK = {"PENDING": 0, "FAILED": 1, "PAID": 2, "REFUNDED": 3}
+
+
+# ======================
+# inbox
+# ======================
+def store_event(event):
+    """
+    event: ה-JSON של Stripe (dict). -> True אם נשמר, False אם כבר היה (retry של Stripe).
+    """
+    created = event.get("created")
+    _, stored = StripeEvent.objects.get_or_create(
+        event_id=event["id"],
+        defaults={
+            "event_type": event.get("type", ""),
+            "payload": event,
+            "stripe_created": (
+                datetime.datetime.fromtimestamp(int(created), tz=datetime.timezone.utc)
+                if created else timezone.now()
+            ),
+        },
+    )
+    return stored
+
+
+def target_of(payload):
+    """
+    -> (lookup, status, stripe_status) או None לאירועים שלא נוגעים לתרומות.
+    lookup: ("id", donation_id) או ("pi", payment_intent_id)
+    """
+    event_type = payload.get("type", "")
+    obj = (payload.get("data") or {}).get("object") or {}
+
+    if event_type in ("payment_intent.succeeded", "payment_intent.payment_failed"):
+        status = "PAID" if event_type == "payment_intent.succeeded" else "FAILED"
+        return lookup_of(obj), status, obj.get("status", "")
+
+    # רק החזר מלא מבטל את התרומה
+    if event_type == "charge.refunded" and obj.get("refunded") and obj.get("payment_intent"):
+        return ("pi", obj["payment_intent"]), "REFUNDED", "refunded"
+
+    return None
+
+
+def lookup_of(intent):
+    """
+    PaymentIntent -> ("id", donation_id) מה-metadata, או ("pi", intent id).
+    """
+    donation_id = (intent.get("metadata") or {}).get("donation_id")
+    try:
+        return ("id", int(donation_id)) if donation_id else ("pi", intent.get("id") or "")
+    except (TypeError, ValueError):
+        return ("pi", intent.get("id") or "")
+
+
+# ======================
+# worker
+# ======================
+def process_batch(batch_size=500):
+    """
+    מעבד מנה אחת של אירועים ממתינים. -> כמה אירועים נלקחו (0 = התור ריק).
+    אם המנה נכשלת - מעבדים אחד-אחד, כדי שאירוע בעייתי לא יתקע את האחרים;
+    הוא מנוסה שוב עד MAX_ATTEMPTS.
+    """
+    with transaction.atomic():
+        events = list(
+            StripeEvent.objects
+            .select_for_update(skip_locked=True)
+            .filter(processed_at__isnull=True, attempts__lt=MAX_ATTEMPTS)
+            .order_by("stripe_created", "id")[:batch_size]
+        )
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                _apply_events(events)
+            _mark_processed(events)
+        except Exception:
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        _apply_events([event])
+                    _mark_processed([event])
+                except Exception as e:
+                    StripeEvent.objects.filter(pk=event.pk).update(
+                        attempts=F("attempts") + 1,
+                        last_error=repr(e)[:2000],
+                    )
+    return len(events)
+
+
+def _mark_processed(events):
+    StripeEvent.objects.filter(pk__in=[ev.pk for ev in events]).update(
+        processed_at=timezone.now(),
+        attempts=F("attempts") + 1,
+        last_error="",
+    )
+
+
+def process_inbox(batch_size=500):
+    processed = 0
+    while True:
+        n = process_batch(batch_size=batch_size)
+        if not n:
+            return processed
+        processed += n
+
+
+def _apply_events(events):
+    apply_status_changes([t for t in (target_of(ev.payload) for ev in events) if t])
+
+
+def apply_status_changes(targets):
+    """
+    targets = [(lookup, status, stripe_status), ...] לפי סדר הזמן.
+    נועל את התרומות, סטטוס רק מתקדם (STATUS_RANK); stripe_payment_status מתעדכן
+    גם בלי שינוי סטטוס. bulk_update אחד + עדכון המונים. -> כמה תרומות השתנו.
+    חייב לרוץ בתוך transaction.
+    """
+    if not targets:
+        return 0
+
+    ids = {value for (kind, value), _, _ in targets if kind == "id"}
+    intents = {value for (kind, value), _, _ in targets if kind == "pi" and value}
+
+    donations = list(
+        Donation.objects
+        .select_for_update()
+        .filter(Q(id__in=ids) | Q(stripe_payment_intent_id__in=intents))
+        .order_by("pk")
+    )
+    by_id = {d.pk: d for d in donations}
+    by_intent = {d.stripe_payment_intent_id: d for d in donations if d.stripe_payment_intent_id}
+
+    previous = {d.pk: (d.status, d.stripe_payment_status) for d in donations}
+    for (kind, value), status, stripe_status in targets:
+        donation = by_id.get(value) if kind == "id" else by_intent.get(value)
+        if donation is None:
+            continue
+        rank, current = STATUS_RANK.get(status, 0), STATUS_RANK.get(donation.status, 0)
+        if rank > current:
+            donation.status = status
+        if rank >= current and stripe_status:
+            donation.stripe_payment_status = stripe_status
+
+    changed = [d for d in donations if (d.status, d.stripe_payment_status) != previous[d.pk]]
+    if not changed:
+        return 0
+
+    Donation.objects.bulk_update(changed, ["status", "stripe_payment_status"])
+
+    moves = []
+    for donation in changed:
+        was_paid = previous[donation.pk][0] == totals.PAID
+        is_paid = donation.status == totals.PAID
+        if was_paid != is_paid:
+            moves.append((donation, 1 if is_paid else -1))
+    totals.apply_many(moves)
+    return len(changed)
+
+
+def signature_header(payload, secret, timestamp=None):
+    """
+    Stripe-Signature לגוף נתון - לבדיקות ולשליחת אירועים מזויפים מקומית.
+    """
+    return stripe.WebhookSignature.generate_signature_header(payload, secret, timestamp=timestamp)
@@ -0,0 +1,132 @@
+"""
+פענוח שדה השעות החופשי (EventSignup.hours) למספר שעות (EventSignup.duration_hours).
+
+- משך: "3" / "3.5" / "3,5" / "2:30" / "3 שעות" / "4h" / "שעה" / "שעתיים" / "חצי שעה"
+  / "רבע שעה", ו-"וחצי" / "ורבע" מוסיפים 0.5 / 0.25 ("שעתיים וחצי" -> 2.5)
+- דקות: "45 דקות" / "90 min" -> חלקי 60; ימים / שבועות / חודשים ("3 ימים") -> None
+- טווח שעון: "10:00–14:00" / "10-14" (מקף, en dash או em dash) -> סוף פחות התחלה;
+  טווח שחוצה חצות ("22:00-02:00") -> 4
+- טווח עם משך ("10:00–14:00 / 4 שעות"): רק אם הם מסכימים
+
+טקסט דו-משמעי ("3-4 שעות", "3 או 4", שני טווחים) -> None, לא מנחשים.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+
+MAX_HOURS = Decimal("999.99")
+CENTS = Decimal("0.01")
+
+_TIME = r"(\d{1,2})(?:\s*:\s*(\d{2}))?"
+_RANGE_RE = re.compile(_TIME + r"\s*[-–—]\s*" + _TIME)
+_CLOCK_RE = re.compile(r"(\d{1,3})\s*:\s*(\d{1,2})")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+_UNIT_RE = re.compile(r"(שעות|שעה|h\b|hours?\b)", re.IGNORECASE)
+_MINUTES_RE = re.compile(r"(דקות|דקה|min(?:utes?|s)?\b)", re.IGNORECASE)
+_OTHER_UNITS_RE = re.compile(
+    r"(ימים|יומיים|יום|שבועות|שבוע|חודשים|חודש|days?\b|d\b|weeks?\b|months?\b)", re.IGNORECASE
+)
+_WORDS = (
+    ("חצי שעה", Decimal("0.5")),
+    ("רבע שעה", Decimal("0.25")),
+    ("שעתיים", Decimal("2")),
+    ("שעה", Decimal("1")),
+)
+_FRACTIONS = (
+    ("וחצי", Decimal("0.5")),
+    ("ורבע", Decimal("0.25")),
+)
+
+
+class _Ambiguous(Exception):
+    pass
+
+
+def _clock_time(hours, minutes):
+    hours, minutes = int(hours), int(minutes or 0)
+    if hours > 24 or minutes >= 60:
+        raise _Ambiguous()
+    return Decimal(hours) + Decimal(minutes) / 60
+
+
+def _range_hours(match, text):
+    start_h, start_m, end_h, end_m = match.groups()
+    # "3-4 שעות": טווח של משכים, לא שעון
+    if start_m is None and end_m is None and _UNIT_RE.match(text[match.end():].lstrip()):
+        raise _Ambiguous()
+    start, end = _clock_time(start_h, start_m), _clock_time(end_h, end_m)
+    if end == start:
+        raise _Ambiguous()
+    if end < start:
+        end += 24  # חוצה חצות
+    return end - start
+
+
+def _duration(text):
+    """
+    משך אחד בטקסט (בלי טווחים) -> Decimal או None; יותר ממספר אחד -> _Ambiguous.
+    """
+    clocks = _CLOCK_RE.findall(text)
+    plain = _CLOCK_RE.sub(" ", text)
+    numbers = list(_NUMBER_RE.finditer(plain))
+    if len(clocks) + len(numbers) > 1:
+        raise _Ambiguous()
+
+    if clocks:
+        hours, minutes = int(clocks[0][0]), int(clocks[0][1])
+        if minutes >= 60:
+            raise _Ambiguous()
+        return Decimal(hours) + Decimal(minutes) / 60
+
+    value = None
+    per_hour = 1
+    if numbers:
+        unit = plain[numbers[0].end():].lstrip()
+        if _OTHER_UNITS_RE.match(unit):
+            return None
+        if _MINUTES_RE.match(unit):
+            per_hour = 60
+        try:
+            value = Decimal(numbers[0].group(0).replace(",", "."))
+        except InvalidOperation:
+            return None
+    else:
+        for word, hours in _WORDS:
+            if word in text:
+                value = hours
+                break
+
+    if value is not None:
+        for word, extra in _FRACTIONS:
+            if word in text:
+                value += extra
+        value /= per_hour
+    return value
+
+
+def parse_hours(text):
+    """
+    -> Decimal (שתי ספרות אחרי הנקודה) או None אם אין מספר סביר / הטקסט דו-משמעי.
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+
+    try:
+        ranges = list(_RANGE_RE.finditer(text))
+        if len(ranges) > 1:
+            raise _Ambiguous()
+        if ranges:
+            value = _range_hours(ranges[0], text)
+            rest = text[:ranges[0].start()] + " " + text[ranges[0].end():]
+            stated = _duration(rest)
+            if stated is not None and stated.quantize(CENTS) != value.quantize(CENTS):
+                raise _Ambiguous()
+        else:
+            value = _duration(text)
+    except _Ambiguous:
+        return None
+
+    if value is None or value < 0 or value > MAX_HOURS:
+        return None
+    return value.quantize(CENTS)
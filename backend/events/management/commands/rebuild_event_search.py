@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from events import search
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Rebuild Event.search_title/search_body (and the SQLite FTS5 table) in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        qs = Event.objects.only("id", "title", "description", "category", "location").order_by("id")
+
+        total = 0
+        batch = []
+        for event in qs.iterator(chunk_size=batch_size):
+            event.search_title, event.search_body = search.build_documents(event)
+            batch.append(event)
+            if len(batch) >= batch_size:
+                Event.objects.bulk_update(batch, ["search_title", "search_body"])
+                total += len(batch)
+                batch = []
+        if batch:
+            Event.objects.bulk_update(batch, ["search_title", "search_body"])
+            total += len(batch)
+
+        search.rebuild_fts5()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} events"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from events.stats import rebuild_hours_totals, rebuild_volunteer_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild VolunteerStats and OrgStats from EventSignup with one grouped query and batched upserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild_volunteer_stats(batch_size=options["batch_size"])
+        _, orgs = rebuild_hours_totals(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {written} volunteers and {orgs} organizations"))
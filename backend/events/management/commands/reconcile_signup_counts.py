@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from events.signups import reconcile_signup_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.signups_count from EventSignup in id-range batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        fixed = reconcile_signup_counts(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Fixed {fixed} events"))
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations, models
+
+from config.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('events', '0004_remove_eventsignup_unique_volunteer_per_event_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['organization', 'date'], name='event_org_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['date'], name='event_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='eventsignup',
+            index=models.Index(fields=['volunteer', 'event'], name='signup_volunteer_event_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='eventsignup',
+            index=models.Index(fields=['volunteer', 'rating'], name='signup_volunteer_rating_idx'),
+        ),
+    ]
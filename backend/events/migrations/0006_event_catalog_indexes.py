@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+from config.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('events', '0005_event_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['category', 'date'], name='event_category_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='event',
+            index=models.Index(fields=['location', 'date'], name='event_location_date_idx'),
+        ),
+    ]
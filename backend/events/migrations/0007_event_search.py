@@ -0,0 +1,119 @@
+import re
+
+from django.db import migrations, models
+
+from config.migration_operations import RunSQLForVendor
+
+
+BATCH_SIZE = 1000
+
+
+# ======================
+# עותק קפוא של הנרמול ב-events.search (לא משתנה עם קוד האפליקציה)
+# ======================
+HEBREW_PREFIXES = frozenset("והבלמש")
+MAX_PREFIX_LETTERS = 3
+MIN_STEM_LENGTH = 3
+
+_MARKS_RE = re.compile(r"[\u0591-\u05BD\u05BF-\u05C7]")
+_QUOTES_IN_WORD_RE = re.compile(r"(?<=\w)[\"'\u05F3\u05F4](?=\w)")
+_TOKEN_RE = re.compile(r"\w+")
+_FINALS = str.maketrans("ךםןףץ", "כמנפצ")
+
+
+def normalize(text):
+    text = (text or "").replace("\u05BE", " ")
+    text = _MARKS_RE.sub("", text)
+    text = _QUOTES_IN_WORD_RE.sub("", text)
+    return text.translate(_FINALS).casefold()
+
+
+def variants(token):
+    out = [token]
+    stem = token
+    for _ in range(MAX_PREFIX_LETTERS):
+        if stem[:1] not in HEBREW_PREFIXES or len(stem) - 1 < MIN_STEM_LENGTH:
+            break
+        stem = stem[1:]
+        out.append(stem)
+    return out
+
+
+def document(text):
+    seen = []
+    for token in _TOKEN_RE.findall(normalize(text)):
+        seen.extend(variants(token))
+    return " ".join(seen)
+
+
+def build_documents(event):
+    body = " ".join(
+        part for part in (event.category, event.location, event.description) if part
+    )
+    return document(event.title), document(body)
+
+
+def build_search_documents(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    qs = Event.objects.only('id', 'title', 'description', 'category', 'location')
+    for event in qs.iterator(chunk_size=BATCH_SIZE):
+        event.search_title, event.search_body = build_documents(event)
+        batch.append(event)
+        if len(batch) >= BATCH_SIZE:
+            Event.objects.bulk_update(batch, ['search_title', 'search_body'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['search_title', 'search_body'])
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('events', '0006_event_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_title',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='search_body',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop, atomic=True),
+
+        # Postgres: tsvector מחושב מ-search_title (A) + search_body (B) + GIN
+        RunSQLForVendor(
+            'postgresql',
+            sql="""
+                ALTER TABLE events_event ADD COLUMN search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple'::regconfig, search_title), 'A')
+                    || setweight(to_tsvector('simple'::regconfig, search_body), 'B')
+                ) STORED
+            """,
+            reverse_sql="ALTER TABLE events_event DROP COLUMN search_vector",
+        ),
+        RunSQLForVendor(
+            'postgresql',
+            sql="CREATE INDEX CONCURRENTLY event_search_vector_idx ON events_event USING gin (search_vector)",
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS event_search_vector_idx",
+        ),
+
+        # SQLite: טבלת FTS5 (מסונכרנת ב-events/signals.py)
+        RunSQLForVendor(
+            'sqlite',
+            sql=[
+                "CREATE VIRTUAL TABLE events_event_fts USING fts5(search_title, search_body)",
+                "INSERT INTO events_event_fts (rowid, search_title, search_body) "
+                "SELECT id, search_title, search_body FROM events_event",
+            ],
+            reverse_sql="DROP TABLE events_event_fts",
+        ),
+    ]
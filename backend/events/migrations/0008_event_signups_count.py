@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_signups_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventSignup = apps.get_model('events', 'EventSignup')
+    actual = (
+        EventSignup.objects
+        .filter(event=OuterRef('pk'))
+        .order_by()
+        .values('event')
+        .annotate(c=Count('pk'))
+        .values('c')[:1]
+    )
+    Event.objects.update(signups_count=Coalesce(Subquery(actual), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='signups_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_signups_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+from config.migration_operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY לא רץ בתוך טרנזקציה
+    atomic = False
+
+    dependencies = [
+        ('events', '0008_event_signups_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='waitlist_seq',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='eventsignup',
+            name='status',
+            field=models.CharField(choices=[('CONFIRMED', 'Confirmed'), ('WAITLISTED', 'Waitlisted')], default='CONFIRMED', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='eventsignup',
+            name='waitlist_position',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='eventsignup',
+            index=models.Index(fields=['event', 'status', 'waitlist_position'], name='signup_waitlist_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+BATCH_SIZE = 1000
+
+
+def build_volunteer_stats(apps, schema_editor):
+    """
+    עותק קפוא של events.stats.rebuild_volunteer_stats על המודלים ההיסטוריים:
+    שאילתה מקובצת אחת + upsert במנות.
+    """
+    VolunteerStats = apps.get_model('events', 'VolunteerStats')
+    EventSignup = apps.get_model('events', 'EventSignup')
+
+    rows = (
+        EventSignup.objects
+        .order_by()
+        .values('volunteer_id')
+        .annotate(
+            activities=Count('pk', filter=Q(status='CONFIRMED')),
+            rated=Count('rating'),
+            rating_total=Coalesce(Sum('rating'), 0.0),
+        )
+        .order_by('volunteer_id')
+    )
+
+    batch = []
+
+    def flush():
+        VolunteerStats.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=['volunteer'],
+            update_fields=['activities_count', 'ratings_count', 'rating_sum'],
+        )
+
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(VolunteerStats(
+            volunteer_id=row['volunteer_id'],
+            activities_count=row['activities'],
+            ratings_count=row['rated'],
+            rating_sum=row['rating_total'],
+        ))
+        if len(batch) >= BATCH_SIZE:
+            flush()
+            batch = []
+    if batch:
+        flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_volunteerprofile_reliability_score'),
+        ('events', '0009_waitlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerStats',
+            fields=[
+                ('volunteer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='vol_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('activities_count', models.PositiveIntegerField(default=0)),
+                ('ratings_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0)),
+                ('hours_total', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+            ],
+        ),
+        migrations.RunPython(build_volunteer_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,227 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:14
+
+import re
+from decimal import Decimal, InvalidOperation
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+# ======================
+# עותק קפוא של events.hours.parse_hours (לא משתנה עם קוד האפליקציה)
+# ======================
+MAX_HOURS = Decimal("999.99")
+CENTS = Decimal("0.01")
+
+_TIME = r"(\d{1,2})(?:\s*:\s*(\d{2}))?"
+_RANGE_RE = re.compile(_TIME + r"\s*[-–—]\s*" + _TIME)
+_CLOCK_RE = re.compile(r"(\d{1,3})\s*:\s*(\d{1,2})")
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)?")
+_UNIT_RE = re.compile(r"(שעות|שעה|h\b|hours?\b)", re.IGNORECASE)
+_MINUTES_RE = re.compile(r"(דקות|דקה|min(?:utes?|s)?\b)", re.IGNORECASE)
+_OTHER_UNITS_RE = re.compile(
+    r"(ימים|יומיים|יום|שבועות|שבוע|חודשים|חודש|days?\b|d\b|weeks?\b|months?\b)", re.IGNORECASE
+)
+_WORDS = (
+    ("חצי שעה", Decimal("0.5")),
+    ("רבע שעה", Decimal("0.25")),
+    ("שעתיים", Decimal("2")),
+    ("שעה", Decimal("1")),
+)
+_FRACTIONS = (
+    ("וחצי", Decimal("0.5")),
+    ("ורבע", Decimal("0.25")),
+)
+
+
+class _Ambiguous(Exception):
+    pass
+
+
+def _clock_time(hours, minutes):
+    hours, minutes = int(hours), int(minutes or 0)
+    if hours > 24 or minutes >= 60:
+        raise _Ambiguous()
+    return Decimal(hours) + Decimal(minutes) / 60
+
+
+def _range_hours(match, text):
+    start_h, start_m, end_h, end_m = match.groups()
+    if start_m is None and end_m is None and _UNIT_RE.match(text[match.end():].lstrip()):
+        raise _Ambiguous()
+    start, end = _clock_time(start_h, start_m), _clock_time(end_h, end_m)
+    if end == start:
+        raise _Ambiguous()
+    if end < start:
+        end += 24
+    return end - start
+
+
+def _duration(text):
+    clocks = _CLOCK_RE.findall(text)
+    plain = _CLOCK_RE.sub(" ", text)
+    numbers = list(_NUMBER_RE.finditer(plain))
+    if len(clocks) + len(numbers) > 1:
+        raise _Ambiguous()
+
+    if clocks:
+        hours, minutes = int(clocks[0][0]), int(clocks[0][1])
+        if minutes >= 60:
+            raise _Ambiguous()
+        return Decimal(hours) + Decimal(minutes) / 60
+
+    value = None
+    per_hour = 1
+    if numbers:
+        unit = plain[numbers[0].end():].lstrip()
+        if _OTHER_UNITS_RE.match(unit):
+            return None
+        if _MINUTES_RE.match(unit):
+            per_hour = 60
+        try:
+            value = Decimal(numbers[0].group(0).replace(",", "."))
+        except InvalidOperation:
+            return None
+    else:
+        for word, hours in _WORDS:
+            if word in text:
+                value = hours
+                break
+
+    if value is not None:
+        for word, extra in _FRACTIONS:
+            if word in text:
+                value += extra
+        value /= per_hour
+    return value
+
+
+def parse_hours(text):
+    text = (text or "").strip()
+    if not text:
+        return None
+
+    try:
+        ranges = list(_RANGE_RE.finditer(text))
+        if len(ranges) > 1:
+            raise _Ambiguous()
+        if ranges:
+            value = _range_hours(ranges[0], text)
+            rest = text[:ranges[0].start()] + " " + text[ranges[0].end():]
+            stated = _duration(rest)
+            if stated is not None and stated.quantize(CENTS) != value.quantize(CENTS):
+                raise _Ambiguous()
+        else:
+            value = _duration(text)
+    except _Ambiguous:
+        return None
+
+    if value is None or value < 0 or value > MAX_HOURS:
+        return None
+    return value.quantize(CENTS)
+
+
+def parse_existing_hours(apps, schema_editor):
+    """
+    hours (טקסט חופשי) -> duration_hours, במנות לפי id עם bulk_update.
+    """
+    EventSignup = apps.get_model("events", "EventSignup")
+    batch_size = 1000
+    last_id = 0
+
+    while True:
+        rows = list(
+            EventSignup.objects
+            .filter(id__gt=last_id)
+            .exclude(hours="")
+            .order_by("id")
+            .only("id", "hours")[:batch_size]
+        )
+        if not rows:
+            break
+
+        changed = []
+        for row in rows:
+            row.duration_hours = parse_hours(row.hours)
+            if row.duration_hours is not None:
+                changed.append(row)
+        EventSignup.objects.bulk_update(changed, ["duration_hours"])
+        last_id = rows[-1].id
+
+
+def build_hours_totals(apps, schema_editor):
+    """
+    hours_total של VolunteerStats / OrgStats מ-duration_hours (עותק קפוא של
+    events.stats.rebuild_hours_totals על המודלים ההיסטוריים).
+    """
+    EventSignup = apps.get_model("events", "EventSignup")
+    VolunteerStats = apps.get_model("events", "VolunteerStats")
+    OrgStats = apps.get_model("events", "OrgStats")
+    batch_size = 1000
+
+    with_hours = EventSignup.objects.filter(duration_hours__isnull=False).order_by()
+    by_volunteer = (
+        with_hours.values("volunteer_id")
+        .annotate(hours=Sum("duration_hours"))
+        .order_by("volunteer_id")
+        .values_list("volunteer_id", "hours")
+    )
+    by_org = (
+        with_hours.values("event__organization_id")
+        .annotate(hours=Sum("duration_hours"))
+        .order_by("event__organization_id")
+        .values_list("event__organization_id", "hours")
+    )
+
+    for model, key, rows in ((VolunteerStats, "volunteer", by_volunteer), (OrgStats, "organization", by_org)):
+        batch = []
+        for pk, hours in rows.iterator(chunk_size=batch_size):
+            batch.append(model(pk=pk, hours_total=hours))
+            if len(batch) >= batch_size:
+                model.objects.bulk_create(
+                    batch, update_conflicts=True, unique_fields=[key], update_fields=["hours_total"]
+                )
+                batch = []
+        if batch:
+            model.objects.bulk_create(
+                batch, update_conflicts=True, unique_fields=[key], update_fields=["hours_total"]
+            )
+
+    VolunteerStats.objects.exclude(
+        volunteer_id__in=with_hours.values("volunteer_id")
+    ).exclude(hours_total=0).update(hours_total=0)
+    OrgStats.objects.exclude(
+        organization_id__in=with_hours.values("event__organization_id")
+    ).exclude(hours_total=0).update(hours_total=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_volunteerprofile_reliability_score'),
+        ('events', '0010_volunteer_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrgStats',
+            fields=[
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='org_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('hours_total', models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=12)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='eventsignup',
+            name='duration_hours',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.AlterField(
+            model_name='volunteerstats',
+            name='hours_total',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(parse_existing_hours, migrations.RunPython.noop),
+        migrations.RunPython(build_hours_totals, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 
+from . import search
+
 
 class Event(models.Model):
     # רק עמותה יוצרת אירוע
@@ -23,24 +25,69 @@ class Event(models.Model):
 
     needed_volunteers = models.PositiveIntegerField(default=1)
 
+    # מונים מתוחזקים (events/signups.py); לתיקון: manage.py reconcile_signup_counts
+    signups_count = models.PositiveIntegerField(default=0, editable=False)
+    waitlist_count = models.PositiveIntegerField(default=0, editable=False)
+    # מספר "כרטיס" רץ לרשימת ההמתנה (EventSignup.waitlist_position)
+    waitlist_seq = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # טקסט מנורמל לחיפוש (ראו events/search.py) - מתעדכן ב-save()
+    search_title = models.TextField(blank=True, default="", editable=False)
+    search_body = models.TextField(blank=True, default="", editable=False)
+
+    COUNTER_FIELDS = ("signups_count", "waitlist_count", "waitlist_seq")
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # אירועי עמותה לפי תאריך (upcoming/history בדשבורד עמותה, ?org=)
+            models.Index(fields=["organization", "date"], name="event_org_date_idx"),
+            # upcoming/history כלליים
+            models.Index(fields=["date"], name="event_date_idx"),
+            # פילטרים של הקטלוג (?category= / ?location= + טווח תאריכים)
+            models.Index(fields=["category", "date"], name="event_category_date_idx"),
+            models.Index(fields=["location", "date"], name="event_location_date_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        self.search_title, self.search_body = search.build_documents(self)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {"search_title", "search_body"}
+        elif not self._state.adding:
+            # המונים מתעדכנים רק ב-UPDATE אטומי; save() רגיל לא דורס אותם
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+
 
 from django.db import models
 from django.conf import settings
 
 class EventSignup(models.Model):
+    class Status(models.TextChoices):
+        CONFIRMED = "CONFIRMED", "Confirmed"
+        WAITLISTED = "WAITLISTED", "Waitlisted"
+
     event = models.ForeignKey("Event", related_name="signups", on_delete=models.CASCADE)
     volunteer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # --- רשימת המתנה ---
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.CONFIRMED)
+    # סדר בתור (Event.waitlist_seq בזמן ההצטרפות); None כשמאושר
+    waitlist_position = models.PositiveIntegerField(null=True, blank=True)
+
     # --- דירוגים (1–5) ---
     rating_reliability = models.PositiveSmallIntegerField(null=True, blank=True)
     rating_execution = models.PositiveSmallIntegerField(null=True, blank=True)
@@ -52,6 +99,8 @@ class EventSignup(models.Model):
     # מטא
     role = models.CharField(max_length=64, blank=True, default="")
     hours = models.CharField(max_length=64, blank=True, default="")
+    # שעות כמספר (מפוענח מ-hours או נשלח ישירות) - נסכם ב-VolunteerStats/OrgStats
+    duration_hours = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
     task_desc = models.CharField(max_length=255, blank=True, default="")
     notes = models.TextField(blank=True, default="")
 
@@ -65,4 +114,58 @@ class EventSignup(models.Model):
 
     class Meta:
         unique_together = ("event", "volunteer")
+        indexes = [
+            # ההרשמות של מתנדב (+ join ל-event__date בדשבורד)
+            models.Index(fields=["volunteer", "event"], name="signup_volunteer_event_idx"),
+            # דירוגים של מתנדב (Avg/Count ב-DashboardStatsView)
+            models.Index(fields=["volunteer", "rating"], name="signup_volunteer_rating_idx"),
+            # ראש רשימת ההמתנה של אירוע
+            models.Index(fields=["event", "status", "waitlist_position"], name="signup_waitlist_idx"),
+        ]
+
+
+
+class VolunteerStats(models.Model):
+    """
+    סטטיסטיקות מתנדב מתוחזקות (events/stats.py) - הדשבורד קורא שורה אחת לפי PK.
+    לבנייה מחדש: manage.py rebuild_volunteer_stats
+    """
+    volunteer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="vol_stats",
+    )
 
+    # הרשמות מאושרות (כולל מי שקודם מרשימת המתנה)
+    activities_count = models.PositiveIntegerField(default=0)
+    ratings_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    hours_total = models.DecimalField(max_digits=10, decimal_places=2, default=0, db_index=True)
+
+    @property
+    def reliability_score(self):
+        if not self.ratings_count:
+            return 0
+        return round(self.rating_sum / self.ratings_count, 2)
+
+    def __str__(self):
+        return f"stats for user#{self.volunteer_id}"
+
+
+class OrgStats(models.Model):
+    """
+    סך שעות ההתנדבות באירועי העמותה, מתוחזק ב-events/stats.py.
+    לבנייה מחדש: manage.py rebuild_volunteer_stats
+    """
+    organization = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="org_stats",
+    )
+
+    hours_total = models.DecimalField(max_digits=12, decimal_places=2, default=0, db_index=True)
+
+    def __str__(self):
+        return f"stats for org#{self.organization_id}"
@@ -0,0 +1,228 @@
+"""
+חיפוש טקסט מלא באירועים (title / description / category / location).
+
+הנרמול נעשה בפייתון, כדי שיהיה זהה בשני ה-backends:
+- מסירים ניקוד וטעמים, מקף עברי -> רווח, גרש/גרשיים בתוך מילה (צה"ל -> צהל)
+- מקפלים אותיות סופיות (ך->כ, ם->מ, ן->נ, ף->פ, ץ->צ) ו-casefold ללטינית
+- לכל מילה שמתחילה בתחיליות ו/ה/ב/ל/מ/ש נשמרות גם הגרסאות בלי התחילית
+  ("ובבית" -> "ובבית", "בבית", "בית"), כך ש"בית" מוצא גם את "ובבית"
+
+התוצאה נשמרת ב-Event.search_title / Event.search_body, ומעליהן:
+- Postgres: עמודת tsvector מחושבת (GENERATED ... STORED) עם אינדקס GIN
+- SQLite: טבלת FTS5 (events_event_fts) שמסונכרנת מ-signals.py
+"""
+import html
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = "events_event_fts"
+
+HEBREW_PREFIXES = frozenset("והבלמש")
+MAX_PREFIX_LETTERS = 3
+MIN_STEM_LENGTH = 3
+
+_MARKS_RE = re.compile(r"[\u0591-\u05BD\u05BF-\u05C7]")  # ניקוד וטעמים (בלי מקף)
+_QUOTES_IN_WORD_RE = re.compile(r"(?<=\w)[\"'\u05F3\u05F4](?=\w)")
+_TOKEN_RE = re.compile(r"\w+")
+_FINALS = str.maketrans("ךםןףץ", "כמנפצ")
+
+
+# ======================
+# נרמול
+# ======================
+def normalize(text):
+    text = (text or "").replace("\u05BE", " ")  # מקף עברי
+    text = _MARKS_RE.sub("", text)
+    text = _QUOTES_IN_WORD_RE.sub("", text)
+    return text.translate(_FINALS).casefold()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def variants(token):
+    """
+    המילה עצמה + הגרסאות בלי תחיליות (ו/ה/ב/ל/מ/ש), עד שלוש אותיות.
+    """
+    out = [token]
+    stem = token
+    for _ in range(MAX_PREFIX_LETTERS):
+        if stem[:1] not in HEBREW_PREFIXES or len(stem) - 1 < MIN_STEM_LENGTH:
+            break
+        stem = stem[1:]
+        out.append(stem)
+    return out
+
+
+def document(text):
+    """
+    טקסט מנורמל ומורחב (כולל גרסאות בלי תחיליות) לאינדקס.
+    """
+    seen = []
+    for token in tokenize(text):
+        seen.extend(variants(token))
+    return " ".join(seen)
+
+
+def build_documents(event):
+    """
+    -> (search_title, search_body) עבור אירוע (גם מודל היסטורי במיגרציה).
+    """
+    body = " ".join(
+        part for part in (event.category, event.location, event.description) if part
+    )
+    return document(event.title), document(body)
+
+
+def query_terms(q):
+    """
+    "ארוחה בבית" -> [["ארוחה"], ["בבית", "בית"]]
+    כל קבוצה היא OR, בין הקבוצות AND.
+    רק המילה המקורית (הראשונה בקבוצה) מותאמת כ-prefix; הגרסאות בלי
+    תחיליות מותאמות בדיוק, כדי ש"שלום" לא ימצא את "לומדים".
+    """
+    return [variants(token) for token in tokenize(q)]
+
+
+# ======================
+# שאילתות (Postgres / SQLite)
+# ======================
+def _tsquery(terms):
+    return " & ".join(
+        "(" + " | ".join([f"'{group[0]}':*"] + [f"'{v}'" for v in group[1:]]) + ")"
+        for group in terms
+    )
+
+
+def _fts5_match(terms):
+    return " AND ".join(
+        "(" + " OR ".join([f'"{group[0]}"*'] + [f'"{v}"' for v in group[1:]]) + ")"
+        for group in terms
+    )
+
+
+def search(qs, q, rank=False):
+    """
+    מסנן queryset של Event לפי חיפוש טקסט מלא.
+    rank=True מוסיף search_rank (גבוה = רלוונטי יותר).
+    """
+    terms = query_terms(q)
+    if not terms:
+        return qs.none()
+
+    table = qs.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        tsquery = _tsquery(terms)
+        qs = qs.filter(RawSQL(
+            f'"{table}"."search_vector" @@ to_tsquery(\'simple\', %s)',
+            [tsquery],
+            output_field=BooleanField(),
+        ))
+        if rank:
+            qs = qs.annotate(search_rank=RawSQL(
+                f'ts_rank_cd("{table}"."search_vector", to_tsquery(\'simple\', %s))',
+                [tsquery],
+                output_field=FloatField(),
+            ))
+        return qs
+
+    match = _fts5_match(terms)
+    qs = qs.filter(id__in=RawSQL(
+        f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+        [match],
+    ))
+    if rank:
+        # bm25: קטן = טוב יותר, ולכן הופכים סימן. title שוקל פי 10.
+        qs = qs.annotate(search_rank=RawSQL(
+            f"-(SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = "{table}"."id")',
+            [match],
+            output_field=FloatField(),
+        ))
+    return qs
+
+
+# ======================
+# סנכרון FTS5 (SQLite בלבד; ב-Postgres העמודה מחושבת לבד)
+# ======================
+def uses_fts5():
+    return connection.vendor == "sqlite"
+
+
+def index_event(event):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_title, search_body) VALUES (%s, %s, %s)",
+            [event.pk, event.search_title, event.search_body],
+        )
+
+
+def unindex_event(event_id):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [event_id])
+
+
+def rebuild_fts5(table="events_event"):
+    if not uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_title, search_body) "
+            f"SELECT id, search_title, search_body FROM {table}"
+        )
+
+
+# ======================
+# snippets מודגשים (על הטקסט המקורי, רק לשורות בעמוד)
+# ======================
+def _is_hit(word, terms):
+    for token in tokenize(word):
+        forms = variants(token)
+        for group in terms:
+            if any(f.startswith(group[0]) or f in group[1:] for f in forms):
+                return True
+    return False
+
+
+def highlight(text, q, radius=12, mark=("<mark>", "</mark>")):
+    """
+    מחזיר קטע HTML-escaped סביב ההתאמה הראשונה, עם <mark> על המילים שהתאימו.
+    radius=None -> כל הטקסט.
+    """
+    terms = query_terms(q)
+    words = (text or "").split()
+    if not words:
+        return ""
+
+    hits = [i for i, w in enumerate(words) if terms and _is_hit(w, terms)]
+
+    start, end = 0, len(words)
+    if radius is not None:
+        first = hits[0] if hits else 0
+        start = max(0, first - radius // 3)
+        end = min(len(words), start + radius)
+
+    hit_set = set(hits)
+    out = []
+    for i in range(start, end):
+        w = html.escape(words[i])
+        out.append(f"{mark[0]}{w}{mark[1]}" if i in hit_set else w)
+
+    snippet = " ".join(out)
+    if start > 0:
+        snippet = "… " + snippet
+    if end < len(words):
+        snippet += " …"
+    return snippet
@@ -1,10 +1,16 @@
+from django.utils.text import Truncator
 from rest_framework import serializers
+
+from config.sparse_fields import SparseFieldsMixin
 from .models import Event, EventSignup
 
 
-class EventSerializer(serializers.ModelSerializer):
+# כמה תווים מהתיאור בכרטיס של רשימת האירועים
+LIST_DESCRIPTION_CHARS = 160
+
+
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     city = serializers.SerializerMethodField()
-    signups_count = serializers.SerializerMethodField()
     org_name = serializers.SerializerMethodField()
     my_rating = serializers.SerializerMethodField()
 
@@ -24,47 +30,54 @@ class EventSerializer(serializers.ModelSerializer):
             "org_name",
             "created_at",
             "signups_count",
+            "waitlist_count",
             "my_rating",
         ]
-        read_only_fields = ["organization", "created_at", "signups_count", "my_rating"]
+        read_only_fields = ["organization", "created_at", "signups_count", "waitlist_count", "my_rating"]
+        # עמודות ל-.only() (config/sparse_fields.py)
+        sparse_sources = {"org_name": ["organization__email"]}
 
     def get_city(self, obj):
         return getattr(obj, "city", "") or ""
 
-    def get_signups_count(self, obj):
-        annotated = getattr(obj, "signups_count", None)
-        if annotated is not None:
-            return annotated
-        return EventSignup.objects.filter(event=obj).count()
-
     def get_org_name(self, obj):
         org = getattr(obj, "organization", None)
         return getattr(org, "email", "") if org else ""
 
     def get_my_rating(self, obj):
-        req = self.context.get("request")
-        user = getattr(req, "user", None)
+        # מגיע כ-annotation (Subquery על ההרשמה של המתנדב המחובר)
+        return getattr(obj, "my_rating", None)
+
 
-        # אורח -> None
-        if not user or not getattr(user, "is_authenticated", False):
-            return None
+class EventListSerializer(EventSerializer):
+    """
+    כרטיס ברשימת האירועים: תיאור מקוצר (annotation description_preview, בלי לקרוא
+    את כל ה-TextField), ובלי my_rating לאורחים.
+    """
+    description = serializers.SerializerMethodField()
 
-        # רק מתנדב
-        if str(getattr(user, "role", "")).upper() != "VOLUNTEER":
-            return None
+    class Meta(EventSerializer.Meta):
+        sparse_sources = {**EventSerializer.Meta.sparse_sources, "description": []}
 
-        signup = (
-            EventSignup.objects
-            .filter(event=obj, volunteer=user)
-            .only("rating")
-            .first()
-        )
-        return getattr(signup, "rating", None) if signup else None
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        user = getattr(request, "user", None)
+        if not (user and user.is_authenticated):
+            fields.pop("my_rating", None)
+        return fields
 
+    def get_description(self, obj):
+        text = getattr(obj, "description_preview", None)
+        if text is None:
+            text = obj.description
+        return Truncator(text).chars(LIST_DESCRIPTION_CHARS)
 
-class EventSignupSerializer(serializers.ModelSerializer):
+
+class EventSignupSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     volunteer_name = serializers.SerializerMethodField()
     volunteer_email = serializers.SerializerMethodField()
+    volunteer_reliability = serializers.SerializerMethodField()
 
     class Meta:
         model = EventSignup
@@ -72,11 +85,15 @@ class EventSignupSerializer(serializers.ModelSerializer):
             "id",
             "volunteer_name",
             "volunteer_email",
+            "volunteer_reliability",
             "created_at",
+            "status",
+            "waitlist_position",
 
             # תפעולי
             "role",
             "hours",
+            "duration_hours",
             "task_desc",
             "notes",
 
@@ -89,6 +106,10 @@ class EventSignupSerializer(serializers.ModelSerializer):
             # מטא דירוג
             "rated_at",
         ]
+        sparse_sources = {
+            "volunteer_name": ["volunteer__email", "volunteer__vol_profile__full_name"],
+            "volunteer_email": ["volunteer__email"],
+        }
 
     def get_volunteer_name(self, obj):
         v = getattr(obj, "volunteer", None)
@@ -104,6 +125,62 @@ class EventSignupSerializer(serializers.ModelSerializer):
         v = getattr(obj, "volunteer", None)
         return getattr(v, "email", "") if v else ""
 
+    def get_volunteer_reliability(self, obj):
+        # annotation מ-VolunteerStats (ראו EventViewSet.signups)
+        value = getattr(obj, "volunteer_reliability", None)
+        return round(value, 2) if value is not None else None
+
+
+class MyActivitySerializer(serializers.ModelSerializer):
+    """
+    שורה לכל EventSignup של המתנדב + האירוע והעמותה (GET /api/me/activity/).
+    """
+    event_id = serializers.IntegerField(source="event.id", read_only=True)
+    title = serializers.CharField(source="event.title", read_only=True)
+    category = serializers.CharField(source="event.category", read_only=True)
+    location = serializers.CharField(source="event.location", read_only=True)
+    date = serializers.DateField(source="event.date", read_only=True)
+    time = serializers.TimeField(source="event.time", read_only=True)
+    organization = serializers.IntegerField(source="event.organization_id", read_only=True)
+    org_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EventSignup
+        fields = [
+            "id",
+            "event_id",
+            "title",
+            "category",
+            "location",
+            "date",
+            "time",
+            "organization",
+            "org_name",
+            "created_at",
+            "status",
+            "waitlist_position",
+
+            # תפעולי
+            "role",
+            "hours",
+            "duration_hours",
+            "task_desc",
+            "notes",
+
+            # דירוגים
+            "rating_reliability",
+            "rating_execution",
+            "rating_teamwork",
+            "rating",
+            "rated_at",
+        ]
+        read_only_fields = fields
+
+    def get_org_name(self, obj):
+        org = obj.event.organization
+        profile = getattr(org, "org_profile", None)
+        return getattr(profile, "org_name", "") or org.email
+
 
 class RateSignupSerializer(serializers.Serializer):
     signup_id = serializers.IntegerField()
@@ -113,4 +190,13 @@ class RateSignupSerializer(serializers.Serializer):
     notes = serializers.CharField(required=False, allow_blank=True)
     role = serializers.CharField(required=False, allow_blank=True)
     hours = serializers.CharField(required=False, allow_blank=True)
+    duration_hours = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=0, required=False, allow_null=True
+    )
     task_desc = serializers.CharField(required=False, allow_blank=True)
+
+
+class HoursMonthSerializer(serializers.Serializer):
+    month = serializers.DateField()
+    hours = serializers.DecimalField(max_digits=12, decimal_places=2, coerce_to_string=False)
+    activities = serializers.IntegerField()
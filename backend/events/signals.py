@@ -0,0 +1,45 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import response_cache
+from orgs.cache import invalidate_orgs
+from . import search
+from .models import Event, EventSignup
+
+
+EVENTS_NAMESPACE = "events"
+
+
+# ======================
+# סנכרון אינדקס FTS5 (SQLite). ב-Postgres search_vector מחושב לבד.
+# ======================
+@receiver(post_save, sender=Event)
+def index_event_for_search(sender, instance, **kwargs):
+    search.index_event(instance)
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event_for_search(sender, instance, **kwargs):
+    search.unindex_event(instance.pk)
+
+
+# ======================
+# invalidation של תשובות ציבוריות (config/response_cache.py)
+# ======================
+@receiver([post_save, post_delete], sender=Event)
+def invalidate_event_responses(sender, instance, **kwargs):
+    response_cache.invalidate(EVENTS_NAMESPACE)
+    invalidate_orgs(instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=EventSignup)
+def invalidate_signup_responses(sender, instance, **kwargs):
+    response_cache.invalidate(EVENTS_NAMESPACE)
+    if EventSignup._meta.get_field("event").is_cached(instance):
+        organization_id = instance.event.organization_id
+    else:
+        # במחיקת אירוע (cascade) הוא כבר לא קיים - שם מטפל invalidate_event_responses
+        organization_id = (
+            Event.objects.filter(pk=instance.event_id).values_list("organization_id", flat=True).first()
+        )
+    invalidate_orgs(organization_id)
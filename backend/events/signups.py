@@ -0,0 +1,216 @@
+"""
+הרשמה/ביטול לאירוע עם מונים מתוחזקים על Event ורשימת המתנה.
+
+המקום נתפס ב-UPDATE מותנה אחד:
+    UPDATE events_event SET signups_count = signups_count + 1
+    WHERE id = %s AND signups_count < needed_volunteers
+כך שאכיפת המקום לא דורשת SELECT ... FOR UPDATE, ושורת האירוע ננעלת
+רק לזמן הקצר שבין ה-UPDATE ל-COMMIT.
+
+אירוע מלא -> ההרשמה נכנסת לרשימת המתנה (status=WAITLISTED) עם מספר תור
+מ-Event.waitlist_seq. ביטול של מאושר מקדם את ראש התור באותה טרנזקציה;
+ראש התור נתפס ב-SELECT ... FOR UPDATE SKIP LOCKED, כך ששני ביטולים
+במקביל לא מקדמים את אותו מתנדב ולא מחכים אחד לשני.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from . import stats
+from .models import Event, EventSignup
+
+
+class SignupError(Exception):
+    detail = "Signup failed"
+
+
+class AlreadySignedUp(SignupError):
+    detail = "Already signed up"
+
+
+class NotSignedUp(SignupError):
+    detail = "Not signed up"
+
+
+def _claim_seat(event_id):
+    return bool(
+        Event.objects
+        .filter(pk=event_id, signups_count__lt=F("needed_volunteers"))
+        .update(signups_count=F("signups_count") + 1)
+    )
+
+
+def _join_waitlist(event_id):
+    """
+    -> (מספר תור, מקום בתור כרגע) מ-UPDATE ... RETURNING אחד.
+    """
+    table = Event._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} "
+            f"SET waitlist_seq = waitlist_seq + 1, waitlist_count = waitlist_count + 1 "
+            f"WHERE id = %s RETURNING waitlist_seq, waitlist_count",
+            [event_id],
+        )
+        return cursor.fetchone()
+
+
+def sign_up(event, volunteer):
+    """
+    -> EventSignup; כשהאירוע מלא status=WAITLISTED ו-signup.waitlist_place
+    הוא המקום בתור (בלי שאילתה נוספת).
+    """
+    with transaction.atomic():
+        if _claim_seat(event.pk):
+            fields = {"status": EventSignup.Status.CONFIRMED}
+            place = None
+        else:
+            position, place = _join_waitlist(event.pk)
+            fields = {"status": EventSignup.Status.WAITLISTED, "waitlist_position": position}
+
+        try:
+            with transaction.atomic():
+                signup = EventSignup.objects.create(event=event, volunteer=volunteer, **fields)
+        except IntegrityError:
+            raise AlreadySignedUp()  # rollback גם למונים
+
+        if signup.status == EventSignup.Status.CONFIRMED:
+            stats.record_signup(volunteer.pk)
+
+    signup.waitlist_place = place
+    return signup
+
+
+def _promote_head(event_id):
+    """
+    מקדם את ראש רשימת ההמתנה אם יש מקום. -> EventSignup שקודם או None.
+    """
+    head = (
+        EventSignup.objects
+        .select_for_update(skip_locked=True)
+        .filter(event_id=event_id, status=EventSignup.Status.WAITLISTED)
+        .order_by("waitlist_position")
+        .first()
+    )
+    if head is None:
+        return None
+
+    seated = (
+        Event.objects
+        .filter(pk=event_id, signups_count__lt=F("needed_volunteers"), waitlist_count__gt=0)
+        .update(
+            signups_count=F("signups_count") + 1,
+            waitlist_count=F("waitlist_count") - 1,
+        )
+    )
+    if not seated:
+        return None
+
+    EventSignup.objects.filter(pk=head.pk).update(
+        status=EventSignup.Status.CONFIRMED,
+        waitlist_position=None,
+    )
+    stats.record_signup(head.volunteer_id)
+    head.status = EventSignup.Status.CONFIRMED
+    head.waitlist_position = None
+    return head
+
+
+def fill_from_waitlist(event_id):
+    """
+    אחרי הגדלת needed_volunteers: מקדם מראש התור עד שהאירוע מלא.
+    -> רשימת ה-EventSignup שקודמו.
+    """
+    promoted = []
+    with transaction.atomic():
+        while True:
+            head = _promote_head(event_id)
+            if head is None:
+                return promoted
+            promoted.append(head)
+
+
+def cancel_signup(event, volunteer):
+    """
+    -> EventSignup שקודם מרשימת ההמתנה (אם היה), אחרת None.
+    """
+    with transaction.atomic():
+        signup = (
+            EventSignup.objects
+            .select_for_update()
+            .filter(event=event, volunteer=volunteer)
+            .only("id", "status", "rating", "duration_hours")
+            .first()
+        )
+        if signup is None:
+            raise NotSignedUp()
+
+        # ביטול מקביל כבר מחק את השורה: לא מורידים מונים ולא מקדמים פעמיים
+        deleted, _ = EventSignup.objects.filter(pk=signup.pk).delete()
+        if not deleted:
+            raise NotSignedUp()
+
+        if signup.status == EventSignup.Status.WAITLISTED:
+            (
+                Event.objects
+                .filter(pk=event.pk, waitlist_count__gt=0)
+                .update(waitlist_count=F("waitlist_count") - 1)
+            )
+            return None
+
+        (
+            Event.objects
+            .filter(pk=event.pk, signups_count__gt=0)
+            .update(signups_count=F("signups_count") - 1)
+        )
+        stats.record_cancel(
+            volunteer.pk,
+            event.organization_id,
+            rating=signup.rating,
+            duration_hours=signup.duration_hours,
+        )
+        return _promote_head(event.pk)
+
+
+def reconcile_signup_counts(batch_size=1000):
+    """
+    מחשב מחדש signups_count / waitlist_count מ-EventSignup,
+    ב-UPDATE אחד לכל טווח ids. מחזיר כמה אירועים תוקנו.
+    """
+    def count_of(status):
+        return Coalesce(Subquery(
+            EventSignup.objects
+            .filter(event=OuterRef("pk"), status=status)
+            .order_by()
+            .values("event")
+            .annotate(c=Count("pk"))
+            .values("c")[:1]
+        ), 0)
+
+    confirmed = count_of(EventSignup.Status.CONFIRMED)
+    waitlisted = count_of(EventSignup.Status.WAITLISTED)
+
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = list(
+            Event.objects
+            .filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return fixed
+
+        with transaction.atomic():
+            fixed += (
+                Event.objects
+                .filter(pk__in=ids)
+                .alias(actual_confirmed=confirmed, actual_waitlisted=waitlisted)
+                .filter(
+                    ~Q(signups_count=F("actual_confirmed"))
+                    | ~Q(waitlist_count=F("actual_waitlisted"))
+                )
+                .update(signups_count=confirmed, waitlist_count=waitlisted)
+            )
+        last_id = ids[-1]
@@ -0,0 +1,282 @@
+"""
+עדכון אינקרמנטלי של VolunteerStats / OrgStats מתוך signup / cancel / rate,
+כך שהדשבורד הוא קריאה אחת לפי PK בלי aggregates ובלי כתיבה.
+"""
+from decimal import Decimal
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def _models(apps=None):
+    apps = apps or global_apps
+    return apps.get_model("events", "VolunteerStats"), apps.get_model("events", "EventSignup")
+
+
+def _bump(model, pk, **deltas):
+    """
+    UPDATE ... SET field = field + delta; אם אין עדיין שורה - יוצרים אותה.
+    """
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+
+    changes = {k: F(k) + v for k, v in deltas.items()}
+    if model.objects.filter(pk=pk).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(pk=pk, **{k: max(v, 0) for k, v in deltas.items()})
+    except IntegrityError:
+        # נוצרה במקביל
+        model.objects.filter(pk=pk).update(**changes)
+
+
+def _bump_many(model, deltas_by_pk):
+    """
+    כמו _bump לכמה שורות: INSERT ... ON CONFLICT DO NOTHING לשורות החסרות
+    ואז UPDATE אחד עם CASE לכל שדה.
+    {pk: {field: delta}}
+    """
+    deltas_by_pk = {
+        pk: {k: v for k, v in deltas.items() if v}
+        for pk, deltas in deltas_by_pk.items()
+    }
+    deltas_by_pk = {pk: d for pk, d in deltas_by_pk.items() if d}
+    if not deltas_by_pk:
+        return
+
+    model.objects.bulk_create(
+        [model(pk=pk) for pk in deltas_by_pk],
+        ignore_conflicts=True,
+    )
+
+    fields = {k for deltas in deltas_by_pk.values() for k in deltas}
+    changes = {}
+    for field in fields:
+        output = model._meta.get_field(field)
+        whens = [
+            When(pk=pk, then=Value(deltas[field], output_field=output))
+            for pk, deltas in deltas_by_pk.items()
+            if field in deltas
+        ]
+        changes[field] = F(field) + Case(*whens, default=Value(0, output_field=output))
+    model.objects.filter(pk__in=list(deltas_by_pk)).update(**changes)
+
+
+def bump(volunteer_id, **deltas):
+    _bump(global_apps.get_model("events", "VolunteerStats"), volunteer_id, **deltas)
+
+
+def bump_org(organization_id, **deltas):
+    _bump(global_apps.get_model("events", "OrgStats"), organization_id, **deltas)
+
+
+def record_signup(volunteer_id):
+    bump(volunteer_id, activities_count=1)
+
+
+def record_cancel(volunteer_id, organization_id, rating=None, duration_hours=None):
+    deltas = {"activities_count": -1}
+    if rating is not None:
+        deltas.update(ratings_count=-1, rating_sum=-rating)
+    if duration_hours:
+        deltas["hours_total"] = -duration_hours
+        bump_org(organization_id, hours_total=-duration_hours)
+    bump(volunteer_id, **deltas)
+
+
+def record_hours(volunteer_id, organization_id, old_hours, new_hours):
+    delta = (new_hours or Decimal("0")) - (old_hours or Decimal("0"))
+    if delta:
+        bump(volunteer_id, hours_total=delta)
+        bump_org(organization_id, hours_total=delta)
+
+
+def record_ratings(organization_id, changes):
+    """
+    דירוג מרוכז (rate-bulk) של אירוע אחד:
+    changes = [(volunteer_id, old_rating, new_rating, old_hours, new_hours), ...]
+    הדלתאות מצטברות לכל מתנדב ונכתבות ב-UPDATE אחד (+ UPDATE אחד ל-OrgStats).
+    """
+    VolunteerStats, _ = _models()
+    per_volunteer = {}
+    hours_delta = Decimal("0")
+
+    for volunteer_id, old_rating, new_rating, old_hours, new_hours in changes:
+        d = per_volunteer.setdefault(
+            volunteer_id,
+            {"ratings_count": 0, "rating_sum": 0.0, "hours_total": Decimal("0")},
+        )
+        if old_rating is None:
+            d["ratings_count"] += 1
+            d["rating_sum"] += new_rating
+        else:
+            d["rating_sum"] += new_rating - old_rating
+
+        delta = (new_hours or Decimal("0")) - (old_hours or Decimal("0"))
+        d["hours_total"] += delta
+        hours_delta += delta
+
+    _bump_many(VolunteerStats, per_volunteer)
+    bump_org(organization_id, hours_total=hours_delta)
+
+
+def record_rating(volunteer_id, old_rating, new_rating):
+    if old_rating is None:
+        bump(volunteer_id, ratings_count=1, rating_sum=new_rating)
+    else:
+        bump(volunteer_id, rating_sum=new_rating - old_rating)
+
+
+def sync_profile_reliability(volunteer_id):
+    """
+    מעתיק את הציון ל-VolunteerProfile.reliability_score (מוצג ב-/api/volunteer-profile/).
+    נקרא רק בנתיב הכתיבה (rate), לא בדשבורד.
+    """
+    sync_profiles_reliability([volunteer_id])
+
+
+def sync_profiles_reliability(volunteer_ids):
+    """
+    כמו sync_profile_reliability לכמה מתנדבים: SELECT אחד + UPDATE אחד.
+    """
+    VolunteerStats, _ = _models()
+    VolunteerProfile = global_apps.get_model("accounts", "VolunteerProfile")
+
+    volunteer_ids = list(volunteer_ids)
+    if not volunteer_ids:
+        return
+
+    rows = {row.pk: row for row in VolunteerStats.objects.filter(pk__in=volunteer_ids)}
+    output = VolunteerProfile._meta.get_field("reliability_score")
+
+    def score(volunteer_id):
+        row = rows.get(volunteer_id)
+        return Decimal(str(row.reliability_score if row else 0)).quantize(Decimal("0.1"))
+
+    VolunteerProfile.objects.filter(user_id__in=volunteer_ids).update(
+        reliability_score=Case(
+            *[When(user_id=vid, then=Value(score(vid), output_field=output)) for vid in volunteer_ids],
+            output_field=output,
+        )
+    )
+
+
+def rebuild_volunteer_stats(batch_size=1000, apps=None):
+    """
+    בונה מחדש את כל השורות מ-EventSignup בשאילתה מקובצת אחת
+    + upsert (bulk_create update_conflicts) במנות. מחזיר כמה שורות נכתבו.
+    """
+    VolunteerStats, EventSignup = _models(apps)
+
+    rows = (
+        EventSignup.objects
+        .order_by()
+        .values("volunteer_id")
+        .annotate(
+            activities=Count("pk", filter=Q(status="CONFIRMED")),
+            rated=Count("rating"),
+            rating_total=Coalesce(Sum("rating"), 0.0),
+        )
+        .order_by("volunteer_id")
+    )
+
+    fields = ["activities_count", "ratings_count", "rating_sum"]
+    written = 0
+    batch = []
+
+    def flush():
+        VolunteerStats.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["volunteer"],
+            update_fields=fields,
+        )
+
+    for row in rows.iterator(chunk_size=batch_size):
+        batch.append(VolunteerStats(
+            volunteer_id=row["volunteer_id"],
+            activities_count=row["activities"],
+            ratings_count=row["rated"],
+            rating_sum=row["rating_total"],
+        ))
+        if len(batch) >= batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+    if batch:
+        flush()
+        written += len(batch)
+
+    # מתנדבים שכבר אין להם הרשמות
+    VolunteerStats.objects.exclude(
+        volunteer_id__in=EventSignup.objects.values("volunteer_id")
+    ).delete()
+
+    return written
+
+
+def _upsert_hours(model, key, rows, batch_size):
+    written = 0
+    batch = []
+
+    def flush():
+        model.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=[key],
+            update_fields=["hours_total"],
+        )
+
+    for pk, hours in rows.iterator(chunk_size=batch_size):
+        batch.append(model(pk=pk, hours_total=hours))
+        if len(batch) >= batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+    if batch:
+        flush()
+        written += len(batch)
+    return written
+
+
+def rebuild_hours_totals(batch_size=1000, apps=None):
+    """
+    hours_total של VolunteerStats / OrgStats מ-EventSignup.duration_hours:
+    שאילתה מקובצת אחת לכל צד + upsert במנות. מחזיר (מתנדבים, עמותות).
+    """
+    apps = apps or global_apps
+    VolunteerStats, EventSignup = _models(apps)
+    OrgStats = apps.get_model("events", "OrgStats")
+
+    with_hours = EventSignup.objects.filter(duration_hours__isnull=False).order_by()
+
+    by_volunteer = (
+        with_hours.values("volunteer_id")
+        .annotate(hours=Sum("duration_hours"))
+        .order_by("volunteer_id")
+        .values_list("volunteer_id", "hours")
+    )
+    by_org = (
+        with_hours.values("event__organization_id")
+        .annotate(hours=Sum("duration_hours"))
+        .order_by("event__organization_id")
+        .values_list("event__organization_id", "hours")
+    )
+
+    volunteers = _upsert_hours(VolunteerStats, "volunteer", by_volunteer, batch_size)
+    orgs = _upsert_hours(OrgStats, "organization", by_org, batch_size)
+
+    # מי שכבר אין לו שעות
+    VolunteerStats.objects.exclude(
+        volunteer_id__in=with_hours.values("volunteer_id")
+    ).exclude(hours_total=0).update(hours_total=0)
+    OrgStats.objects.exclude(
+        organization_id__in=with_hours.values("event__organization_id")
+    ).exclude(hours_total=0).update(hours_total=0)
+
+    return volunteers, orgs
@@ -1,3 +1,1462 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import re
+import threading
+from datetime import date, time, timedelta
+from decimal import Decimal
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User, VolunteerProfile
+from config import response_cache
+from config.pagination import KeysetPagination
+from donations.models import Donation
+from orgs.models import OrganizationProfile
+from . import export as event_export
+from . import search
+from . import serializers as s
+from .hours import parse_hours
+from . import signups as signups_service
+from . import stats
+from .models import Event, EventSignup, OrgStats, VolunteerStats
+from .views import DashboardView, EventViewSet, HoursLedgerView, MyActivityView
+
+
+# טבלאות "גדולות": על אלה אסור שיופיע seq scan בתוכנית
+LARGE_TABLES = (Event._meta.db_table, EventSignup._meta.db_table)
+
+
+def seq_scanned_tables(queryset):
+    """
+    מריץ EXPLAIN ומחזיר את הטבלאות שנסרקות במלואן.
+    Postgres: "Seq Scan on <table>", SQLite: "SCAN <table>" בלי USING INDEX.
+    """
+    plan = queryset.explain()
+    if connection.vendor == "postgresql":
+        return set(re.findall(r"Seq Scan on (\w+)", plan))
+    return {
+        m.group(1)
+        for m in re.finditer(r"\bSCAN (\w+)(?: AS \w+)?(?P<using> USING)?", plan)
+        if not m.group("using")
+    }
+
+
+def prefer_indexes():
+    """
+    הטבלאות בבדיקה קטנות מכדי שה-planner יבחר אינדקס מעצמו.
+    Postgres: enable_seqscan=off -> Seq Scan יופיע רק אם אין אינדקס מתאים.
+    SQLite: בלי ANALYZE ה-planner מעדיף כל אינדקס שמתאים ל-WHERE.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+
+
+class QueryPlanTests(TestCase):
+    """
+    מוודא שכל queryset של ה-views נשען על אינדקס ולא על סריקה מלאה.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.orgs = User.objects.bulk_create(
+            [User(email=f"org{i}@example.com", role="ORG") for i in range(20)]
+        )
+        cls.org_profiles = OrganizationProfile.objects.bulk_create(
+            [OrganizationProfile(user=o, org_name=f"org {o.id}") for o in cls.orgs]
+        )
+        cls.volunteers = User.objects.bulk_create(
+            [User(email=f"vol{i}@example.com", role="VOLUNTEER") for i in range(50)]
+        )
+
+        today = timezone.localdate()
+        events = Event.objects.bulk_create([
+            Event(
+                organization=cls.orgs[i % len(cls.orgs)],
+                title=f"event {i}",
+                description="",
+                category="general",
+                location="תל אביב",
+                date=today + timedelta(days=(i % 400) - 200),
+                time=time(10, 0),
+                needed_volunteers=10,
+            )
+            for i in range(2000)
+        ])
+        EventSignup.objects.bulk_create([
+            EventSignup(
+                event=event,
+                volunteer=cls.volunteers[(i * 3 + k) % len(cls.volunteers)],
+                rating=(i % 5) + 1 if k == 0 else None,
+            )
+            for i, event in enumerate(events)
+            for k in range(3)
+        ])
+
+        prefer_indexes()
+
+    def view_queryset(self, user=None, **params):
+        request = APIRequestFactory().get("/api/events/", params)
+        view = EventViewSet()
+        view.request = Request(request)
+        view.request.user = user
+        view.action = "list"
+        view.format_kwarg = None
+        return view.get_queryset()
+
+    def assertNoSeqScan(self, queryset):
+        scanned = seq_scanned_tables(queryset) & set(LARGE_TABLES)
+        self.assertFalse(scanned, f"seq scan on {scanned}:\n{queryset.explain()}")
+
+    def test_org_profile_events(self):
+        org_profile = self.org_profiles[0]
+        for status_param in ("upcoming", "history", ""):
+            with self.subTest(status=status_param):
+                self.assertNoSeqScan(self.view_queryset(org=org_profile.id, status=status_param))
+
+    def test_org_dashboard_events(self):
+        for status_param in ("upcoming", "history"):
+            with self.subTest(status=status_param):
+                self.assertNoSeqScan(self.view_queryset(self.orgs[0], status=status_param))
+
+    def test_volunteer_dashboard_events(self):
+        for status_param in ("upcoming", "history"):
+            with self.subTest(status=status_param):
+                self.assertNoSeqScan(self.view_queryset(self.volunteers[0], status=status_param))
+
+    def test_catalog_filters(self):
+        today = timezone.localdate().isoformat()
+        for params in ({"category": "general", "date_from": today}, {"location": "תל אביב", "date_to": today}):
+            with self.subTest(**params):
+                self.assertNoSeqScan(self.view_queryset(**params))
+
+    def test_dashboard_events(self):
+        for user, is_volunteer in ((self.volunteers[0], True), (self.orgs[0], False)):
+            with self.subTest(role=user.role):
+                self.assertNoSeqScan(DashboardView.events_queryset(user, is_volunteer))
+
+    def test_my_activity(self):
+        for status_param in ("upcoming", "history", ""):
+            with self.subTest(status=status_param):
+                request = APIRequestFactory().get("/api/me/activity/", {"status": status_param})
+                view = MyActivityView()
+                view.request = Request(request)
+                view.request.user = self.volunteers[0]
+                self.assertNoSeqScan(view.get_queryset())
+
+    def test_hours_ledger(self):
+        today = timezone.localdate().isoformat()
+        for user in (self.volunteers[0], self.orgs[0]):
+            for params in ({}, {"date_from": today}):
+                with self.subTest(role=user.role, **params):
+                    self.assertNoSeqScan(HoursLedgerView.months_queryset(user, params))
+
+
+class ListQueryCountTests(TestCase):
+    """
+    מספר השאילתות של רשימת האירועים לא גדל עם מספר האירועים (בלי N+1).
+    """
+
+    def setUp(self):
+        self.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        self.created = 0
+        caches[response_cache.CACHE_ALIAS].clear()
+
+    def add_events(self, count):
+        for _ in range(count):
+            org = User.objects.create(email=f"org{self.created}@example.com", role="ORG")
+            event = Event.objects.create(
+                organization=org, title=f"event {self.created}", description="", category="general",
+                location="חיפה", date=timezone.localdate() - timedelta(days=1), time=time(10, 0),
+                needed_volunteers=5,
+            )
+            signup = signups_service.sign_up(event, self.volunteer)
+            EventSignup.objects.filter(pk=signup.pk).update(rating=4)
+            self.created += 1
+
+    def count_queries(self, user, params):
+        client = APIClient()
+        client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get("/api/events/", params)
+        self.assertEqual(response.status_code, 200)
+        results = response.data["results"] if "results" in response.data else response.data
+        return len(ctx.captured_queries), len(results)
+
+    def test_list_query_count_is_constant(self):
+        cases = [
+            (None, {}),
+            (self.volunteer, {}),
+            (self.volunteer, {"status": "history"}),
+            (self.volunteer, {"paginate": 1, "page_size": 50}),
+        ]
+        self.add_events(2)
+        small = [self.count_queries(user, params) for user, params in cases]
+        self.add_events(10)
+        caches[response_cache.CACHE_ALIAS].clear()
+        large = [self.count_queries(user, params) for user, params in cases]
+
+        self.assertEqual([rows for _, rows in small], [2] * len(cases))
+        self.assertEqual([rows for _, rows in large], [12] * len(cases))
+        self.assertEqual([n for n, _ in large], [n for n, _ in small])
+
+        # my_rating ו-org_name מאותה שאילתה
+        client = APIClient()
+        client.force_authenticate(self.volunteer)
+        row = client.get("/api/events/").data[0]
+        self.assertEqual((row["my_rating"], row["org_name"]), (4, "org11@example.com"))
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    cursor הלוך-חזור, מיון בכיוונים מעורבים, שוויון בשדות המיון ו-cursor לא תקין.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        # 3 תאריכים x 4 כותרות -> הרבה שורות עם אותם (date, title)
+        Event.objects.bulk_create([
+            Event(
+                organization=org, title=f"title {i % 4}", description="", category="general",
+                location="חיפה", date=date(2030, 1, 1) + timedelta(days=i % 3), time=time(10, 0),
+            )
+            for i in range(23)
+        ])
+
+    def page(self, ordering, cursor=None, size=5):
+        params = {"page_size": size}
+        if cursor:
+            params["cursor"] = cursor
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(
+            Event.objects.all(),
+            Request(APIRequestFactory().get("/api/events/", params)),
+            SimpleNamespace(cursor_ordering=ordering),
+        )
+        return [event.id for event in rows], paginator.get_next_link(), paginator.get_previous_link()
+
+    @staticmethod
+    def cursor_of(link):
+        return parse_qs(urlparse(link).query)["cursor"][0]
+
+    def walk(self, ordering):
+        """
+        -> (העמודים קדימה, העמודים אחורה מהעמוד האחרון בסדר קדימה)
+        """
+        forward = []
+        ids, next_link, previous_link = self.page(ordering)
+        self.assertIsNone(previous_link)
+        forward.append(ids)
+        while next_link:
+            ids, next_link, previous_link = self.page(ordering, self.cursor_of(next_link))
+            forward.append(ids)
+
+        backward = [ids]
+        while previous_link:
+            ids, _, previous_link = self.page(ordering, self.cursor_of(previous_link))
+            backward.append(ids)
+        return forward, backward[::-1]
+
+    def test_round_trip_covers_every_row_once(self):
+        for ordering in (("date", "id"), ("-created_at", "-id"), ("-date", "title", "id"), ("title", "-date", "-id")):
+            with self.subTest(ordering=ordering):
+                expected = list(Event.objects.order_by(*ordering).values_list("id", flat=True))
+                forward, backward = self.walk(ordering)
+
+                self.assertEqual([len(ids) for ids in forward], [5, 5, 5, 5, 3])
+                self.assertEqual(sum(forward, []), expected)
+                self.assertEqual(backward, forward)
+
+    def test_ties_on_every_sort_key_but_id(self):
+        # כל השורות באותו תאריך וכותרת: רק id מבדיל
+        Event.objects.update(date=date(2030, 1, 1), title="same")
+        forward, _ = self.walk(("-date", "title", "id"))
+        self.assertEqual(sum(forward, []), list(Event.objects.order_by("id").values_list("id", flat=True)))
+
+    def test_invalid_cursor(self):
+        def token(data):
+            return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+        for cursor in ("!!!", token([1, 2]), token({"v": [1]}), token({"v": ["not-a-date", 1]}), token({"v": [[], 1]})):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(NotFound):
+                    self.page(("date", "id"), cursor)
+
+        response = self.client.get("/api/events/", {"status": "upcoming", "cursor": token({"v": ["x", 1]})})
+        self.assertEqual(response.status_code, 404)
+
+
+class ExportTests(TestCase):
+    """
+    GET /api/events/export/: כותרות, שורה לכל נרשם, streaming ו-escaping של נוסחאות.
+    """
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        self.named = User.objects.create(email="named@example.com", role="VOLUNTEER")
+        VolunteerProfile.objects.create(user=self.named, full_name="=HYPERLINK(\"http://x\")")
+        self.client = APIClient()
+        self.client.force_authenticate(self.org)
+
+    def event(self, title, days, org=None):
+        return Event.objects.create(
+            organization=org or self.org, title=title, description="", category="general",
+            location="@חיפה", date=timezone.localdate() + timedelta(days=days), time=time(10, 0),
+        )
+
+    def export(self):
+        response = self.client.get("/api/events/export/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content).decode("utf-8")
+        self.assertTrue(body.startswith("\ufeff"))
+        return response, list(csv.reader(io.StringIO(body[1:])))
+
+    def test_header_and_rows(self):
+        rated = self.event("ניקיון חוף", -2)
+        empty = self.event("-5 מעלות", 3)
+        self.event("של עמותה אחרת", 1, org=User.objects.create(email="other@example.com", role="ORG"))
+        signups_service.sign_up(rated, self.volunteer)
+        signups_service.sign_up(rated, self.named)
+        EventSignup.objects.filter(event=rated, volunteer=self.volunteer).update(rating=4.5, duration_hours=Decimal("3"))
+
+        response, rows = self.export()
+
+        self.assertIn("attachment;", response["Content-Disposition"])
+        self.assertEqual(rows[0], [header for header, _ in event_export.EXPORT_COLUMNS])
+        by_column = [dict(zip(rows[0], row)) for row in rows[1:]]
+        self.assertEqual(
+            [(r["event_id"], r["volunteer_email"]) for r in by_column],
+            [(str(rated.id), "vol@example.com"), (str(rated.id), "named@example.com"), (str(empty.id), "")],
+        )
+        first = by_column[0]
+        self.assertEqual(
+            (first["event_title"], first["event_date"], first["signup_status"], first["duration_hours"], first["rating"]),
+            ("ניקיון חוף", rated.date.isoformat(), "CONFIRMED", "3.00", "4.5"),
+        )
+        # בלי שם מלא -> אימייל
+        self.assertEqual(first["volunteer_name"], "vol@example.com")
+
+    def test_formula_cells_are_escaped(self):
+        event = self.event("=1+2", -1)
+        signups_service.sign_up(event, self.named)
+
+        _, rows = self.export()
+        row = dict(zip(rows[0], rows[1]))
+
+        self.assertEqual(row["event_title"], "'=1+2")
+        self.assertEqual(row["event_location"], "'@חיפה")
+        self.assertEqual(row["volunteer_name"], "'=HYPERLINK(\"http://x\")")
+        self.assertEqual(row["volunteer_email"], "named@example.com")
+        for value in ("+1", "-1", "\tx", "\rx"):
+            with self.subTest(value=value):
+                self.assertEqual(event_export._cell(value), "'" + value)
+        # מספרים לא טקסט - נשארים כמו שהם
+        self.assertEqual(event_export._cell(Decimal("-1.5")), Decimal("-1.5"))
+
+    def test_rows_are_streamed_from_one_query(self):
+        for i in range(5):
+            self.event(f"event {i}", i)
+
+        rows = event_export.org_export_rows(self.org, chunk_size=2)
+        with CaptureQueriesContext(connection) as ctx:
+            first = next(rows)
+            rest = list(rows)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len([first, *rest]), 5)
+
+        # השורות נכתבות תוך כדי קריאה, לא אחרי
+        response = event_export.stream_csv(iter([["a"], ["b"]]), "x.csv")
+        chunks = iter(response.streaming_content)
+        self.assertEqual(next(chunks), b"\xef\xbb\xbf")
+        self.assertEqual(next(chunks).decode("utf-8").strip(), ",".join(h for h, _ in event_export.EXPORT_COLUMNS))
+        self.assertEqual(next(chunks).strip(), b"a")
+
+    def test_only_organizations_can_export(self):
+        self.client.force_authenticate(self.volunteer)
+        self.assertEqual(self.client.get("/api/events/export/").status_code, 403)
+
+
+class CatalogParamsTests(TestCase):
+    """
+    פילטרי הקטלוג (?status= / ?date_from= / ?org= ...) חלים רק על הרשימה.
+    """
+
+    STRAY = {"status": "history", "date_from": "2099-01-01", "category": "other", "has_capacity": "1"}
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        self.event = Event.objects.create(
+            organization=self.org, title="event", description="", category="general", location="חיפה",
+            date=timezone.localdate() + timedelta(days=3), time=time(10, 0), needed_volunteers=1,
+        )
+        self.client = APIClient()
+        self.query = "?" + "&".join(f"{k}={v}" for k, v in self.STRAY.items())
+
+    def test_list_applies_the_filters(self):
+        self.assertEqual(len(self.client.get("/api/events/").data), 1)
+        self.assertEqual(self.client.get(f"/api/events/{self.query}").data, [])
+
+    def test_detail_actions_ignore_stray_params(self):
+        url = f"/api/events/{self.event.id}/"
+        self.assertEqual(self.client.get(url + self.query).status_code, 200)
+
+        self.client.force_authenticate(self.volunteer)
+        self.assertEqual(self.client.post(f"{url}signup/{self.query}").status_code, 201)
+        # האירוע מלא עכשיו ו-has_capacity=1 לא מסתיר אותו מהביטול
+        self.assertEqual(self.client.post(f"{url}cancel/{self.query}").status_code, 200)
+
+        self.client.force_authenticate(self.org)
+        response = self.client.patch(url + self.query, {"title": "חדש"}, format="json")
+        self.assertEqual((response.status_code, response.data["title"]), (200, "חדש"))
+
+    def test_other_organizations_still_cannot_edit(self):
+        self.client.force_authenticate(User.objects.create(email="other@example.com", role="ORG"))
+        response = self.client.patch(f"/api/events/{self.event.id}/", {"title": "x"}, format="json")
+        self.assertEqual(response.status_code, 404)
+
+    def test_catalog_options(self):
+        Event.objects.create(
+            organization=self.org, title="past", description="", category="סביבה", location="אילת",
+            date=timezone.localdate() - timedelta(days=3), time=time(10, 0),
+        )
+        Event.objects.create(
+            organization=self.org, title="soon", description="", category="קשישים", location="חיפה",
+            date=timezone.localdate() + timedelta(days=1), time=time(10, 0),
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(
+                "/api/events/catalog-options/",
+                {"date_from": timezone.localdate().isoformat(), "category": "x"},
+            ).json()
+        self.assertEqual(data, {"categories": ["general", "קשישים"], "locations": ["חיפה"]})
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+
+class HebrewSearchTests(TestCase):
+    def test_normalize_strips_niqqud_and_folds_finals(self):
+        self.assertEqual(search.normalize("שָׁלוֹם"), "שלומ")
+        self.assertEqual(search.tokenize('צה"ל בית־ספר'), ["צהל", "בית", "ספר"])
+
+    def test_prefix_variants(self):
+        self.assertEqual(search.variants("ובבית"), ["ובבית", "בבית", "בית"])
+        self.assertEqual(search.variants("מים"), ["מים"])
+
+    def test_search_endpoint_matches_prefixed_words(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        event = Event.objects.create(
+            organization=org,
+            title="חלוקת מזון",
+            description="מחפשים מְתַנְדְּבִים לחלוקה ובבית הספר",
+            category="קהילה",
+            location="חיפה",
+            date=timezone.localdate(),
+            time=time(10, 0),
+        )
+
+        response = self.client.get("/api/events/search/", {"q": "בית מתנדב"})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r["id"] for r in results], [event.id])
+        self.assertIn("<mark>ובבית</mark>", results[0]["snippet"])
+
+    def test_backfill_migration(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        event = Event.objects.create(
+            organization=org, title='שָׁלוֹם לצה"ל', description="ובבית־הספר", category="קהילה",
+            location="חיפה", date=timezone.localdate(), time=time(10, 0),
+        )
+        Event.objects.filter(pk=event.pk).update(search_title="", search_body="")
+
+        import_module("events.migrations.0007_event_search").build_search_documents(django_apps, None)
+
+        event.refresh_from_db()
+        self.assertEqual((event.search_title, event.search_body), search.build_documents(event))
+        self.assertIn("בית", event.search_body.split())
+
+
+class HoursParserTests(TestCase):
+    CASES = [
+        ("3", "3.00"),
+        ("3.5", "3.50"),
+        ("3,5", "3.50"),
+        ("2:30", "2.50"),
+        ("3 שעות", "3.00"),
+        ("4h", "4.00"),
+        ("שעה", "1.00"),
+        ("שעתיים", "2.00"),
+        ("חצי שעה", "0.50"),
+        ("רבע שעה", "0.25"),
+        ("שעה וחצי", "1.50"),
+        ("שעתיים וחצי", "2.50"),
+        ("שעה ורבע", "1.25"),
+        ("3 וחצי", "3.50"),
+        # דקות
+        ("45 דקות", "0.75"),
+        ("90 min", "1.50"),
+        ("30 minutes", "0.50"),
+        ("דקה", None),
+        ("10:00-10:45 / 45 דקות", "0.75"),
+        # יחידות שאינן שעות
+        ("3 ימים", None),
+        ("2 days", None),
+        ("1 שבוע", None),
+        # טווחי שעון
+        ("10:00–14:00", "4.00"),
+        ("10:00-14:30", "4.50"),
+        ("10—14", "4.00"),
+        ("10-14", "4.00"),
+        ("08:30 - 12:00", "3.50"),
+        ("22:00-02:00", "4.00"),
+        # ה-placeholder של VolunteerRating.jsx: טווח + משך שמסכימים
+        ("לדוגמה: 10:00–14:00 / 4 שעות", "4.00"),
+        # דו-משמעי / לא מספר
+        ("10:00–14:00 / 5 שעות", None),
+        ("3-4 שעות", None),
+        ("3 או 4", None),
+        ("10-12, 14-16", None),
+        ("10:00-10:00", None),
+        ("10:75", None),
+        ("הרבה", None),
+        ("", None),
+        (None, None),
+    ]
+
+    def test_parse_hours(self):
+        frozen = import_module("events.migrations.0011_hours_ledger").parse_hours
+        for text, expected in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(parse_hours(text), Decimal(expected) if expected else None)
+                self.assertEqual(frozen(text), parse_hours(text))
+
+
+class HoursLedgerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = User.objects.create(email="org@example.com", role="ORG")
+        cls.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        year = timezone.localdate().year - 1
+        days = (date(year, 1, 10), date(year, 1, 20), date(year, 2, 5))
+        cls.events = [
+            Event.objects.create(
+                organization=cls.org, title=f"event {i}", description="", category="general",
+                location="חיפה", date=day, time=time(10, 0),
+            )
+            for i, day in enumerate(days)
+        ]
+        cls.signups = [
+            EventSignup.objects.create(event=event, volunteer=cls.volunteer) for event in cls.events
+        ]
+
+    def rate(self, signup, hours):
+        client = APIClient()
+        client.force_authenticate(self.org)
+        response = client.post(f"/api/events/{signup.event_id}/rate/", {
+            "signup_id": signup.id,
+            "rating_reliability": 5,
+            "rating_execution": 5,
+            "rating_teamwork": 5,
+            "hours": hours,
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_ledger_by_month(self):
+        self.rate(self.signups[0], "10:00–14:00 / 4 שעות")
+        self.rate(self.signups[1], "שעתיים וחצי")
+        self.rate(self.signups[2], "3")
+
+        client = APIClient()
+        client.force_authenticate(self.volunteer)
+        data = client.get("/api/hours/").json()
+
+        self.assertEqual(data["hours_total"], 9.5)
+        self.assertEqual(
+            [(m["month"][5:7], m["hours"], m["activities"]) for m in data["months"]],
+            [("01", 6.5, 2), ("02", 3.0, 1)],
+        )
+
+        client.force_authenticate(self.org)
+        from_feb = client.get("/api/hours/", {"date_from": self.events[2].date.isoformat()}).json()
+        self.assertEqual(from_feb["hours_total"], 9.5)
+        self.assertEqual([m["hours"] for m in from_feb["months"]], [3.0])
+
+    def test_backfill_migration(self):
+        """
+        0011 מפענח את הטקסט הקיים ובונה את hours_total ממנו.
+        """
+        ledger = import_module("events.migrations.0011_hours_ledger")
+
+        EventSignup.objects.filter(pk=self.signups[0].pk).update(hours="10:00–14:00 / 4 שעות")
+        EventSignup.objects.filter(pk=self.signups[1].pk).update(hours="שעתיים וחצי")
+        EventSignup.objects.filter(pk=self.signups[2].pk).update(hours="45 דקות")
+        ledger.parse_existing_hours(django_apps, None)
+        ledger.build_hours_totals(django_apps, None)
+
+        self.assertEqual(
+            list(EventSignup.objects.order_by("id").values_list("duration_hours", flat=True)),
+            [Decimal("4"), Decimal("2.5"), Decimal("0.75")],
+        )
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteer.pk).hours_total, Decimal("7.25"))
+        self.assertEqual(OrgStats.objects.get(pk=self.org.pk).hours_total, Decimal("7.25"))
+
+        # "3 ימים" אינו שעות: לא נכנס ל-hours_total
+        EventSignup.objects.filter(pk=self.signups[2].pk).update(hours="3 ימים", duration_hours=None)
+        ledger.parse_existing_hours(django_apps, None)
+        ledger.build_hours_totals(django_apps, None)
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteer.pk).hours_total, Decimal("6.5"))
+
+
+@override_settings(CONDITIONAL_GET=True)
+class ConditionalGetTests(TestCase):
+    """
+    ETag / Last-Modified מגרסאות ה-namespaces: 304 בלי שאילתות ובלי serialization.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = User.objects.create(email="org@example.com", role="ORG")
+        cls.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        cls.event = Event.objects.create(
+            organization=cls.org,
+            title="event",
+            description="",
+            category="general",
+            location="חיפה",
+            date=timezone.localdate() + timedelta(days=7),
+            time=time(10, 0),
+            needed_volunteers=3,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        caches[response_cache.CACHE_ALIAS].clear()
+
+    def test_anonymous_refetch_is_not_modified_without_queries(self):
+        first = self.client.get("/api/events/")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("public", first["Cache-Control"])
+        self.assertIn("s-maxage", first["Cache-Control"])
+        self.assertIn("Authorization", first["Vary"])
+
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.content, b"")
+
+        by_date = self.client.get("/api/events/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_signup_changes_the_detail_etag(self):
+        url = f"/api/events/{self.event.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        volunteer = APIClient()
+        volunteer.force_authenticate(self.volunteer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(volunteer.post(f"{url}signup/").status_code, 201)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["signups_count"], 1)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_is_per_user(self):
+        anonymous = self.client.get("/api/events/")["ETag"]
+
+        self.client.force_authenticate(self.volunteer)
+        mine = self.client.get("/api/events/")
+        self.assertNotEqual(mine["ETag"], anonymous)
+        self.assertIn("private", mine["Cache-Control"])
+        self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH=anonymous).status_code, 200)
+        self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH=mine["ETag"]).status_code, 304)
+
+    def test_me_is_conditional(self):
+        self.client.force_authenticate(self.volunteer)
+        first = self.client.get("/api/me/")
+        self.assertEqual(self.client.get("/api/me/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        User.objects.filter(pk=self.volunteer.pk).update(email="other@example.com")
+        self.client.force_authenticate(User.objects.get(pk=self.volunteer.pk))
+        self.assertEqual(self.client.get("/api/me/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def test_me_etag_follows_profile_updates(self):
+        profile = VolunteerProfile.objects.create(user=self.volunteer, full_name="דנה")
+        self.client.force_authenticate(self.volunteer)
+        etag = self.client.get("/api/me/")["ETag"]
+
+        with mock.patch("accounts.views.me_payload") as payload:
+            self.assertEqual(self.client.get("/api/me/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        payload.assert_not_called()
+
+        profile.city = "חיפה"
+        profile.save()
+        self.client.force_authenticate(User.objects.get(pk=self.volunteer.pk))
+        response = self.client.get("/api/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.data["city"]), (200, "חיפה"))
+
+    def test_date_dependent_validators_change_at_midnight(self):
+        self.client.force_authenticate(self.volunteer)
+        signups_service.sign_up(self.event, self.volunteer)
+        today = timezone.localdate()
+        url = "/api/events/?status=upcoming"
+
+        first = self.client.get(url)
+        self.assertEqual(len(first.data), 1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        # בלי שום כתיבה: אחרי האירוע הוא כבר לא "קרוב"
+        later = today + timedelta(days=8)
+        with mock.patch("django.utils.timezone.localdate", return_value=later):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            by_date = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [])
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(by_date.status_code, 200)
+
+        # בלי status התשובה לא תלויה בתאריך
+        plain = self.client.get("/api/events/")["ETag"]
+        with mock.patch("django.utils.timezone.localdate", return_value=later):
+            self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH=plain).status_code, 304)
+
+    def test_org_directory_validators_follow_the_date(self):
+        etag = self.client.get("/api/organizations/")["ETag"]
+        later = timezone.localdate() + timedelta(days=1)
+        with mock.patch("django.utils.timezone.localdate", return_value=later):
+            self.assertEqual(self.client.get("/api/organizations/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @override_settings(CONDITIONAL_GET=False)
+    def test_disabled_without_a_shared_cache(self):
+        first = self.client.get("/api/events/")
+        self.assertNotIn("ETag", first)
+        self.assertNotIn("Last-Modified", first)
+        self.assertEqual(self.client.get("/api/events/", HTTP_IF_NONE_MATCH='W/"x"').status_code, 200)
+
+
+class SparseFieldsTests(TestCase):
+    """
+    רשימה קומפקטית (תיאור מקוצר, בלי my_rating לאורחים) ו-?fields= / ?omit=
+    שמצמצמים גם את ה-SELECT.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = User.objects.create(email="org@example.com", role="ORG")
+        cls.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        cls.event = Event.objects.create(
+            organization=cls.org,
+            title="event",
+            description="מילה " * 100,
+            category="general",
+            location="חיפה",
+            date=timezone.localdate() + timedelta(days=7),
+            time=time(10, 0),
+        )
+        EventSignup.objects.create(event=cls.event, volunteer=cls.volunteer)
+
+    def setUp(self):
+        self.client = APIClient()
+        caches[response_cache.CACHE_ALIAS].clear()
+
+    def get_with_sql(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, " ".join(q["sql"] for q in ctx.captured_queries)
+
+    def test_list_is_compact(self):
+        response, sql = self.get_with_sql("/api/events/")
+        item = response.json()[0]
+
+        self.assertLessEqual(len(item["description"]), s.LIST_DESCRIPTION_CHARS)
+        self.assertTrue(item["description"].endswith("…"))
+        self.assertNotIn("my_rating", item)
+        self.assertNotIn("search_body", sql)
+
+        detail = self.client.get(f"/api/events/{self.event.id}/").json()
+        self.assertEqual(detail["description"], self.event.description)
+
+    def test_volunteer_list_keeps_my_rating(self):
+        self.client.force_authenticate(self.volunteer)
+        self.assertIn("my_rating", self.client.get("/api/events/").json()[0])
+
+    def test_fields_trim_response_and_select(self):
+        response, sql = self.get_with_sql("/api/events/", {"fields": "title,date"})
+
+        self.assertEqual(set(response.json()[0]), {"id", "title", "date"})
+        self.assertNotIn('"location"', sql)
+        self.assertNotIn("description", sql)
+        self.assertNotIn("accounts_user", sql)
+
+    def test_cursor_pages_with_fields(self):
+        Event.objects.create(
+            organization=self.org, title="second", description="", category="general", location="חיפה",
+            date=timezone.localdate() + timedelta(days=1), time=time(10, 0),
+        )
+        response = self.client.get("/api/events/", {"page_size": 1, "ordering": "date", "fields": "title"})
+        titles = [e["title"] for e in response.data["results"]]
+        titles += [e["title"] for e in self.client.get(response.data["next"]).data["results"]]
+
+        self.assertEqual(titles, ["second", "event"])
+
+    def test_omit(self):
+        response, sql = self.get_with_sql(f"/api/events/{self.event.id}/", {"omit": "description,org_name"})
+
+        self.assertNotIn("description", response.json())
+        self.assertIn("title", response.json())
+        self.assertNotIn('"description"', sql)
+
+    def test_signups_fields(self):
+        self.client.force_authenticate(self.org)
+        response, sql = self.get_with_sql(
+            f"/api/events/{self.event.id}/signups/", {"fields": "volunteer_name,status"}
+        )
+
+        rows = response.json()
+        self.assertEqual([set(row) for row in rows], [{"id", "volunteer_name", "status"}])
+        self.assertEqual(rows[0]["volunteer_name"], "vol@example.com")
+        self.assertNotIn('"task_desc"', sql)
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.volunteers = [
+            User.objects.create(email=f"vol{i}@example.com", role="VOLUNTEER") for i in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.org)
+
+    def make_event(self, days, capacity=1):
+        event = Event.objects.create(
+            organization=self.org, title="event", description="", category="general", location="חיפה",
+            date=timezone.localdate() + timedelta(days=days), time=time(10, 0), needed_volunteers=capacity,
+        )
+        signups = [signups_service.sign_up(event, volunteer) for volunteer in self.volunteers]
+        return event, signups
+
+    def rating(self, signup, **extra):
+        return {
+            "signup_id": signup.id, "rating_reliability": 5, "rating_execution": 5,
+            "rating_teamwork": 5, "hours": "10", **extra,
+        }
+
+    def test_waitlisted_signup_cannot_be_rated(self):
+        event, (confirmed, waitlisted, _) = self.make_event(days=-1)
+        self.assertEqual(waitlisted.status, EventSignup.Status.WAITLISTED)
+
+        single = self.client.post(f"/api/events/{event.id}/rate/", self.rating(waitlisted), format="json")
+        self.assertEqual(single.status_code, 400)
+
+        bulk = self.client.post(
+            f"/api/events/{event.id}/rate-bulk/",
+            [self.rating(confirmed), self.rating(waitlisted)],
+            format="json",
+        ).json()
+        self.assertEqual([r["signup_id"] for r in bulk["results"]], [confirmed.id])
+        self.assertEqual([e["signup_id"] for e in bulk["errors"]], [waitlisted.id])
+
+        # ביטול מרשימת ההמתנה לא משאיר דירוג / שעות במונים
+        signups_service.cancel_signup(event, self.volunteers[1])
+        self.assertFalse(
+            VolunteerStats.objects.filter(pk=self.volunteers[1].pk)
+            .exclude(ratings_count=0, rating_sum=0, hours_total=0)
+            .exists()
+        )
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteers[0].pk).ratings_count, 1)
+
+    def test_raising_capacity_promotes_the_waitlist(self):
+        event, _ = self.make_event(days=7)
+
+        response = self.client.patch(f"/api/events/{event.id}/", {"needed_volunteers": 2}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        event.refresh_from_db()
+        self.assertEqual((event.signups_count, event.waitlist_count), (2, 1))
+        statuses = list(EventSignup.objects.filter(event=event).order_by("id").values_list("status", flat=True))
+        self.assertEqual(statuses, ["CONFIRMED", "CONFIRMED", "WAITLISTED"])
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteers[1].pk).activities_count, 1)
+
+
+    def test_concurrent_cancel_counts_once(self):
+        event, (confirmed, _, _) = self.make_event(days=7)
+        stale = EventSignup.objects.only("id", "status", "rating", "duration_hours").get(pk=confirmed.pk)
+        real_first = type(EventSignup.objects.none()).first
+        reads = []
+
+        def stale_first(queryset):
+            # הביטול השני קרא את השורה לפני שהראשון מחק אותה
+            if not reads:
+                reads.append(queryset)
+                return stale
+            return real_first(queryset)
+
+        signups_service.cancel_signup(event, self.volunteers[0])
+        with mock.patch.object(type(EventSignup.objects.none()), "first", stale_first):
+            with self.assertRaises(signups_service.NotSignedUp):
+                signups_service.cancel_signup(event, self.volunteers[0])
+
+        event.refresh_from_db()
+        self.assertEqual((event.signups_count, event.waitlist_count), (1, 1))
+        statuses = list(EventSignup.objects.filter(event=event).order_by("id").values_list("status", flat=True))
+        self.assertEqual(statuses, ["CONFIRMED", "WAITLISTED"])
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteers[0].pk).activities_count, 0)
+        self.assertEqual(VolunteerStats.objects.get(pk=self.volunteers[1].pk).activities_count, 1)
+
+
+class DashboardTests(TestCase):
+    """
+    GET /api/dashboard/: כל חלק לפי תפקיד, ומספר שאילתות קבוע.
+    """
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.other_org = User.objects.create(email="other@example.com", role="ORG")
+        self.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        self.other_volunteer = User.objects.create(email="vol2@example.com", role="VOLUNTEER")
+        VolunteerProfile.objects.create(user=self.volunteer, full_name="דנה", city="חיפה")
+        self.client = APIClient()
+
+    def event(self, days, org=None):
+        return Event.objects.create(
+            organization=org or self.org, title=f"event {days}", description="", category="general",
+            location="חיפה", date=timezone.localdate() + timedelta(days=days), time=time(10, 0),
+            needed_volunteers=10,
+        )
+
+    def populate(self, count):
+        for i in range(count):
+            mine, others = self.event(i - count // 2), self.event(i + 1, org=self.other_org)
+            signups_service.sign_up(mine, self.volunteer)
+            signups_service.sign_up(others, self.other_volunteer)
+            Donation.objects.create(organization=self.org, donor_user=self.volunteer, amount=Decimal("10"))
+            Donation.objects.create(organization=self.other_org, donor_user=self.other_volunteer, amount=Decimal("5"))
+
+    def get(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get("/api/dashboard/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_volunteer_sees_only_own_activity(self):
+        past, future = self.event(-1), self.event(2)
+        foreign = self.event(3, org=self.other_org)
+        for event in (past, future):
+            signups_service.sign_up(event, self.volunteer)
+        signups_service.sign_up(foreign, self.other_volunteer)
+        EventSignup.objects.filter(event=past, volunteer=self.volunteer).update(rating=4)
+        Donation.objects.create(organization=self.org, donor_user=self.volunteer, amount=Decimal("10"))
+        Donation.objects.create(organization=self.org, donor_user=self.other_volunteer, amount=Decimal("99"))
+
+        data = self.get(self.volunteer)
+
+        self.assertEqual(data["role"], "VOLUNTEER")
+        self.assertEqual((data["me"]["full_name"], data["me"]["city"]), ("דנה", "חיפה"))
+        self.assertEqual(data["stats"]["activities_count"], 2)
+        self.assertEqual([e["id"] for e in data["upcoming"]], [future.id])
+        self.assertEqual([(e["id"], e["my_rating"]) for e in data["history"]], [(past.id, 4)])
+        self.assertEqual([d["amount"] for d in data["donations"]], ["10.00"])
+
+    def test_organization_sees_only_own_events_and_donations(self):
+        mine = [self.event(-2), self.event(-1), self.event(1), self.event(4)]
+        self.event(2, org=self.other_org)
+        Donation.objects.create(organization=self.org, amount=Decimal("30"))
+        Donation.objects.create(organization=self.other_org, amount=Decimal("70"))
+
+        data = self.get(self.org)
+
+        self.assertEqual([e["id"] for e in data["upcoming"]], [mine[2].id, mine[3].id])
+        self.assertEqual([e["id"] for e in data["history"]], [mine[1].id, mine[0].id])
+        self.assertEqual([d["amount"] for d in data["donations"]], ["30.00"])
+        self.assertEqual(set(data["stats"]), {"hours_total", "donations_raised", "donations_count"})
+        self.assertIsNone(data["me"]["full_name"])
+
+    def test_sections(self):
+        data = self.get(self.volunteer, sections="me,upcoming")
+        self.assertEqual(set(data), {"role", "me", "upcoming"})
+
+        self.client.force_authenticate(self.volunteer)
+        self.assertEqual(self.client.get("/api/dashboard/", {"sections": "me,secrets"}).status_code, 400)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get("/api/dashboard/").status_code, 401)
+
+    def test_query_count_is_constant(self):
+        def queries(user):
+            with CaptureQueriesContext(connection) as ctx:
+                self.get(user)
+            return len(ctx.captured_queries)
+
+        self.populate(2)
+        small = (queries(self.volunteer), queries(self.org))
+        self.populate(8)
+        large = (queries(self.volunteer), queries(self.org))
+
+        self.assertEqual(small, large)
+        # user + פרופיל + סטטיסטיקות, אירועים, תרומות
+        self.assertEqual(large, (3, 3))
+
+
+class MyActivityTests(TestCase):
+    """
+    GET /api/me/activity/: שורה לכל הרשמה של המתנדב, סינון / מיון לפי תאריך, join אחד.
+    """
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        OrganizationProfile.objects.create(user=self.org, org_name="עמותת חסד")
+        self.volunteer = User.objects.create(email="vol@example.com", role="VOLUNTEER")
+        self.other = User.objects.create(email="vol2@example.com", role="VOLUNTEER")
+        self.client = APIClient()
+        self.client.force_authenticate(self.volunteer)
+
+    def event(self, days, capacity=10, org=None):
+        return Event.objects.create(
+            organization=org or self.org, title=f"event {days}", description="", category="general",
+            location="חיפה", date=timezone.localdate() + timedelta(days=days), time=time(10, 0),
+            needed_volunteers=capacity,
+        )
+
+    def get(self, **params):
+        response = self.client.get("/api/me/activity/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"] if "results" in response.data else response.data
+
+    def test_rows_and_status_filter(self):
+        past, soon, later = self.event(-3), self.event(1), self.event(5)
+        full = self.event(2, capacity=1)
+        signups_service.sign_up(full, self.other)
+        for event in (later, past, soon, full):
+            signups_service.sign_up(event, self.volunteer)
+        signups_service.sign_up(soon, self.other)
+        EventSignup.objects.filter(event=past, volunteer=self.volunteer).update(rating=5, duration_hours=Decimal("2"))
+
+        rows = self.get()
+        self.assertEqual([r["event_id"] for r in rows], [later.id, full.id, soon.id, past.id])
+
+        upcoming = self.get(status="upcoming")
+        self.assertEqual([r["event_id"] for r in upcoming], [soon.id, full.id, later.id])
+        waitlisted = upcoming[1]
+        self.assertEqual((waitlisted["status"], waitlisted["waitlist_position"]), ("WAITLISTED", 1))
+
+        (history,) = self.get(status="history")
+        self.assertEqual(
+            (history["event_id"], history["org_name"], history["rating"], history["duration_hours"]),
+            (past.id, "עמותת חסד", 5, "2.00"),
+        )
+
+    def test_org_name_falls_back_to_email(self):
+        bare = User.objects.create(email="bare@example.com", role="ORG")
+        signups_service.sign_up(self.event(1, org=bare), self.volunteer)
+        self.assertEqual(self.get()[0]["org_name"], "bare@example.com")
+
+    def test_errors_and_permissions(self):
+        self.assertEqual(self.client.get("/api/me/activity/", {"status": "soon"}).status_code, 400)
+        self.client.force_authenticate(self.org)
+        self.assertEqual(self.client.get("/api/me/activity/").status_code, 403)
+
+    def test_paginated_and_query_count_is_constant(self):
+        def queries(**params):
+            with CaptureQueriesContext(connection) as ctx:
+                rows = self.get(**params)
+            return len(ctx.captured_queries), len(rows)
+
+        for days in (1, 2):
+            signups_service.sign_up(self.event(days), self.volunteer)
+        small = queries()
+        for days in range(3, 13):
+            signups_service.sign_up(self.event(days), self.volunteer)
+        self.assertEqual(queries(), (small[0], 12))
+
+        first = self.client.get("/api/me/activity/", {"status": "upcoming", "page_size": 5}).data
+        second = self.client.get(first["next"]).data
+        dates = [r["date"] for r in first["results"] + second["results"]]
+        self.assertEqual(dates, sorted(dates))
+        self.assertEqual(len(set(r["id"] for r in first["results"] + second["results"])), 10)
+
+
+class SignupsListTests(TestCase):
+    """
+    GET /api/events/{id}/signups/: פרופיל המתנדב באותו join, מיון לפי אמינות ועמודים.
+    """
+
+    # (ratings_count, rating_sum) לכל מתנדב; None = בלי שורת סטטיסטיקות
+    STATS = [(2, 9.0), None, (1, 3.0), (3, 13.5), (2, 9.0), (1, 3.0), None]
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.event = Event.objects.create(
+            organization=self.org, title="event", description="", category="general", location="חיפה",
+            date=timezone.localdate() + timedelta(days=3), time=time(10, 0), needed_volunteers=50,
+        )
+        self.volunteers = []
+        self.add_signups(self.STATS)
+        self.client = APIClient()
+        self.client.force_authenticate(self.org)
+
+    def add_signups(self, rows):
+        for row in rows:
+            i = len(self.volunteers)
+            volunteer = User.objects.create(email=f"vol{i}@example.com", role="VOLUNTEER")
+            VolunteerProfile.objects.create(user=volunteer, full_name=f"מתנדב {i}")
+            if row:
+                VolunteerStats.objects.create(volunteer=volunteer, ratings_count=row[0], rating_sum=row[1])
+            signups_service.sign_up(self.event, volunteer)
+            self.volunteers.append(volunteer)
+
+    def get(self, **params):
+        response = self.client.get(f"/api/events/{self.event.id}/signups/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def expected(self, descending):
+        def score(i):
+            row = self.STATS[i] if i < len(self.STATS) else None
+            return row[1] / row[0] if row else 0.0
+
+        order = sorted(range(len(self.volunteers)), key=lambda i: (-score(i) if descending else score(i), i))
+        return [f"מתנדב {i}" for i in order]
+
+    def test_reliability_ordering(self):
+        for ordering, descending in (("-reliability", True), ("reliability", False)):
+            with self.subTest(ordering=ordering):
+                rows = self.get(ordering=ordering)
+                self.assertEqual([r["volunteer_name"] for r in rows], self.expected(descending))
+        top = self.get(ordering="-reliability")[0]
+        self.assertEqual((top["volunteer_name"], top["volunteer_reliability"]), ("מתנדב 0", 4.5))
+
+        response = self.client.get(f"/api/events/{self.event.id}/signups/", {"ordering": "name"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_pages_follow_reliability_with_ties(self):
+        names = []
+        page = self.get(ordering="-reliability", page_size=2)
+        while True:
+            names.extend(r["volunteer_name"] for r in page["results"])
+            if not page["next"]:
+                break
+            page = self.client.get(page["next"]).data
+        self.assertEqual(names, self.expected(descending=True))
+
+    def test_query_count_is_constant(self):
+        def queries():
+            with CaptureQueriesContext(connection) as ctx:
+                rows = self.get(ordering="-reliability")
+            return len(ctx.captured_queries), len(rows)
+
+        small = queries()
+        self.add_signups([(1, 5.0), None] * 6)
+        self.assertEqual(queries(), (small[0], len(self.STATS) + 12))
+
+    def test_only_the_owning_organization(self):
+        self.client.force_authenticate(User.objects.create(email="other@example.com", role="ORG"))
+        self.assertIn(
+            self.client.get(f"/api/events/{self.event.id}/signups/").status_code, (403, 404)
+        )
+        self.client.force_authenticate(self.volunteers[0])
+        self.assertEqual(self.client.get(f"/api/events/{self.event.id}/signups/").status_code, 403)
+
+
+class StatsConsistencyTests(TestCase):
+    """
+    המונים האינקרמנטליים (signup / cancel / קידום / rate) == בנייה מחדש מלאה מ-EventSignup.
+    """
+
+    def setUp(self):
+        self.orgs = [User.objects.create(email=f"org{i}@example.com", role="ORG") for i in range(2)]
+        self.volunteers = [
+            User.objects.create(email=f"vol{i}@example.com", role="VOLUNTEER") for i in range(6)
+        ]
+
+    def event(self, org, days, capacity):
+        return Event.objects.create(
+            organization=org, title="event", description="", category="general", location="חיפה",
+            date=timezone.localdate() + timedelta(days=days), time=time(10, 0), needed_volunteers=capacity,
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def signup_id(self, event, volunteer):
+        return EventSignup.objects.get(event=event, volunteer=volunteer).id
+
+    def rating(self, signup_id, score, hours):
+        return {
+            "signup_id": signup_id, "rating_reliability": score, "rating_execution": score,
+            "rating_teamwork": score, "hours": hours,
+        }
+
+    def run_mixed_sequence(self):
+        org_a, org_b = self.orgs
+        v = self.volunteers
+        past_a, past_b, future_a = self.event(org_a, -3, 2), self.event(org_b, -2, 1), self.event(org_a, 5, 1)
+
+        for volunteer in v[:4]:
+            signups_service.sign_up(past_a, volunteer)  # v0, v1 מאושרים; v2, v3 ממתינים
+        for volunteer in (v[0], v[4]):
+            signups_service.sign_up(past_b, volunteer)  # v4 ממתין
+        for volunteer in (v[1], v[2], v[5]):
+            signups_service.sign_up(future_a, volunteer)
+
+        client_a, client_b = self.client_for(org_a), self.client_for(org_b)
+        url_a, url_b = f"/api/events/{past_a.id}/", f"/api/events/{past_b.id}/"
+        self.assertEqual(client_a.post(f"{url_a}rate/", self.rating(self.signup_id(past_a, v[0]), 5, "3")).status_code, 200)
+        self.assertEqual(client_b.post(
+            f"{url_b}rate-bulk/", [self.rating(self.signup_id(past_b, v[0]), 4, "2:30")], format="json",
+        ).status_code, 200)
+
+        # ביטול של מאושר שדורג -> v2 מקודם; ביטול מרשימת ההמתנה
+        signups_service.cancel_signup(past_a, v[0])
+        signups_service.cancel_signup(past_a, v[3])
+
+        bulk = [self.rating(self.signup_id(past_a, v[1]), 3, "10:00-14:00"), self.rating(self.signup_id(past_a, v[2]), 2, "1")]
+        self.assertEqual(client_a.post(f"{url_a}rate-bulk/", bulk, format="json").json()["updated"], 2)
+        # עריכת דירוג קיים
+        self.assertEqual(client_a.post(f"{url_a}rate/", self.rating(self.signup_id(past_a, v[1]), 5, "שעתיים")).status_code, 200)
+
+        # הגדלת מקומות מקדמת את רשימת ההמתנה; ביטול של מאושר שדורג ב-past_b מקדם את v4
+        self.assertEqual(
+            client_a.patch(f"/api/events/{future_a.id}/", {"needed_volunteers": 3}, format="json").status_code, 200
+        )
+        signups_service.cancel_signup(past_b, v[0])
+        self.assertEqual(client_b.post(f"{url_b}rate/", self.rating(self.signup_id(past_b, v[4]), 4, "5")).status_code, 200)
+
+    def snapshot(self):
+        volunteers = {
+            row.pk: (row.activities_count, row.ratings_count, round(row.rating_sum, 6), row.hours_total)
+            for row in VolunteerStats.objects.all()
+            if (row.activities_count, row.ratings_count, row.rating_sum, row.hours_total) != (0, 0, 0, 0)
+        }
+        orgs = {row.pk: row.hours_total for row in OrgStats.objects.exclude(hours_total=0)}
+        return volunteers, orgs
+
+    def test_incremental_matches_rebuild(self):
+        self.run_mixed_sequence()
+        incremental = self.snapshot()
+        v = self.volunteers
+        self.assertEqual(incremental[0][v[2].pk][:2], (2, 1))
+        self.assertEqual(incremental[1], {self.orgs[0].pk: Decimal("3"), self.orgs[1].pk: Decimal("5")})
+
+        stats.rebuild_volunteer_stats()
+        stats.rebuild_hours_totals()
+
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_backfill_migrations(self):
+        self.run_mixed_sequence()
+        incremental = self.snapshot()
+
+        VolunteerStats.objects.all().delete()
+        OrgStats.objects.all().delete()
+        import_module("events.migrations.0010_volunteer_stats").build_volunteer_stats(django_apps, None)
+        import_module("events.migrations.0011_hours_ledger").build_hours_totals(django_apps, None)
+
+        self.assertEqual(self.snapshot(), incremental)
+
+
+class RateBulkTests(TestCase):
+    """
+    rate-bulk: בקשה תקינה -> תמיד 200 עם results / errors לכל פריט, 400 רק לגוף שגוי.
+    """
+
+    def setUp(self):
+        self.org = User.objects.create(email="org@example.com", role="ORG")
+        self.event = Event.objects.create(
+            organization=self.org, title="event", description="", category="general", location="חיפה",
+            date=timezone.localdate() - timedelta(days=1), time=time(10, 0), needed_volunteers=20,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.org)
+
+    def make_signups(self, count, start=0):
+        return [
+            EventSignup.objects.create(
+                event=self.event,
+                volunteer=User.objects.create(email=f"vol{start + i}@example.com", role="VOLUNTEER"),
+            )
+            for i in range(count)
+        ]
+
+    def rating(self, signup_id, score=5):
+        return {
+            "signup_id": signup_id, "rating_reliability": score, "rating_execution": score,
+            "rating_teamwork": score, "hours": "3",
+        }
+
+    def post(self, body):
+        return self.client.post(f"/api/events/{self.event.id}/rate-bulk/", body, format="json")
+
+    def test_partial_success(self):
+        first, second = self.make_signups(2)
+        response = self.post([self.rating(first.id), self.rating(second.id, score=9), self.rating(999999)])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual([r["signup_id"] for r in data["results"]], [first.id])
+        self.assertEqual(
+            [(e["index"], e["signup_id"]) for e in data["errors"]],
+            [(1, second.id), (2, 999999)],
+        )
+        self.assertEqual(VolunteerStats.objects.get(pk=first.volunteer_id).ratings_count, 1)
+
+    def test_all_items_failing_is_still_200(self):
+        (signup,) = self.make_signups(1)
+        response = self.post([self.rating(signup.id, score=0), self.rating(999999)])
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["updated"], data["results"]), (0, []))
+        self.assertEqual([e["index"] for e in data["errors"]], [0, 1])
+        signup.refresh_from_db()
+        self.assertIsNone(signup.rating)
+
+    def test_malformed_body_is_400(self):
+        for body in ({}, [], {"ratings": "x"}, [self.rating(1)] * 501):
+            with self.subTest(body=str(body)[:40]):
+                self.assertEqual(self.post(body).status_code, 400)
+
+    def test_permissions(self):
+        (signup,) = self.make_signups(1)
+        other_org = User.objects.create(email="other@example.com", role="ORG")
+        # עמותה אחרת לא רואה את האירוע בכלל (queryset לפי עמותה) -> 404
+        cases = ((None, 401), (signup.volunteer, 403), (other_org, 404))
+        for user, expected in cases:
+            with self.subTest(user=getattr(user, "email", None)):
+                self.client.force_authenticate(user)
+                self.assertEqual(self.post([self.rating(signup.id)]).status_code, expected)
+
+    def test_query_count_does_not_grow_with_items(self):
+        def queries(signups):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.post([self.rating(signup.id) for signup in signups])
+            self.assertEqual(response.json()["updated"], len(signups))
+            return len(ctx.captured_queries)
+
+        # הקריאה הראשונה יוצרת את שורת OrgStats - לא חלק מההשוואה
+        queries(self.make_signups(1))
+        small = queries(self.make_signups(2, start=1))
+        large = queries(self.make_signups(12, start=3))
+        self.assertEqual(small, large)
+
+
+class SignupCapacityTests(TransactionTestCase):
+    """
+    הרבה הרשמות במקביל לאותו אירוע: בדיוק needed_volunteers מאושרות,
+    השאר ברשימת המתנה, והמונים תואמים לשורות ב-EventSignup.
+    """
+
+    capacity = 5
+    volunteers_count = 20
+
+    def setUp(self):
+        org = User.objects.create(email="org@example.com", role="ORG")
+        self.event = Event.objects.create(
+            organization=org,
+            title="event",
+            description="",
+            category="general",
+            location="חיפה",
+            date=timezone.localdate() + timedelta(days=7),
+            time=time(10, 0),
+            needed_volunteers=self.capacity,
+        )
+        self.volunteers = [
+            User.objects.create(email=f"vol{i}@example.com", role="VOLUNTEER")
+            for i in range(self.volunteers_count)
+        ]
+
+    def run_in_parallel(self, action, volunteers):
+        barrier = threading.Barrier(len(volunteers))
+        responses = []
+        lock = threading.Lock()
+
+        def run(volunteer):
+            client = APIClient()
+            client.force_authenticate(volunteer)
+            barrier.wait()
+            try:
+                response = client.post(f"/api/events/{self.event.id}/{action}/")
+                with lock:
+                    responses.append(response)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=run, args=(v,)) for v in volunteers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return responses
+
+    def test_parallel_signups_never_overbook(self):
+        responses = self.run_in_parallel("signup", self.volunteers)
+
+        self.assertEqual([r.status_code for r in responses], [201] * self.volunteers_count)
+        statuses = [r.json()["status"] for r in responses]
+        self.assertEqual(statuses.count("CONFIRMED"), self.capacity)
+
+        places = sorted(r.json()["waitlist_position"] for r in responses if r.json()["status"] == "WAITLISTED")
+        self.assertEqual(places, list(range(1, self.volunteers_count - self.capacity + 1)))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.signups_count, self.capacity)
+        self.assertEqual(self.event.waitlist_count, self.volunteers_count - self.capacity)
+        confirmed = EventSignup.objects.filter(event=self.event, status=EventSignup.Status.CONFIRMED)
+        self.assertEqual(confirmed.count(), self.capacity)
+
+    def test_parallel_cancels_promote_distinct_volunteers(self):
+        for volunteer in self.volunteers:
+            signups_service.sign_up(self.event, volunteer)
+        confirmed = self.volunteers[: self.capacity]
+        waitlisted = self.volunteers[self.capacity:]
+
+        responses = self.run_in_parallel("cancel", confirmed)
+
+        promoted = [r.json()["promoted_volunteer_id"] for r in responses]
+        self.assertEqual(sorted(promoted), sorted(v.id for v in waitlisted[: self.capacity]))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.signups_count, self.capacity)
+        self.assertEqual(self.event.waitlist_count, len(waitlisted) - self.capacity)
+
+    def test_cancel_frees_a_seat(self):
+        client = APIClient()
+        client.force_authenticate(self.volunteers[0])
+        self.assertEqual(client.post(f"/api/events/{self.event.id}/signup/").status_code, 201)
+        self.assertEqual(client.post(f"/api/events/{self.event.id}/signup/").status_code, 400)
+        self.assertEqual(client.post(f"/api/events/{self.event.id}/cancel/").status_code, 200)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.signups_count, 0)
+
+    def test_reconcile_signup_counts(self):
+        EventSignup.objects.create(event=self.event, volunteer=self.volunteers[0])
+        Event.objects.filter(pk=self.event.pk).update(signups_count=3)
+
+        call_command("reconcile_signup_counts", stdout=open("/dev/null", "w"))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.signups_count, 1)
@@ -1,13 +1,23 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import EventViewSet, DashboardStatsView, OrgAdminView
+from .views import (
+    EventViewSet,
+    DashboardStatsView,
+    DashboardView,
+    HoursLedgerView,
+    MyActivityView,
+    OrgAdminView,
+)
 router = DefaultRouter()
 router.register("events", EventViewSet, basename="events")
 
 urlpatterns = [
     path("", include(router.urls)),
 
+    path("dashboard/", DashboardView.as_view(), name="dashboard"),
     path("dashboard/stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
+    path("me/activity/", MyActivityView.as_view(), name="my-activity"),
+    path("hours/", HoursLedgerView.as_view(), name="hours-ledger"),
     path("org-admin/", OrgAdminView.as_view(), name="org-admin"),
 ]
\ No newline at end of file
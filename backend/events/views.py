@@ -13,15 +13,77 @@ from . import serializers as s
 
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Left, NullIf, TruncMonth
+from rest_framework.exceptions import ValidationError
 
-from rest_framework import viewsets, permissions, status
+from rest_framework import generics, viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from accounts.models import User
+from config.query_params import parse_date_param
+from config import response_cache
+from config.response_cache import ResponseCacheMixin
+from config.sparse_fields import SparseQuerysetMixin
 from accounts.permissions import IsOrganization, IsVolunteer
-from .models import Event, EventSignup
+from accounts.views import me_payload
+from donations.serializers import DonationSerializer
+from donations.views import donations_for_user
+from .hours import parse_hours
+from .models import Event, EventSignup, OrgStats, VolunteerStats
+from . import export as event_export
+from . import search as event_search
 from . import serializers as s
+from . import signups as signups_service
+from . import stats
+from .signals import EVENTS_NAMESPACE
+
+# ?ordering= מותרים (שדה אחרון ייחודי בשביל keyset pagination)
+CATALOG_ORDERINGS = {
+    "date": ("date", "id"),
+    "-date": ("-date", "-id"),
+    "created_at": ("created_at", "id"),
+    "-created_at": ("-created_at", "-id"),
+    "title": ("title", "id"),
+    "-title": ("-title", "-id"),
+}
+
+
+# ?ordering= של /api/events/{id}/signups/
+SIGNUP_ORDERINGS = {
+    "created_at": ("created_at", "id"),
+    "-created_at": ("-created_at", "-id"),
+    "reliability": ("volunteer_reliability", "id"),
+    "-reliability": ("-volunteer_reliability", "id"),
+}
+
+
+# דירוג רק למי שהשתתף בפועל (לא רשימת המתנה)
+NOT_CONFIRMED_DETAIL = "Only confirmed signups can be rated"
+
+# rate-bulk
+MAX_BULK_RATINGS = 500
+BULK_RATING_BATCH = 100
+RATING_FIELDS = [
+    "rating_reliability",
+    "rating_execution",
+    "rating_teamwork",
+    "rating",
+    "rated_at",
+    "rated_by",
+    "notes",
+    "role",
+    "hours",
+    "duration_hours",
+    "task_desc",
+]
+
+
+def _item_signup_id(item):
+    return item.get("signup_id") if isinstance(item, dict) else None
+
 
 def user_has_role(user, role_name: str) -> bool:
     """
@@ -47,17 +109,127 @@ def user_has_role(user, role_name: str) -> bool:
 
     # fallback: השוואה ל-string של האובייקט
     return str(user_role).upper() == role_name.upper()
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ResponseCacheMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = s.EventSerializer
+    # קטלוג ציבורי לאורחים - מה-cache (config/response_cache.py)
+    response_cache_actions = ("list", "retrieve", "search", "catalog_options")
+
+    def response_cache_namespaces(self):
+        return [EVENTS_NAMESPACE]
+
+    def response_depends_on_date(self, request):
+        return self.action == "list" and request.query_params.get("status") in ("upcoming", "history")
 
     # ======================
     # מי רואה איזה אירועים (+ status filter לדשבורד)
     # ======================
+    def get_serializer_class(self):
+        if self.action == "list":
+            return s.EventListSerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
+        if self.action not in ("list", "retrieve"):
+            return self.annotate_for_list(self.filter_queryset_for_user(Event.objects.all()))
+
+        # ?fields= / ?omit= (config/sparse_fields.py): רק העמודות וה-annotations שבתשובה
+        fields = self.sparse_field_names()
+        qs = self.annotate_for_list(self.filter_queryset_for_user(Event.objects.all()), fields)
+        # פילטרי הקטלוג רק ברשימה: ?date_from= שנשאר ב-URL לא מחזיר 404 ל-signup / PATCH
+        if self.action == "list":
+            qs = self.filter_catalog(qs)
+            if "description" in fields:
+                qs = qs.annotate(description_preview=Left("description", s.LIST_DESCRIPTION_CHARS + 1))
+        return self.sparse_queryset(qs)
+
+    # ======================
+    # פילטרים/מיון בצד השרת לקטלוג (ExploreEvents / OrganizationDetails)
+    # ?category= &location= &date_from= &date_to= &has_capacity=1 &q= &ordering=
+    # ======================
+    def filter_catalog(self, qs, text_search=True):
+        params = self.request.query_params
+
+        category = (params.get("category") or "").strip()
+        if category:
+            qs = qs.filter(category=category)
+
+        location = (params.get("location") or "").strip()
+        if location:
+            qs = qs.filter(location=location)
+
+        date_from = self._parse_date_param("date_from")
+        if date_from:
+            qs = qs.filter(date__gte=date_from)
+
+        date_to = self._parse_date_param("date_to")
+        if date_to:
+            qs = qs.filter(date__lte=date_to)
+
+        if str(params.get("has_capacity", "")).lower() in ("1", "true", "yes"):
+            qs = qs.filter(signups_count__lt=F("needed_volunteers"))
+
+        q = (params.get("q") or "").strip()
+        if q and text_search:
+            qs = event_search.search(qs, q)
+
+        ordering = CATALOG_ORDERINGS.get(params.get("ordering") or "")
+        if ordering:
+            qs = qs.order_by(*ordering)
+
+        return qs
+
+    def _parse_date_param(self, name):
+        return parse_date_param(self.request.query_params, name)
+
+    # ======================
+    # my_rating / org בשאילתה אחת (בלי N+1); signups_count הוא עמודה על Event
+    # ======================
+    def annotate_for_list(self, qs, fields=None):
+        """
+        fields: השדות שבתשובה (sparse fieldsets); None = כולם.
+        """
         user = self.request.user
-        qs = Event.objects.all()
-        org_profile_id = self.request.query_params.get("org")
+
+        if user_has_role(user, "VOLUNTEER") and (fields is None or "my_rating" in fields):
+            my_rating = Subquery(
+                EventSignup.objects
+                .filter(event=OuterRef("pk"), volunteer=user)
+                .values("rating")[:1],
+                output_field=FloatField(),
+            )
+        else:
+            my_rating = Value(None, output_field=FloatField())
+
+        if fields is None or "org_name" in fields:
+            qs = qs.select_related("organization")
+        return qs.annotate(my_rating=my_rating)
+
+    # ======================
+    # ordering ל-keyset pagination (תואם ל-order_by של כל מצב)
+    # ======================
+    def get_cursor_ordering(self):
+        if self.action == "signups":
+            return self.get_signups_ordering()
+
+        ordering = CATALOG_ORDERINGS.get(self.request.query_params.get("ordering") or "")
+        if ordering:
+            return ordering
+
         status_param = self.request.query_params.get("status")
+        if status_param == "upcoming":
+            return ("date", "id")
+        if status_param == "history":
+            return ("-date", "-id")
+        if self.request.query_params.get("org"):
+            return ("date", "id")
+        return ("-created_at", "-id")
+
+    def filter_queryset_for_user(self, qs):
+        user = self.request.user
+        # ?org= / ?status= מצמצמים רק את הרשימה; בשאר ה-actions רק ההרשאה (עמותה -> שלה)
+        listing = self.action == "list"
+        org_profile_id = self.request.query_params.get("org") if listing else None
+        status_param = self.request.query_params.get("status") if listing else None
         today = timezone.localdate()
 
         if org_profile_id:
@@ -73,9 +245,6 @@ class EventViewSet(viewsets.ModelViewSet):
         if not user or not user.is_authenticated:
             return qs
 
-        status_param = self.request.query_params.get("status")
-        today = timezone.localdate()
-
         # 🏢 עמותה
         if user_has_role(user, "ORG"):
             org_qs = qs.filter(organization=user)
@@ -105,7 +274,7 @@ class EventViewSet(viewsets.ModelViewSet):
     # ======================
     def get_permissions(self):
         # 👀 צפייה ציבורית
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "search", "catalog_options"]:
             return [permissions.AllowAny()]
 
         # 🏢 ניהול אירועים — רק עמותה מחוברת
@@ -116,12 +285,12 @@ class EventViewSet(viewsets.ModelViewSet):
         if self.action in ["signup", "cancel"]:
             return [permissions.IsAuthenticated(), IsVolunteer()]
 
-        # 🏢 צפייה בנרשמים — רק עמותה מחוברת
-        if self.action in ["signups"]:
+        # 🏢 צפייה בנרשמים / ייצוא — רק עמותה מחוברת
+        if self.action in ["signups", "export"]:
             return [permissions.IsAuthenticated(), IsOrganization()]
 
         # 🏢 דירוג מתנדב — רק עמותה מחוברת
-        if self.action in ["rate"]:
+        if self.action in ["rate", "rate_bulk"]:
             return [permissions.IsAuthenticated(), IsOrganization()]
 
         # ברירת מחדל (בטיחות)
@@ -133,6 +302,76 @@ class EventViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(organization=self.request.user)
 
+    def perform_update(self, serializer):
+        # הגדלת needed_volunteers משחררת מקומות - מקדמים מרשימת ההמתנה
+        previous = serializer.instance.needed_volunteers
+        with transaction.atomic():
+            event = serializer.save()
+            if event.needed_volunteers > previous:
+                signups_service.fill_from_waitlist(event.pk)
+
+    # ======================
+    # חיפוש טקסט מלא (title/description/category/location), מדורג + snippets
+    # GET /api/events/search/?q=...&limit=20 (+ אותם פילטרים של הקטלוג)
+    # ======================
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.AllowAny],
+        url_path="search",
+    )
+    def search(self, request):
+        return self.cached(request, lambda: self.search_response(request))
+
+    def search_response(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if not event_search.query_terms(q):
+            return Response({"detail": "Missing q"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = int(request.query_params.get("limit") or 20)
+        except ValueError:
+            limit = 20
+        limit = max(1, min(limit, 100))
+
+        qs = self.filter_catalog(self.annotate_for_list(Event.objects.all()), text_search=False)
+        qs = event_search.search(qs, q, rank=True)
+        if request.query_params.get("ordering") not in CATALOG_ORDERINGS:
+            qs = qs.order_by("-search_rank", "date", "id")
+
+        events = list(qs[:limit])
+        results = s.EventSerializer(events, many=True, context=self.get_serializer_context()).data
+        for event, item in zip(events, results):
+            item["rank"] = event.search_rank
+            item["title_highlight"] = event_search.highlight(event.title, q, radius=None)
+            item["snippet"] = event_search.highlight(event.description, q)
+
+        return Response({"q": q, "results": results})
+
+    # ======================
+    # ערכי הסינון של הקטלוג (קטגוריות / מיקומים), בלי לטעון את האירועים עצמם
+    # GET /api/events/catalog-options/?date_from=
+    # ======================
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.AllowAny],
+        url_path="catalog-options",
+    )
+    def catalog_options(self, request):
+        return self.cached(request, lambda: self.catalog_options_response(request))
+
+    def catalog_options_response(self, request):
+        qs = self.filter_queryset_for_user(Event.objects.all()).order_by()
+        date_from = self._parse_date_param("date_from")
+        if date_from:
+            qs = qs.filter(date__gte=date_from)
+
+        def distinct(field):
+            return sorted(qs.exclude(**{field: ""}).values_list(field, flat=True).distinct())
+
+        return Response({"categories": distinct("category"), "locations": distinct("location")})
+
     # ======================
     # הרשמה לאירוע (מתנדב)
     # POST /api/events/{id}/signup/
@@ -145,19 +384,26 @@ class EventViewSet(viewsets.ModelViewSet):
     def signup(self, request, pk=None):
         event = self.get_object()
 
-        signup, created = EventSignup.objects.get_or_create(
-            event=event,
-            volunteer=request.user,
-        )
-
-        if not created:
+        try:
+            signup = signups_service.sign_up(event, request.user)
+        except signups_service.SignupError as e:
             return Response(
-                {"detail": "Already signed up"},
+                {"detail": e.detail},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if signup.status == EventSignup.Status.WAITLISTED:
+            return Response(
+                {
+                    "detail": "Event is full - added to waitlist",
+                    "status": signup.status,
+                    "waitlist_position": signup.waitlist_place,
+                },
+                status=status.HTTP_201_CREATED,
+            )
+
         return Response(
-            {"detail": "Signed up successfully"},
+            {"detail": "Signed up successfully", "status": signup.status},
             status=status.HTTP_201_CREATED,
         )
 
@@ -173,22 +419,36 @@ class EventViewSet(viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         event = self.get_object()
 
-        deleted, _ = EventSignup.objects.filter(
-            event=event,
-            volunteer=request.user,
-        ).delete()
-
-        if deleted == 0:
+        try:
+            promoted = signups_service.cancel_signup(event, request.user)
+        except signups_service.SignupError as e:
             return Response(
-                {"detail": "Not signed up"},
+                {"detail": e.detail},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
         return Response(
-            {"detail": "Signup canceled"},
+            {
+                "detail": "Signup canceled",
+                "promoted_volunteer_id": promoted.volunteer_id if promoted else None,
+            },
             status=status.HTTP_200_OK,
         )
 
+    # ======================
+    # ייצוא CSV: כל האירועים של העמותה × נרשמים, בבקשה אחת (streaming)
+    # GET /api/events/export/
+    # ======================
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.IsAuthenticated, IsOrganization],
+        url_path="export",
+    )
+    def export(self, request):
+        filename = f"events_and_signups_report_{timezone.localdate().isoformat()}.csv"
+        return event_export.stream_csv(event_export.org_export_rows(request.user), filename)
+
     # ======================
     # מי רשום לאירוע (רק העמותה שיצרה)
     # GET /api/events/{id}/signups/
@@ -207,10 +467,36 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        qs = event.signups.select_related("volunteer").order_by("created_at")
-        serializer = s.EventSignupSerializer(qs, many=True)
+        # פרופיל המתנדב באותו join; הציון מ-VolunteerStats (מתוחזק) כ-annotation למיון
+        qs = (
+            event.signups
+            .select_related("volunteer", "volunteer__vol_profile")
+            .annotate(volunteer_reliability=Coalesce(
+                F("volunteer__vol_stats__rating_sum")
+                / NullIf(F("volunteer__vol_stats__ratings_count"), 0),
+                0.0,
+                output_field=FloatField(),
+            ))
+            .order_by(*self.get_signups_ordering())
+        )
+        # event_id נשאר: event.signups מצמיד את האירוע לכל שורה דרכו (אחרת שאילתה לשורה)
+        qs = self.sparse_queryset(qs, s.EventSignupSerializer, extra=("event",))
+
+        page = self.paginate_queryset(qs)
+        if page is not None:
+            return self.get_paginated_response(
+                s.EventSignupSerializer(page, many=True, context=self.get_serializer_context()).data
+            )
+
+        serializer = s.EventSignupSerializer(qs, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
+    def get_signups_ordering(self):
+        ordering = self.request.query_params.get("ordering") or "created_at"
+        if ordering not in SIGNUP_ORDERINGS:
+            raise ValidationError({"ordering": f"Expected one of: {', '.join(SIGNUP_ORDERINGS)}"})
+        return SIGNUP_ORDERINGS[ordering]
+
     # ======================
     # דירוג מתנדב באירוע (רק העמותה שיצרה, ורק אחרי שהאירוע עבר)
     # POST /api/events/{id}/rate/
@@ -232,8 +518,176 @@ class EventViewSet(viewsets.ModelViewSet):
     def rate(self, request, pk=None):
         event = self.get_object()
 
+        denied = self._check_can_rate(event, request.user)
+        if denied:
+            return denied
+
+        ser = s.RateSignupSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        data = ser.validated_data
+
+        with transaction.atomic():
+            signup = get_object_or_404(
+                EventSignup.objects.select_for_update(),
+                id=data["signup_id"],
+                event=event,
+            )
+            # ברשימת ההמתנה לא השתתפו; ביטול שלהם גם לא מוריד דירוג/שעות מהמונים
+            if signup.status != EventSignup.Status.CONFIRMED:
+                return Response(
+                    {"detail": NOT_CONFIRMED_DETAIL},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            previous_rating = signup.rating
+            previous_hours = signup.duration_hours
+            self._apply_rating(signup, data, request.user)
+            signup.save()
+
+            stats.record_rating(signup.volunteer_id, previous_rating, signup.rating)
+            stats.record_hours(
+                signup.volunteer_id, event.organization_id, previous_hours, signup.duration_hours
+            )
+            stats.sync_profile_reliability(signup.volunteer_id)
+
+        return Response(
+            {
+                "detail": "Rated successfully",
+                "signup_id": signup.id,
+                "volunteer_id": signup.volunteer_id,
+                "rating_reliability": signup.rating_reliability,
+                "rating_execution": signup.rating_execution,
+                "rating_teamwork": signup.rating_teamwork,
+                "rating": signup.rating,
+                "duration_hours": signup.duration_hours,
+                "rated_at": signup.rated_at,
+                "rated_by": getattr(request.user, "id", None),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    # ======================
+    # POST /api/events/{id}/rate-bulk/
+    # ======================
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[permissions.IsAuthenticated, IsOrganization],
+        url_path="rate-bulk",
+    )
+    def rate_bulk(self, request, pk=None):
+        """
+        גוף: רשימה של פריטי RateSignupSerializer (או {"ratings": [...]}).
+        פריטים תקינים נשמרים (bulk_update אחד), לכל פריט שגוי מוחזרת שגיאה לפי index.
+        בקשה תקינה -> תמיד 200 עם results / errors (גם אם אף פריט לא נשמר);
+        400 רק לגוף שאינו רשימה / רשימה ריקה / גדולה מדי.
+        """
+        event = self.get_object()
+
+        denied = self._check_can_rate(event, request.user)
+        if denied:
+            return denied
+
+        items = request.data.get("ratings") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of ratings"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > MAX_BULK_RATINGS:
+            return Response(
+                {"detail": f"At most {MAX_BULK_RATINGS} ratings per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # ולידציה: הכל ב-many=True; אם יש שגיאות - הפריטים התקינים עוברים ולידציה לבד
+        ser = s.RateSignupSerializer(data=items, many=True)
+        errors = {}
+        if ser.is_valid():
+            valid = dict(enumerate(ser.validated_data))
+        else:
+            # DRF מחזיר רשימה מיושרת לפריטים או dict {index: errors} (תלוי גרסה)
+            raw = ser.errors
+            pairs = raw.items() if isinstance(raw, dict) else enumerate(raw)
+            errors = {int(i): e for i, e in pairs if e}
+            valid = {
+                i: ser.child.run_validation(item)
+                for i, item in enumerate(items)
+                if i not in errors
+            }
+
+        # signup_id כפול באותה בקשה
+        seen = {}
+        for i in sorted(valid):
+            sid = valid[i]["signup_id"]
+            if sid in seen:
+                errors[i] = {"signup_id": ["Duplicate signup_id in request"]}
+            else:
+                seen[sid] = i
+        valid = {i: data for i, data in valid.items() if i not in errors}
+
+        results = []
+        with transaction.atomic():
+            signups = {
+                signup.id: signup
+                for signup in EventSignup.objects.select_for_update().filter(
+                    event=event, id__in=[data["signup_id"] for data in valid.values()]
+                )
+            }
+
+            changed = []
+            stat_changes = []
+            for i in sorted(valid):
+                data = valid[i]
+                signup = signups.get(data["signup_id"])
+                if signup is None:
+                    errors[i] = {"signup_id": ["Signup not found for this event"]}
+                    continue
+                if signup.status != EventSignup.Status.CONFIRMED:
+                    errors[i] = {"signup_id": [NOT_CONFIRMED_DETAIL]}
+                    continue
+
+                previous_rating, previous_hours = signup.rating, signup.duration_hours
+                self._apply_rating(signup, data, request.user)
+                changed.append(signup)
+                stat_changes.append((
+                    signup.volunteer_id,
+                    previous_rating,
+                    signup.rating,
+                    previous_hours,
+                    signup.duration_hours,
+                ))
+                results.append({
+                    "index": i,
+                    "signup_id": signup.id,
+                    "volunteer_id": signup.volunteer_id,
+                    "rating": signup.rating,
+                    "duration_hours": signup.duration_hours,
+                    "rated_at": signup.rated_at,
+                })
+
+            if changed:
+                EventSignup.objects.bulk_update(changed, RATING_FIELDS, batch_size=BULK_RATING_BATCH)
+                stats.record_ratings(event.organization_id, stat_changes)
+                stats.sync_profiles_reliability({signup.volunteer_id for signup in changed})
+                # bulk_update בלי signals; my_rating ברשימת האירועים משתנה
+                response_cache.invalidate(EVENTS_NAMESPACE)
+
+        return Response(
+            {
+                "updated": len(results),
+                "results": results,
+                "errors": [
+                    {"index": i, "signup_id": _item_signup_id(items[i]), "errors": errors[i]}
+                    for i in sorted(errors)
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @staticmethod
+    def _check_can_rate(event, user):
         # רק העמותה שיצרה את האירוע יכולה לדרג
-        if event.organization != request.user:
+        if event.organization_id != user.pk:
             return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
 
         # רק אחרי שהאירוע עבר (לפי תאריך)
@@ -243,13 +697,10 @@ class EventViewSet(viewsets.ModelViewSet):
                 {"detail": "You can rate only after the event ends"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        return None
 
-        ser = s.RateSignupSerializer(data=request.data)
-        ser.is_valid(raise_exception=True)
-        data = ser.validated_data
-
-        signup = get_object_or_404(EventSignup, id=data["signup_id"], event=event)
-
+    @staticmethod
+    def _apply_rating(signup, data, rated_by):
         # ✅ עריכה מותרת: פשוט מעדכנים מחדש
         signup.rating_reliability = data["rating_reliability"]
         signup.rating_execution = data["rating_execution"]
@@ -263,65 +714,234 @@ class EventViewSet(viewsets.ModelViewSet):
 
         # מטא דירוג: "עודכן לאחרונה"
         signup.rated_at = timezone.now()
-        signup.rated_by = request.user
+        signup.rated_by = rated_by
 
         # שדות אופציונליים אם נשלחו
         for f in ["notes", "role", "hours", "task_desc"]:
             if f in data:
                 setattr(signup, f, data[f])
 
-        signup.save()
+        # שעות כמספר: duration_hours מפורש, אחרת מפענחים את הטקסט ב-hours
+        if "duration_hours" in data:
+            signup.duration_hours = data["duration_hours"]
+        elif "hours" in data:
+            signup.duration_hours = parse_hours(data["hours"])
 
-        return Response(
-            {
-                "detail": "Rated successfully",
-                "signup_id": signup.id,
-                "volunteer_id": signup.volunteer_id,
-                "rating_reliability": signup.rating_reliability,
-                "rating_execution": signup.rating_execution,
-                "rating_teamwork": signup.rating_teamwork,
-                "rating": signup.rating,
-                "rated_at": signup.rated_at,
-                "rated_by": getattr(request.user, "id", None),
-            },
-            status=status.HTTP_200_OK,
-        )
+
+def volunteer_stats_payload(row):
+    return {
+        "reliability_score": row.reliability_score,
+        "ratings_count": row.ratings_count,
+        "activities_count": row.activities_count,
+        "hours_total": float(row.hours_total),
+    }
 
 
 class DashboardStatsView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsVolunteer]
 
     def get(self, request):
+        # שורה אחת לפי PK (מתוחזקת ב-signup/cancel/rate) - בלי aggregates ובלי כתיבה
+        row = VolunteerStats.objects.filter(pk=request.user.pk).first()
+        if row is None:
+            row = VolunteerStats(volunteer=request.user)
+
+        return Response(volunteer_stats_payload(row))
+
+
+class DashboardView(APIView):
+    """
+    GET /api/dashboard/?sections=me,stats,upcoming,history,donations
+    כל הדשבורד בבקשה אחת, לפי תפקיד:
+    - me + stats: שאילתה אחת על User עם select_related לפרופיל ולסטטיסטיקות
+    - upcoming + history: שאילתה אחת (ההרשמות של המתנדב / האירועים של העמותה),
+      מפוצלת לפי תאריך בפייתון
+    - donations: שאילתה אחת
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    SECTIONS = ("me", "stats", "upcoming", "history", "donations")
+
+    def get(self, request):
+        sections = self.get_sections(request)
+        user = request.user
+        is_volunteer = user_has_role(user, "VOLUNTEER")
+        data = {"role": getattr(user, "role", None)}
+
+        if {"me", "stats"} & sections:
+            related = (
+                ["vol_profile", "vol_stats"] if is_volunteer
+                else ["vol_profile", "org_stats", "donation_stats"]
+            )
+            user = User.objects.select_related(*related).get(pk=user.pk)
+            if "me" in sections:
+                data["me"] = me_payload(user)
+            if "stats" in sections:
+                data["stats"] = self.stats_section(user, is_volunteer)
+
+        if {"upcoming", "history"} & sections:
+            upcoming, history = self.split_events(user, is_volunteer)
+            context = {"request": request}
+            if "upcoming" in sections:
+                data["upcoming"] = s.EventSerializer(upcoming, many=True, context=context).data
+            if "history" in sections:
+                data["history"] = s.EventSerializer(history, many=True, context=context).data
+
+        if "donations" in sections:
+            data["donations"] = DonationSerializer(donations_for_user(user), many=True).data
+
+        return Response(data)
+
+    def get_sections(self, request):
+        raw = (request.query_params.get("sections") or "").strip()
+        if not raw:
+            return set(self.SECTIONS)
+
+        sections = {part.strip() for part in raw.split(",") if part.strip()}
+        unknown = sections - set(self.SECTIONS)
+        if unknown:
+            raise ValidationError({"sections": f"Unknown sections: {', '.join(sorted(unknown))}"})
+        return sections
+
+    @staticmethod
+    def stats_section(user, is_volunteer):
+        if is_volunteer:
+            row = getattr(user, "vol_stats", None) or VolunteerStats(volunteer=user)
+            return volunteer_stats_payload(row)
+
+        row = getattr(user, "org_stats", None) or OrgStats(organization=user)
+        donations = getattr(user, "donation_stats", None)
+        return {
+            "hours_total": float(row.hours_total),
+            "donations_raised": float(donations.raised_amount) if donations else 0.0,
+            "donations_count": donations.donations_count if donations else 0,
+        }
+
+    @staticmethod
+    def events_queryset(user, is_volunteer):
+        """
+        מתנדב: ההרשמות שלו (join אחד: ההרשמה נותנת גם את my_rating בלי subquery);
+        עמותה: האירועים שלה. שתיהן לפי תאריך עולה.
+        """
+        if is_volunteer:
+            return (
+                EventSignup.objects
+                .filter(volunteer=user)
+                .select_related("event", "event__organization")
+                .order_by("event__date", "event__id")
+            )
+        return (
+            Event.objects
+            .filter(organization=user)
+            .select_related("organization")
+            .order_by("date", "id")
+        )
+
+    @staticmethod
+    def split_events(user, is_volunteer):
+        """
+        -> (upcoming לפי תאריך עולה, history לפי תאריך יורד), משאילתה אחת.
+        """
         today = timezone.localdate()
+        rows = DashboardView.events_queryset(user, is_volunteer)
+
+        if is_volunteer:
+            events = []
+            for signup in rows:
+                event = signup.event
+                event.my_rating = signup.rating
+                events.append(event)
+        else:
+            events = list(rows)
+
+        upcoming = [e for e in events if e.date >= today]
+        history = [e for e in reversed(events) if e.date < today]
+        return upcoming, history
 
-        activities_count = EventSignup.objects.filter(
-            volunteer=request.user,
-            event__date__lt=today
-        ).count()
 
-        rated_qs = EventSignup.objects.filter(
-            volunteer=request.user,
-            rating__isnull=False      # ✅ שדה נכון
+class MyActivityView(generics.ListAPIView):
+    """
+    GET /api/me/activity/?status=upcoming|history (+ ?cursor= / ?page_size=)
+    שורה לכל הרשמה של המתנדב, join אחד ל-Event ולעמותה.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsVolunteer]
+    serializer_class = s.MyActivitySerializer
+
+    def get_queryset(self):
+        qs = (
+            EventSignup.objects
+            .filter(volunteer=self.request.user)
+            .select_related("event", "event__organization", "event__organization__org_profile")
+            .annotate(event_date=F("event__date"))
         )
 
-        avg_rating = rated_qs.aggregate(avg=Avg("rating"))["avg"]   # ✅ שדה נכון
-        ratings_count = rated_qs.count()
+        today = timezone.localdate()
+        status_param = self.request.query_params.get("status")
+        if status_param == "upcoming":
+            qs = qs.filter(event_date__gte=today)
+        elif status_param == "history":
+            qs = qs.filter(event_date__lt=today)
+        elif status_param:
+            raise ValidationError({"status": "Expected upcoming or history"})
+
+        return qs.order_by(*self.get_cursor_ordering())
 
-        reliability = round(float(avg_rating), 2) if avg_rating is not None else 0
+    def get_cursor_ordering(self):
+        if self.request.query_params.get("status") == "upcoming":
+            return ("event_date", "id")
+        return ("-event_date", "-id")
 
-        profile = getattr(request.user, "vol_profile", None)
-        if profile:
-            profile.reliability_score = reliability
-            profile.save(update_fields=["reliability_score"])
 
+class HoursLedgerView(APIView):
+    """
+    GET /api/hours/?date_from=&date_to=
+    מתנדב: השעות שלו; עמותה: השעות באירועים שלה.
+    סיכום לפי חודש (תאריך האירוע) בשאילתה מקובצת אחת + הסכום המתוחזק.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if user_has_role(user, "VOLUNTEER"):
+            row = VolunteerStats.objects.filter(pk=user.pk).only("hours_total").first()
+        elif user_has_role(user, "ORG"):
+            row = OrgStats.objects.filter(pk=user.pk).only("hours_total").first()
+        else:
+            return Response({"detail": "Not allowed"}, status=status.HTTP_403_FORBIDDEN)
+
+        months = self.months_queryset(user, request.query_params)
         return Response({
-            "reliability_score": reliability,
-            "ratings_count": ratings_count,
-            "activities_count": activities_count,
-            "hours_total": 0,
+            "hours_total": float(row.hours_total) if row else 0.0,
+            "months": s.HoursMonthSerializer(months, many=True).data,
         })
 
 
+    @staticmethod
+    def months_queryset(user, params):
+        """
+        שעות + מספר פעילויות לפי חודש, להרשמות של המתנדב / לאירועים של העמותה.
+        """
+        qs = EventSignup.objects.filter(duration_hours__isnull=False)
+        if user_has_role(user, "VOLUNTEER"):
+            qs = qs.filter(volunteer=user)
+        else:
+            qs = qs.filter(event__organization=user)
+
+        date_from = parse_date_param(params, "date_from")
+        date_to = parse_date_param(params, "date_to")
+        if date_from:
+            qs = qs.filter(event__date__gte=date_from)
+        if date_to:
+            qs = qs.filter(event__date__lte=date_to)
+
+        return (
+            qs.annotate(month=TruncMonth("event__date"))
+            .values("month")
+            .annotate(hours=Sum("duration_hours"), activities=Count("pk"))
+            .order_by("month")
+        )
+
+
 class OrgAdminView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OrgsConfig(AppConfig):
     name = 'orgs'
+
+    def ready(self):
+        from . import signals  # noqa: F401
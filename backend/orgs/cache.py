@@ -0,0 +1,30 @@
+"""
+namespaces של עמותות ב-config/response_cache.py:
+"orgs" - מדריך העמותות, "org:<profile id>" - פרטי עמותה ו-/page/.
+"""
+from config import response_cache
+
+from .models import OrganizationProfile
+
+
+DIRECTORY_NAMESPACE = "orgs"
+
+
+def org_namespace(profile_id):
+    return f"org:{profile_id}"
+
+
+def invalidate_orgs(*user_ids, directory=True):
+    """
+    user_ids: ה-user של העמותה (Event.organization_id וכו').
+    directory=False כשהשינוי לא משפיע על הרשימה (למשל סכומי תרומות).
+    """
+    user_ids = [pk for pk in user_ids if pk]
+    profile_ids = (
+        OrganizationProfile.objects.filter(user_id__in=user_ids).values_list("pk", flat=True)
+        if user_ids else []
+    )
+    response_cache.invalidate(
+        DIRECTORY_NAMESPACE if directory else None,
+        *(org_namespace(pk) for pk in profile_ids),
+    )
@@ -8,5 +8,11 @@ class OrganizationProfile(models.Model):
     phone = models.CharField(max_length=50, blank=True)
     website = models.URLField(blank=True)
 
+    class Meta:
+        indexes = [
+            # מדריך העמותות: ORDER BY org_name, id + cursor
+            models.Index(fields=["org_name", "id"], name="org_profile_name_idx"),
+        ]
+
     def __str__(self):
         return self.org_name
@@ -0,0 +1,107 @@
+"""
+GET /api/organizations/{id}/page/ - כל דף העמותה בתשובה אחת:
+פרופיל + סטטיסטיקות, אירועים קרובים, היסטוריה, קמפיינים פעילים עם התקדמות.
+
+4 שאילתות, לא תלוי בכמות האירועים/הנרשמים:
+1. פרופיל + user + OrgStats + OrgDonationStats (select_related) + ספירות (with_directory_stats)
+2. אירועים קרובים  - (organization, date) ASC, LIMIT
+3. היסטוריה        - (organization, date) DESC, LIMIT
+4. קמפיינים פעילים - LIMIT
+
+התשובה לא תלויה במשתמש (רק בעמותה), כך שאפשר לשמור אותה ב-cache לכל עמותה.
+"""
+from decimal import Decimal
+
+from django.utils import timezone
+
+from donations.models import DonationCampaign
+from events.models import Event
+from .serializers import OrganizationProfileSerializer
+
+
+UPCOMING_LIMIT = 6
+HISTORY_LIMIT = 5
+CAMPAIGNS_LIMIT = 10
+MAX_LIMIT = 20
+
+EVENT_FIELDS = (
+    "id",
+    "title",
+    "category",
+    "location",
+    "date",
+    "time",
+    "needed_volunteers",
+    "signups_count",
+)
+
+CAMPAIGN_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "goal_amount",
+    "raised_amount",
+    "donors_count",
+    "created_at",
+)
+
+
+def parse_limit(params, name, default):
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return max(0, min(value, MAX_LIMIT))
+
+
+def _events(organization_id, upcoming, limit):
+    if not limit:
+        return []
+    today = timezone.localdate()
+    qs = Event.objects.filter(organization_id=organization_id)
+    if upcoming:
+        qs = qs.filter(date__gte=today).order_by("date", "time", "id")
+    else:
+        qs = qs.filter(date__lt=today).order_by("-date", "-time", "-id")
+    return list(qs.values(*EVENT_FIELDS)[:limit])
+
+
+def _campaigns(organization_id, limit):
+    if not limit:
+        return []
+    rows = list(
+        DonationCampaign.objects
+        .filter(organization_id=organization_id, is_active=True)
+        .order_by("-created_at", "-id")
+        .values(*CAMPAIGN_FIELDS)[:limit]
+    )
+    for row in rows:
+        goal = row["goal_amount"]
+        row["progress_percent"] = (
+            min(100, int(row["raised_amount"] * 100 / goal)) if goal else None
+        )
+    return rows
+
+
+def org_page_payload(profile, upcoming=UPCOMING_LIMIT, history=HISTORY_LIMIT, campaigns=CAMPAIGNS_LIMIT):
+    """
+    profile: מ-OrganizationProfileViewSet.get_queryset() (עם annotations ו-select_related).
+    """
+    user = profile.user
+    hours = getattr(getattr(user, "org_stats", None), "hours_total", None)
+    donations = getattr(user, "donation_stats", None)
+
+    return {
+        "profile": OrganizationProfileSerializer(profile).data,
+        "stats": {
+            "upcoming_events": profile.upcoming_events_count,
+            "volunteers": profile.volunteers_count,
+            "active_campaigns": profile.active_campaigns_count,
+            "volunteer_hours": hours if hours is not None else Decimal("0"),
+            "donations_raised": donations.raised_amount if donations else Decimal("0"),
+            "donations_count": donations.donations_count if donations else 0,
+        },
+        "upcoming_events": _events(user.pk, upcoming=True, limit=upcoming),
+        "history": _events(user.pk, upcoming=False, limit=history),
+        "campaigns": _campaigns(user.pk, campaigns),
+    }
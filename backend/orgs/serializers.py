@@ -1,11 +1,18 @@
 from rest_framework import serializers
+
+from config.sparse_fields import SparseFieldsMixin
 from .models import OrganizationProfile
 
-class OrganizationProfileSerializer(serializers.ModelSerializer):
+class OrganizationProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_id = serializers.IntegerField(source="user.id", read_only=True)
     email = serializers.EmailField(source="user.email", read_only=True)
     role = serializers.CharField(source="user.role", read_only=True)
 
+    # annotations של orgs.views.with_directory_stats (None כשאין, למשל אחרי create)
+    upcoming_events_count = serializers.SerializerMethodField()
+    volunteers_count = serializers.SerializerMethodField()
+    active_campaigns_count = serializers.SerializerMethodField()
+
     class Meta:
         model = OrganizationProfile
         fields = [
@@ -17,4 +24,22 @@ class OrganizationProfileSerializer(serializers.ModelSerializer):
             "website",
             "email",
             "role",
+            "upcoming_events_count",
+            "volunteers_count",
+            "active_campaigns_count",
         ]
+        # עמודות ל-.only() (config/sparse_fields.py)
+        sparse_sources = {
+            "user_id": ["user"],
+            "email": ["user__email"],
+            "role": ["user__role"],
+        }
+
+    def get_upcoming_events_count(self, obj):
+        return getattr(obj, "upcoming_events_count", None)
+
+    def get_volunteers_count(self, obj):
+        return getattr(obj, "volunteers_count", None)
+
+    def get_active_campaigns_count(self, obj):
+        return getattr(obj, "active_campaigns_count", None)
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config import response_cache
+from .cache import DIRECTORY_NAMESPACE, org_namespace
+from .models import OrganizationProfile
+
+
+# ======================
+# invalidation של תשובות ציבוריות (config/response_cache.py)
+# ======================
+@receiver([post_save, post_delete], sender=OrganizationProfile)
+def invalidate_org_responses(sender, instance, **kwargs):
+    response_cache.invalidate(DIRECTORY_NAMESPACE, org_namespace(instance.pk))
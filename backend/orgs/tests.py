@@ -1,3 +1,214 @@
-from django.test import TestCase
+from datetime import time, timedelta
 
-# Create your tests here.
+import threading
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User
+from config import response_cache
+from donations.models import DonationCampaign
+from events.models import Event, EventSignup
+from .models import OrganizationProfile
+
+
+class OrganizationDirectoryTests(TestCase):
+    url = "/api/organizations/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.orgs = []
+        for i in range(12):
+            user = User.objects.create(email=f"org{i}@example.com", role="ORG")
+            OrganizationProfile.objects.create(user=user, org_name=f"עמותה {i:02d}")
+            cls.orgs.append(user)
+        cls.volunteers = User.objects.bulk_create(
+            [User(email=f"vol{i}@example.com", role="VOLUNTEER") for i in range(3)]
+        )
+
+        org = cls.orgs[0]
+        today = timezone.localdate()
+        past = Event.objects.create(
+            organization=org, title="עבר", date=today - timedelta(days=3), time=time(10), location="חיפה"
+        )
+        upcoming = [
+            Event.objects.create(
+                organization=org, title=f"אירוע {i}", date=today + timedelta(days=i), time=time(10), location="חיפה"
+            )
+            for i in range(2)
+        ]
+        for event in (past, *upcoming):
+            for volunteer in cls.volunteers[:2]:
+                EventSignup.objects.create(event=event, volunteer=volunteer)
+        EventSignup.objects.create(
+            event=upcoming[0], volunteer=cls.volunteers[2], status=EventSignup.Status.WAITLISTED
+        )
+        DonationCampaign.objects.create(organization=org, title="פעיל")
+        DonationCampaign.objects.create(organization=org, title="סגור", is_active=False)
+
+    def setUp(self):
+        self.client = APIClient()
+        caches[response_cache.CACHE_ALIAS].clear()
+
+    def test_list_is_one_query_with_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 12)
+        first = response.data[0]
+        self.assertEqual(first["user_id"], self.orgs[0].pk)
+        self.assertEqual(first["email"], "org0@example.com")
+        self.assertEqual(first["upcoming_events_count"], 2)
+        self.assertEqual(first["volunteers_count"], 2)
+        self.assertEqual(first["active_campaigns_count"], 1)
+        self.assertEqual(response.data[1]["upcoming_events_count"], 0)
+
+    def test_sparse_fields_skip_unrequested_stats(self):
+        with self.assertNumQueries(1) as ctx:
+            response = self.client.get(self.url, {"fields": "org_name,upcoming_events_count"})
+
+        self.assertEqual(set(response.data[0]), {"id", "org_name", "upcoming_events_count"})
+        self.assertEqual(response.data[0]["upcoming_events_count"], 2)
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertNotIn("donations_donationcampaign", sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_name_search(self):
+        response = self.client.get(self.url, {"q": "11"})
+        self.assertEqual([o["org_name"] for o in response.data], ["עמותה 11"])
+
+    def test_cursor_pages(self):
+        names = []
+        response = self.client.get(self.url, {"page_size": 5})
+        while True:
+            names += [o["org_name"] for o in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(names, [f"עמותה {i:02d}" for i in range(12)])
+
+    def test_page_in_bounded_queries(self):
+        profile = self.orgs[0].org_profile
+
+        with self.assertNumQueries(4):
+            response = self.client.get(f"{self.url}{profile.pk}/page/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("public", response["Cache-Control"])
+        data = response.data
+        self.assertEqual(data["profile"]["org_name"], "עמותה 00")
+        self.assertEqual(
+            (data["stats"]["upcoming_events"], data["stats"]["volunteers"], data["stats"]["active_campaigns"]),
+            (2, 2, 1),
+        )
+        self.assertEqual([e["title"] for e in data["upcoming_events"]], ["אירוע 0", "אירוע 1"])
+        self.assertEqual([e["title"] for e in data["history"]], ["עבר"])
+        self.assertEqual([c["title"] for c in data["campaigns"]], ["פעיל"])
+
+    def test_page_limits(self):
+        profile = self.orgs[0].org_profile
+        response = self.client.get(f"{self.url}{profile.pk}/page/", {"events": 1, "history": 0})
+        self.assertEqual(len(response.data["upcoming_events"]), 1)
+        self.assertEqual(response.data["history"], [])
+
+
+class ResponseCacheTests(TestCase):
+    url = "/api/organizations/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = User.objects.create(email="org@example.com", role="ORG")
+        cls.profile = OrganizationProfile.objects.create(user=cls.org, org_name="עמותה")
+
+    def setUp(self):
+        self.client = APIClient()
+        caches[response_cache.CACHE_ALIAS].clear()
+        response_cache.reset_stats()
+
+    def test_second_anonymous_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(response_cache.stats()["orgs"], {"hit": 1, "miss": 1})
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, {"q": "x"})["X-Cache"], "MISS")
+
+    def test_save_invalidates_after_commit(self):
+        self.client.get(self.url)
+        self.client.get(f"{self.url}{self.profile.pk}/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            OrganizationProfile.objects.filter(pk=self.profile.pk).first().save()
+
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(f"{self.url}{self.profile.pk}/")["X-Cache"], "MISS")
+
+    def test_related_event_invalidates_org_page(self):
+        page = f"{self.url}{self.profile.pk}/page/"
+        self.client.get(page)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                organization=self.org, title="חדש", date=timezone.localdate(), time=time(10), location="חיפה"
+            )
+
+        response = self.client.get(page)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["stats"]["upcoming_events"], 1)
+
+    def test_authenticated_requests_bypass_the_cache(self):
+        self.client.force_authenticate(self.org)
+        self.client.get(self.url)
+        self.assertFalse(self.client.get(self.url).has_header("X-Cache"))
+
+    def test_concurrent_miss_computes_once(self):
+        calls = []
+        started = threading.Event()
+        request = Request(APIRequestFactory().get(self.url))
+
+        def slow():
+            calls.append(1)
+            started.set()
+            threading.Event().wait(0.2)
+            return Response({"ok": True})
+
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.append(response_cache.cached_response(request, ["orgs"], slow))
+        )
+        worker.start()
+        started.wait(1)
+        waiter = response_cache.cached_response(request, ["orgs"], slow)
+        worker.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(waiter["X-Cache"], "HIT")
+        self.assertEqual(waiter.data, {"ok": True})
+
+    @override_settings(CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "responses": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "lru-test",
+            "OPTIONS": {"MAX_ENTRIES": 5, "CULL_FREQUENCY": 5},
+        },
+    })
+    def test_local_cache_is_a_bounded_lru(self):
+        # גרסת "orgs" + זמן השינוי שלה + 3 רשומות ממלאות את ה-cache
+        for q in ("a", "b", "c"):
+            self.client.get(self.url, {"q": q})
+        self.client.get(self.url, {"q": "a"})   # a - הכי חדש בשימוש
+        self.client.get(self.url, {"q": "d"})   # דוחף את b החוצה
+
+        self.assertEqual(self.client.get(self.url, {"q": "a"})["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(self.url, {"q": "b"})["X-Cache"], "MISS")
@@ -1,24 +1,129 @@
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from config.response_cache import ResponseCacheMixin
+from config.sparse_fields import SparseQuerysetMixin
+from donations.models import DonationCampaign
+from events.models import Event, EventSignup
+from .cache import DIRECTORY_NAMESPACE, org_namespace
 from .models import OrganizationProfile
+from .page import CAMPAIGNS_LIMIT, HISTORY_LIMIT, UPCOMING_LIMIT, org_page_payload, parse_limit
 from .serializers import OrganizationProfileSerializer
 
-class OrganizationProfileViewSet(viewsets.ModelViewSet):
+
+def _count(qs, group_by, counted="pk", distinct=False):
+    """
+    COUNT כ-subquery מתואם לכל עמותה (0 כשאין שורות).
+    """
+    return Coalesce(
+        Subquery(
+            qs.order_by()
+            .values(group_by)
+            .annotate(n=Count(counted, distinct=distinct))
+            .values("n")[:1],
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def with_directory_stats(qs, fields=None):
+    """
+    אירועים קרובים / מתנדבים (שונים, מאושרים) / קמפיינים פעילים - באותה שאילתה
+    של הרשימה, על האינדקסים (organization, date) ו-organization.
+    fields: רק ה-annotations שבתשובה (sparse fieldsets); None = כולן.
+    """
+    org = OuterRef("user_id")
+    stats = dict(
+        upcoming_events_count=_count(
+            Event.objects.filter(organization=org, date__gte=timezone.localdate()),
+            "organization",
+        ),
+        volunteers_count=_count(
+            EventSignup.objects.filter(event__organization=org, status=EventSignup.Status.CONFIRMED),
+            "event__organization",
+            counted="volunteer",
+            distinct=True,
+        ),
+        active_campaigns_count=_count(
+            DonationCampaign.objects.filter(organization=org, is_active=True),
+            "organization",
+        ),
+    )
+    return qs.annotate(**{name: expr for name, expr in stats.items() if fields is None or name in fields})
+
+
+class OrganizationProfileViewSet(ResponseCacheMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """
-    GET  /api/organizations/           -> כל העמותות (פומבי)
+    GET  /api/organizations/           -> כל העמותות (פומבי), ?q= חיפוש בשם,
+                                          ?paginate=1 / ?cursor= לעמודים
     GET  /api/organizations/{id}/      -> עמותה ספציפית (פומבי)
+    GET  /api/organizations/{id}/page/ -> כל דף העמותה בתשובה אחת (פומבי, orgs/page.py)
     GET  /api/organizations/me/        -> פרטי העמותה המחוברת
     PATCH /api/organizations/me/       -> עדכון פרטי עמותה
+
+    שאילתה אחת לרשימה: user ב-select_related והסטטיסטיקות כ-annotations.
     """
 
-    queryset = OrganizationProfile.objects.all().order_by("org_name")
+    queryset = OrganizationProfile.objects.all().order_by("org_name", "id")
     serializer_class = OrganizationProfileSerializer
+    cursor_ordering = ("org_name", "id")
+    response_cache_actions = ("list", "retrieve", "page")
+    response_cache_shared_actions = ("page",)
+
+    def response_cache_namespaces(self):
+        if self.action == "list":
+            return [DIRECTORY_NAMESPACE]
+        return [org_namespace(self.kwargs["pk"])]
+
+    def response_depends_on_date(self, request):
+        # upcoming_events_count ברשימה / עמותה, קרובים / היסטוריה ב-/page/
+        return True
+
+    def get_queryset(self):
+        sparse = self.action in ("list", "retrieve")
+        fields = self.sparse_field_names() if sparse else None
+        qs = with_directory_stats(
+            OrganizationProfile.objects.select_related("user").order_by("org_name", "id"),
+            fields,
+        )
+        if self.action == "list":
+            q = (self.request.query_params.get("q") or "").strip()
+            if q:
+                qs = qs.filter(org_name__icontains=q)
+        if self.action == "page":
+            qs = qs.select_related("user__org_stats", "user__donation_stats")
+        # ?fields= / ?omit= (config/sparse_fields.py)
+        return self.sparse_queryset(qs) if sparse else qs
+
+    @action(detail=True, methods=["get"], url_path="page")
+    def page(self, request, pk=None):
+        """
+        ?events= / ?history= / ?campaigns= - כמה שורות בכל חלק (עד 20)
+        """
+        return self.cached(request, lambda: self.page_response(request))
+
+    def page_response(self, request):
+        params = request.query_params
+        payload = org_page_payload(
+            self.get_object(),
+            upcoming=parse_limit(params, "events", UPCOMING_LIMIT),
+            history=parse_limit(params, "history", HISTORY_LIMIT),
+            campaigns=parse_limit(params, "campaigns", CAMPAIGNS_LIMIT),
+        )
+        response = Response(payload)
+        # זהה לכל המשתמשים -> אפשר לשמור ב-cache משותף לזמן קצר
+        patch_cache_control(response, public=True, max_age=60)
+        return response
 
     def get_permissions(self):
         # צפייה פומבית
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "page"]:
             return [permissions.AllowAny()]
 
         # כל השאר – רק מחוברים
@@ -47,10 +152,10 @@ class OrganizationProfileViewSet(viewsets.ModelViewSet):
         )
 
         if request.method == "GET":
-            return Response(self.get_serializer(profile).data)
+            return Response(self.get_serializer(self.get_queryset().get(pk=profile.pk)).data)
 
         # PATCH
         serializer = self.get_serializer(profile, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(self.get_serializer(self.get_queryset().get(pk=profile.pk)).data)
\ No newline at end of file
@@ -1,10 +1,10 @@
 
 const API_BASE = import.meta.env.VITE_API_BASE_URL || "";
 
-export async function apiFetch(path, { method = "GET", body, token } = {}) {
+export async function apiFetch(path, { method = "GET", body, token, headers: extraHeaders } = {}) {
   const accessToken = token || localStorage.getItem("accessToken");
 
-  const headers = { "Content-Type": "application/json" };
+  const headers = { "Content-Type": "application/json", ...extraHeaders };
   if (accessToken) headers.Authorization = `Bearer ${accessToken}`;
 
   const url = `${API_BASE}${path}`;
@@ -42,3 +42,35 @@ export async function apiFetch(path, { method = "GET", body, token } = {}) {
   return data;
 }
 
+
+// הורדת קובץ (למשל CSV מ-/api/events/export/) עם ה-token, בלי לפענח JSON
+export async function apiDownload(path, filename, { token } = {}) {
+  const accessToken = token || localStorage.getItem("accessToken");
+
+  const headers = {};
+  if (accessToken) headers.Authorization = `Bearer ${accessToken}`;
+
+  const url = `${API_BASE}${path}`;
+  const res = await fetch(url, { headers });
+
+  if (res.status === 401) {
+    localStorage.removeItem("accessToken");
+    localStorage.removeItem("refreshToken");
+    throw new Error("לא מחובר/ת (401). התחברי מחדש.");
+  }
+
+  if (!res.ok) {
+    throw new Error(`HTTP ${res.status} | GET ${url}`);
+  }
+
+  const blob = await res.blob();
+  const href = URL.createObjectURL(blob);
+
+  const a = document.createElement("a");
+  a.href = href;
+  a.download = filename;
+  document.body.appendChild(a);
+  a.click();
+  a.remove();
+  URL.revokeObjectURL(href);
+}
@@ -117,21 +117,19 @@ export default function useDashboardData() {
       setErr("");
 
       try {
-        const me = await apiFetch("/api/me/");
+        // ✅ בקשה אחת: me + stats + upcoming + history + donations לפי תפקיד
+        const bundle = await apiFetch("/api/dashboard/");
         if (!alive) return;
 
+        const me = bundle?.me || {};
         const role = getRole(me);
         const isVolunteer = role === "VOLUNTEER";
         const isOrg = role === "ORG" || role === "ADMIN";
 
-        const [evUpRaw, evHistRaw, st, donsRaw] = await Promise.all([
-          apiFetch("/api/events/?status=upcoming"),
-          apiFetch("/api/events/?status=history"),
-          isVolunteer ? apiFetch("/api/dashboard/stats/") : Promise.resolve(null),
-          isVolunteer || isOrg ? apiFetch("/api/donations/") : Promise.resolve([]),
-        ]);
-
-        if (!alive) return;
+        const evUpRaw = bundle?.upcoming || [];
+        const evHistRaw = bundle?.history || [];
+        const st = isVolunteer ? bundle?.stats || null : null;
+        const donsRaw = isVolunteer || isOrg ? bundle?.donations || [] : [];
 
         setProfile(me);
 
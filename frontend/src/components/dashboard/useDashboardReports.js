@@ -1,7 +1,7 @@
 // src/frontend/src/hooks/useDashboardReports.js
 import { useState } from "react";
-import { apiFetch } from "../../api/client";
-import { downloadCsv, runWithConcurrency, todayIsoLocal } from "./dashboardUtils";
+import { apiDownload, apiFetch } from "../../api/client";
+import { downloadCsv, todayIsoLocal } from "./dashboardUtils";
 
 // helpers מקומיים לדוח
 function asList(payload) {
@@ -10,21 +10,6 @@ function asList(payload) {
   return [];
 }
 
-function mapActivity(a) {
-  return {
-    id: a.id ?? a.pk,
-    title: a.title ?? a.name ?? a.activity_name ?? "ללא כותרת",
-    org_name: a.org_name ?? a.organization_name ?? a.org?.name ?? "",
-    location: a.location ?? a.city ?? a.address ?? "",
-    category: a.category ?? a.category_name ?? a.type ?? "",
-    date: a.date ?? a.start_date ?? a.starts_at ?? "",
-    time: a.time ?? a.start_time ?? "",
-    needed_volunteers: a.needed_volunteers ?? a.needed ?? a.capacity ?? "",
-    signups_count: a.signups_count ?? a.signup_count ?? "",
-    my_rating: a.my_rating ?? a.rating ?? null,
-  };
-}
-
 function mapDonation(d) {
   return {
     id: d.id ?? d.pk,
@@ -83,8 +68,9 @@ export default function useDashboardReports() {
     setReportMsg("");
 
     try {
-      const raw = await apiFetch("/api/events/?status=history");
-      const list = asList(raw).map(mapActivity);
+      // ✅ שורה לכל הרשמה (כולל תפקיד/שעות/דירוג) בבקשה אחת
+      const raw = await apiFetch("/api/me/activity/?status=history");
+      const list = asList(raw);
 
       const headers = [
         "event_id",
@@ -93,18 +79,23 @@ export default function useDashboardReports() {
         "event_location",
         "event_category",
         "organization",
+        "role",
+        "hours",
+        "task_desc",
         "my_rating",
       ];
 
-      const rows = list.map((e) => ({
-        event_id: e.id,
-        event_title: e.title,
-        event_date: e.date,
-        event_location: e.location,
-        event_category: e.category,
-        organization: e.org_name || "",
-        my_rating:
-          e.my_rating !== null && e.my_rating !== undefined && e.my_rating !== "" ? e.my_rating : "",
+      const rows = list.map((a) => ({
+        event_id: a.event_id,
+        event_title: a.title,
+        event_date: a.date,
+        event_location: a.location,
+        event_category: a.category,
+        organization: a.org_name || "",
+        role: a.role || "",
+        hours: a.duration_hours ?? a.hours ?? "",
+        task_desc: a.task_desc || "",
+        my_rating: a.rating !== null && a.rating !== undefined ? a.rating : "",
       }));
 
       downloadCsv(`my_events_history_${todayIsoLocal()}.csv`, headers, rows);
@@ -161,73 +152,9 @@ export default function useDashboardReports() {
     setReportMsg("");
 
     try {
-      const evRaw = await apiFetch("/api/events/");
-      const events = asList(evRaw).map(mapActivity);
-
-      const signupsByEvent = await runWithConcurrency(events, 4, async (ev) => {
-        try {
-          const s = await apiFetch(`/api/events/${ev.id}/signups/`);
-          return { eventId: ev.id, signups: asList(s) };
-        } catch {
-          return { eventId: ev.id, signups: [] };
-        }
-      });
-
-      const byId = new Map(signupsByEvent.map((x) => [x.eventId, x.signups]));
-
-      const headers = [
-        "event_id",
-        "event_title",
-        "event_date",
-        "event_time",
-        "event_location",
-        "event_category",
-        "needed_volunteers",
-        "signups_count",
-        "volunteer_name",
-        "signup_created_at",
-      ];
-
-      const rows = [];
-      for (const ev of events) {
-        const signups = byId.get(ev.id) || [];
-        const signupCount =
-          ev.signups_count !== "" && ev.signups_count !== null && ev.signups_count !== undefined
-            ? ev.signups_count
-            : signups.length;
-
-        if (!signups.length) {
-          rows.push({
-            event_id: ev.id,
-            event_title: ev.title,
-            event_date: ev.date,
-            event_time: ev.time,
-            event_location: ev.location,
-            event_category: ev.category,
-            needed_volunteers: ev.needed_volunteers,
-            signups_count: signupCount,
-            volunteer_name: "",
-            signup_created_at: "",
-          });
-        } else {
-          for (const s of signups) {
-            rows.push({
-              event_id: ev.id,
-              event_title: ev.title,
-              event_date: ev.date,
-              event_time: ev.time,
-              event_location: ev.location,
-              event_category: ev.category,
-              needed_volunteers: ev.needed_volunteers,
-              signups_count: signupCount,
-              volunteer_name: s.volunteer_name ?? s.name ?? "",
-              signup_created_at: s.created_at ?? "",
-            });
-          }
-        }
-      }
-
-      downloadCsv(`events_and_signups_report_${todayIsoLocal()}.csv`, headers, rows);
+      // ✅ השרת מזרים את כל האירועים × נרשמים כ-CSV בבקשה אחת
+      const filename = `events_and_signups_report_${todayIsoLocal()}.csv`;
+      await apiDownload("/api/events/export/", filename);
       setReportMsg("✅ דוח אירועים + נרשמים ירד בהצלחה");
     } catch (e) {
       setReportMsg(e?.message || "שגיאה בייצוא דוח אירועים");
@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo, useState } from "react";
+import React, { useEffect, useMemo, useRef, useState } from "react";
 import { Link, useNavigate, useParams } from "react-router-dom";
 import { apiFetch } from "../api/client";
 
@@ -13,12 +13,6 @@ import {
 
 const stripePromise = loadStripe(import.meta.env.VITE_STRIPE_PUBLISHABLE_KEY);
 
-function asList(payload) {
-  if (Array.isArray(payload)) return payload;
-  if (payload?.results && Array.isArray(payload.results)) return payload.results;
-  return [];
-}
-
 function asNumber(v) {
   const n = Number(String(v ?? "").replace(/[^\d.]/g, ""));
   return Number.isFinite(n) ? n : 0;
@@ -125,6 +119,10 @@ export default function Donate() {
   const [clientSecret, setClientSecret] = useState("");
   const [createdDonationId, setCreatedDonationId] = useState(null);
 
+  // Idempotency-Key ליצירת התרומה: אותו מפתח לאותם פרטים (לחיצה כפולה / retry
+  // לא יוצרים תרומה נוספת); פרטים אחרים -> מפתח חדש
+  const donationKeyRef = useRef({ payload: "", key: "" });
+
   // סכומים
   const quickAmounts = useMemo(() => [50, 100, 250, 500], []);
   const [amount, setAmount] = useState(0);
@@ -159,17 +157,7 @@ export default function Donate() {
         setOrg(data);
       } catch (e) {
         if (!alive) return;
-        try {
-          const list = await apiFetch("/api/organizations/");
-          const items = asList(list);
-          const found = items.find(
-            (x) => String(x.id ?? x.pk ?? "") === String(orgId)
-          );
-          if (!found) throw e;
-          setOrg(found);
-        } catch (e2) {
-          setErr(e2?.message || e?.message || "שגיאה בטעינת עמותה");
-        }
+        setErr(e?.message || "שגיאה בטעינת עמותה");
       } finally {
         if (alive) setLoading(false);
       }
@@ -200,6 +188,7 @@ export default function Donate() {
     setOkMsg("");
     setClientSecret("");
     setCreatedDonationId(null);
+    donationKeyRef.current = { payload: "", key: "" };
 
     setAmount(0);
     setAmountInput("");
@@ -246,9 +235,15 @@ export default function Donate() {
         donor_email: donorEmail.trim(),
       };
 
+      const payloadJson = JSON.stringify(payload);
+      if (donationKeyRef.current.payload !== payloadJson) {
+        donationKeyRef.current = { payload: payloadJson, key: crypto.randomUUID() };
+      }
+
       const created = await apiFetch("/api/donations/", {
         method: "POST",
         body: payload,
+        headers: { "Idempotency-Key": donationKeyRef.current.key },
       });
 
       console.log("Created donation:", created);
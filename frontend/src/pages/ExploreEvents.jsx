@@ -1,11 +1,16 @@
-import React, { useEffect, useMemo, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { Link } from "react-router-dom";
 import "../styles/explore-events.css"; // ✅ CSS ייעודי למסך הזה
 
 const API_BASE = import.meta.env.VITE_API_BASE_URL || "";
 
+// גודל עמוד בקטלוג (keyset pagination בשרת: ?paginate=1 + קישור next)
+const PAGE_SIZE = 24;
+
 async function fetchJson(path, { token, signal, method = "GET", body } = {}) {
-  const res = await fetch(`${API_BASE}${path}`, {
+  // קישור next של ה-pagination מגיע כ-URL מלא
+  const url = /^https?:\/\//.test(path) ? path : `${API_BASE}${path}`;
+  const res = await fetch(url, {
     method,
     headers: {
       "Content-Type": "application/json",
@@ -67,19 +72,88 @@ export default function ExploreEvents() {
   const [category, setCategory] = useState("כל הקטגוריות");
   const [location, setLocation] = useState("מיקום");
   const [q, setQ] = useState("");
+  // החיפוש נשלח לשרת רק אחרי הפסקה קצרה בהקלדה
+  const [debouncedQ, setDebouncedQ] = useState("");
 
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [err, setErr] = useState("");
   const [events, setEvents] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [options, setOptions] = useState({ categories: [], locations: [] });
+  // מתחלף בכל טעינה מחדש, כך שעמוד "עוד" של סינון קודם לא מתווסף לרשימה
+  const listGeneration = useRef(0);
   const [signupBusyId, setSignupBusyId] = useState(null);
   const [toast, setToast] = useState("");
 
-  // ✅ כאן נשמור את כל ה-event ids שהמשתמש רשום אליהם (נטען לפני כל האירועים)
+  // ✅ כאן נשמור את כל ה-event ids שהמשתמש רשום אליהם
   const [signedEventIds, setSignedEventIds] = useState(() => new Set());
 
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedQ(q.trim()), 300);
+    return () => clearTimeout(timer);
+  }, [q]);
+
+  // ✅ ה-event ids שהמשתמש רשום אליהם (upcoming + history) - כדי שהכפתור יהיה נכון
   useEffect(() => {
     const controller = new AbortController();
 
+    async function loadMine() {
+      if (!API_BASE || !token) {
+        setSignedEventIds(new Set());
+        return;
+      }
+      try {
+        const mine = await fetchJson("/api/me/activity/", {
+          token,
+          signal: controller.signal,
+        });
+
+        const ids = new Set(
+          asList(mine)
+            .map((a) => a?.event_id)
+            .filter((id) => id !== null && id !== undefined)
+        );
+
+        setSignedEventIds(ids);
+      } catch (e) {
+        if (e?.name !== "AbortError") setSignedEventIds(new Set());
+      }
+    }
+
+    loadMine();
+    return () => controller.abort();
+  }, [token]);
+
+  // ✅ ערכי הסינונים (קטגוריות / מיקומים) מהשרת - לא מהאירועים שנטענו
+  useEffect(() => {
+    const controller = new AbortController();
+
+    async function loadOptions() {
+      if (!API_BASE) return;
+      try {
+        const data = await fetchJson(`/api/events/catalog-options/?date_from=${todayIsoLocal()}`, {
+          token,
+          signal: controller.signal,
+        });
+        setOptions({
+          categories: Array.isArray(data?.categories) ? data.categories : [],
+          locations: Array.isArray(data?.locations) ? data.locations : [],
+        });
+      } catch {
+        // בלי הרשימות הסינונים פשוט ריקים
+      }
+    }
+
+    loadOptions();
+    return () => controller.abort();
+  }, [token]);
+
+  // ✅ עמוד ראשון של אירועים שלא קרו עדיין (date >= today), מסוננים וממוינים בשרת
+  useEffect(() => {
+    const controller = new AbortController();
+    listGeneration.current += 1;
+
     async function load() {
       setLoading(true);
       setErr("");
@@ -88,104 +162,55 @@ export default function ExploreEvents() {
       try {
         if (!API_BASE) {
           setEvents([]);
-          setSignedEventIds(new Set());
+          setNextUrl(null);
           return;
         }
 
-        // ✅ 1) קודם נביא את "האירועים שלי" (upcoming + history) כדי שהכפתור יהיה נכון מיד
-        if (token) {
-          try {
-            const [up, hist] = await Promise.all([
-              fetchJson("/api/events/?status=upcoming", {
-                token,
-                signal: controller.signal,
-              }),
-              fetchJson("/api/events/?status=history", {
-                token,
-                signal: controller.signal,
-              }),
-            ]);
-
-            const myUpcoming = asList(up);
-            const myHistory = asList(hist);
-
-            const ids = new Set(
-              [...myUpcoming, ...myHistory]
-                .map((e) => e?.id)
-                .filter((id) => id !== null && id !== undefined)
-            );
-
-            setSignedEventIds(ids);
-          } catch {
-            setSignedEventIds(new Set());
-          }
-        } else {
-          setSignedEventIds(new Set());
-        }
+        const params = new URLSearchParams({
+          date_from: todayIsoLocal(),
+          ordering: "date",
+          paginate: "1",
+          page_size: String(PAGE_SIZE),
+        });
+        if (category !== "כל הקטגוריות") params.set("category", category);
+        if (location !== "מיקום") params.set("location", location);
+        if (debouncedQ) params.set("q", debouncedQ);
 
-        // ✅ 2) עכשיו נטען את כל האירועים הציבוריים
-        const data = await fetchJson("/api/events/", {
+        const data = await fetchJson(`/api/events/?${params}`, {
           token,
           signal: controller.signal,
         });
 
-        const items = asList(data);
-
-        // ✅ מסנן: רק אירועים שלא קרו עדיין (date >= today)
-        const today = todayIsoLocal();
-        const upcomingOnly = items
-          .filter((e) => (e?.date || "") >= today)
-          .sort((a, b) => String(a?.date || "").localeCompare(String(b?.date || "")));
-
-        setEvents(upcomingOnly);
+        setEvents(asList(data));
+        setNextUrl(data?.next || null);
       } catch (e) {
         if (e?.name !== "AbortError") setErr(e?.message || "שגיאה בטעינת אירועים");
       } finally {
-        setLoading(false);
+        if (!controller.signal.aborted) setLoading(false);
       }
     }
 
     load();
     return () => controller.abort();
-  }, [token]);
+  }, [token, category, location, debouncedQ]);
+
+  const loadMore = async () => {
+    if (!nextUrl || loadingMore) return;
 
-  // ✅ מסננים/חיפוש על רשימת upcoming בלבד שכבר נשמרה ב-events
-  const filtered = useMemo(() => {
-    const query = q.trim().toLowerCase();
-
-    return events.filter((e) => {
-      const catOk = category === "כל הקטגוריות" || e.category === category;
-      const locOk = location === "מיקום" || e.location === location;
-
-      const orgName =
-        e?.org_name ||
-        e?.organization_name ||
-        e?.organization?.org_profile?.org_name ||
-        e?.organization?.email ||
-        "";
-
-      const qOk =
-        !query ||
-        (e.title || "").toLowerCase().includes(query) ||
-        String(orgName).toLowerCase().includes(query) ||
-        (e.category || "").toLowerCase().includes(query) ||
-        (e.location || "").toLowerCase().includes(query);
-
-      return catOk && locOk && qOk;
-    });
-  }, [events, category, location, q]);
-
-  const categoriesFromData = useMemo(() => {
-    const set = new Set();
-    events.forEach((e) => e?.category && set.add(e.category));
-    return Array.from(set).sort((a, b) => String(a).localeCompare(String(b), "he"));
-  }, [events]);
-
-  const locationsFromData = useMemo(() => {
-    const set = new Set();
-    events.forEach((e) => e?.location && set.add(e.location));
-    return Array.from(set).sort((a, b) => String(a).localeCompare(String(b), "he"));
-  }, [events]);
+    const generation = listGeneration.current;
+    setLoadingMore(true);
+    setErr("");
+    try {
+      const data = await fetchJson(nextUrl, { token });
+      if (generation !== listGeneration.current) return;
+      setEvents((prev) => [...prev, ...asList(data)]);
+      setNextUrl(data?.next || null);
+    } catch (e) {
+      setErr(e?.message || "שגיאה בטעינת אירועים");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   const clearFilters = () => {
     setCategory("כל הקטגוריות");
@@ -275,7 +300,7 @@ export default function ExploreEvents() {
           <div className="filters exploreFilters">
             <select className="select" value={category} onChange={(e) => setCategory(e.target.value)}>
               <option value="כל הקטגוריות">כל הקטגוריות</option>
-              {categoriesFromData.map((c) => (
+              {options.categories.map((c) => (
                 <option key={c} value={c}>
                   {c}
                 </option>
@@ -284,7 +309,7 @@ export default function ExploreEvents() {
 
             <select className="select" value={location} onChange={(e) => setLocation(e.target.value)}>
               <option value="מיקום">מיקום</option>
-              {locationsFromData.map((l) => (
+              {options.locations.map((l) => (
                 <option key={l} value={l}>
                   {l}
                 </option>
@@ -312,7 +337,7 @@ export default function ExploreEvents() {
               <br />
               <span style={{ fontWeight: 700 }}>בדקי VITE_API_BASE_URL בקובץ .env</span>
             </div>
-          ) : filtered.length === 0 ? (
+          ) : events.length === 0 ? (
             <div className="searchEmpty">
               <div className="searchIcon">🔎</div>
               לא נמצאו אירועים
@@ -326,7 +351,7 @@ export default function ExploreEvents() {
             </div>
           ) : (
             <div className="grid exploreGrid">
-              {filtered.map((e) => {
+              {events.map((e) => {
                 const orgName =
                   e?.org_name ||
                   e?.organization_name ||
@@ -395,6 +420,14 @@ export default function ExploreEvents() {
               })}
             </div>
           )}
+
+          {!loading && nextUrl ? (
+            <div className="exploreMore">
+              <button className="btnSmall exploreBtn" type="button" disabled={loadingMore} onClick={loadMore}>
+                {loadingMore ? "טוען..." : "עוד אירועים"}
+              </button>
+            </div>
+          ) : null}
         </div>
       </div>
     </main>
@@ -59,12 +59,6 @@ function formatDateIL(dateStr) {
   }
 }
 
-function asList(payload) {
-  if (Array.isArray(payload)) return payload;
-  if (payload?.results && Array.isArray(payload.results)) return payload.results;
-  return [];
-}
-
 export default function OrganizationDetails() {
   const { id } = useParams();
   const navigate = useNavigate();
@@ -76,10 +70,10 @@ export default function OrganizationDetails() {
   const [err, setErr] = useState("");
   const [org, setOrg] = useState(null);
 
-  // ✅ אירועים של העמותה
-  const [eventsLoading, setEventsLoading] = useState(false);
-  const [eventsErr, setEventsErr] = useState("");
+  // ✅ אירועים קרובים, קמפיינים וסטטיסטיקות - מגיעים יחד עם העמותה (/page/)
   const [events, setEvents] = useState([]);
+  const [campaigns, setCampaigns] = useState([]);
+  const [stats, setStats] = useState(null);
 
   // דמו (אם אין API_BASE)
   const demoOrg = useMemo(
@@ -96,6 +90,28 @@ export default function OrganizationDetails() {
     [id]
   );
 
+  const demoEvents = useMemo(
+    () => [
+      {
+        id: 101,
+        title: "חלוקת סלי מזון",
+        date: "2026-02-01",
+        time: "10:00",
+        location: "תל אביב",
+        needed_volunteers: 20,
+      },
+      {
+        id: 102,
+        title: "איסוף תרומות ציוד",
+        date: "2026-02-10",
+        time: "17:30",
+        location: "רמת גן",
+        needed_volunteers: 12,
+      },
+    ],
+    []
+  );
+
   useEffect(() => {
     const controller = new AbortController();
 
@@ -108,34 +124,22 @@ export default function OrganizationDetails() {
 
         if (!API_BASE) {
           setOrg(demoOrg);
+          setEvents(demoEvents);
           return;
         }
 
-        // ✅ ציבורי: אין חובה בטוקן כדי לצפות בעמותה
-        const data = await fetchJson(`/api/organizations/${id}/`, {
+        // ✅ ציבורי: כל הדף (פרופיל, אירועים קרובים, קמפיינים, סטטיסטיקות) בבקשה אחת
+        const data = await fetchJson(`/api/organizations/${id}/page/`, {
           token: token || undefined,
           signal: controller.signal,
         });
 
-        setOrg(data);
+        setOrg(data?.profile || null);
+        setEvents(data?.upcoming_events || []);
+        setCampaigns(data?.campaigns || []);
+        setStats(data?.stats || null);
       } catch (e) {
-        // fallback: אם אין endpoint לפרטי עמותה, נביא רשימה ונמצא לפי id
-        try {
-          if (!API_BASE) throw e;
-
-          const list = await fetchJson(`/api/organizations/`, {
-            token: token || undefined,
-            signal: controller.signal,
-          });
-
-          const items = asList(list);
-          const found = items.find((x) => String(x.id ?? x.pk ?? "") === String(id));
-          if (!found) throw e;
-
-          setOrg(found);
-        } catch (e2) {
-          if (e2?.name !== "AbortError") setErr(e2?.message || e?.message || "שגיאה בטעינת עמותה");
-        }
+        if (e?.name !== "AbortError") setErr(e?.message || "שגיאה בטעינת עמותה");
       } finally {
         setLoading(false);
       }
@@ -143,7 +147,7 @@ export default function OrganizationDetails() {
 
     load();
     return () => controller.abort();
-  }, [demoOrg, id, token]);
+  }, [demoOrg, demoEvents, id, token]);
 
   const normalized = useMemo(() => {
     if (!org) return null;
@@ -159,119 +163,6 @@ export default function OrganizationDetails() {
     return { id: orgId, name, description, phone, website, email, city };
   }, [org, id]);
 
-  // ✅ טעינת אירועים קרובים של העמותה
-  useEffect(() => {
-    const controller = new AbortController();
-
-    async function loadOrgEvents() {
-      setEventsLoading(true);
-      setEventsErr("");
-
-      try {
-        if (!normalized?.id) return;
-
-        // דמו
-        if (!API_BASE) {
-          setEvents([
-            {
-              id: 101,
-              title: "חלוקת סלי מזון",
-              date: "2026-02-01",
-              time: "10:00",
-              location: "תל אביב",
-              city: "תל אביב",
-              needed_volunteers: 20,
-              org_name: normalized.name,
-            },
-            {
-              id: 102,
-              title: "איסוף תרומות ציוד",
-              date: "2026-02-10",
-              time: "17:30",
-              location: "רמת גן",
-              city: "רמת גן",
-              needed_volunteers: 12,
-              org_name: normalized.name,
-            },
-          ]);
-          return;
-        }
-
-        // אצלך בדjango כרגע אין פילטר organization מובנה לאורחים,
-        // אז ננסה כמה URL-ים נפוצים; אם אף אחד לא יעבוד נעשה fallback של list+filter בצד לקוח.
-        const todayStr = new Date().toISOString().slice(0, 10);
-
-        const tryUrls = [
-          // ✅ זה היעד הרצוי (אם תוסיפי בדjango תמיכה בפרמטר organization):
-          `/api/events/?organization=${normalized.id}&status=upcoming`,
-
-          // וריאציות נפוצות
-          `/api/events/?organization=${normalized.id}&date__gte=${todayStr}`,
-          `/api/events/?organization=${normalized.id}&upcoming=1`,
-          `/api/events/?status=upcoming&organization=${normalized.id}`,
-        ];
-
-        let payload = null;
-        let lastErr = null;
-
-        for (const url of tryUrls) {
-          try {
-            payload = await fetchJson(url, {
-              token: token || undefined,
-              signal: controller.signal,
-            });
-            lastErr = null;
-            break;
-          } catch (e) {
-            lastErr = e;
-          }
-        }
-
-        let items = payload ? asList(payload) : null;
-
-        // ✅ fallback: תביאי את כל האירועים ותסנני מקומית לפי organization=id
-        if (!items) {
-          const all = await fetchJson(`/api/events/`, {
-            token: token || undefined,
-            signal: controller.signal,
-          });
-          items = asList(all);
-
-          // אצלך באירוע כנראה organization זה user id של העמותה
-          items = items.filter((ev) => {
-          const orgProfileId = ev.org ?? ev.organization_profile ?? ev.organization_id ?? null;
-          return String(orgProfileId ?? "") === String(normalized.id);
-        });
-        }
-
-        // ✅ סינון “קרובים” + מיון + הגבלה
-        const today = new Date();
-        today.setHours(0, 0, 0, 0);
-
-        const upcoming = (items || [])
-          .filter((ev) => {
-            if (!ev?.date) return true;
-            const d = new Date(ev.date);
-            return d >= today;
-          })
-          .sort((a, b) => String(a.date || "").localeCompare(String(b.date || "")))
-          .slice(0, 6);
-
-        setEvents(upcoming);
-
-        // אם ניסינו URLs והם נכשלו, לא נציג שגיאה (כי הצלחנו fallback).
-        // אבל אם גם fallback נכשל -> נזרוק שגיאה למטה.
-      } catch (e) {
-        if (e?.name !== "AbortError") setEventsErr(e?.message || "שגיאה בטעינת אירועים");
-      } finally {
-        setEventsLoading(false);
-      }
-    }
-
-    loadOrgEvents();
-    return () => controller.abort();
-  }, [API_BASE, normalized?.id, normalized?.name, token]);
-
   const shareText = encodeURIComponent(`מצאתי עמותה ב-VolunTrack: ${normalized?.name || ""}`);
   const shareUrl = encodeURIComponent(window.location.href);
 
@@ -410,17 +301,7 @@ export default function OrganizationDetails() {
                 <div style={{ marginTop: 16 }}>
                   <div className="ed__panelTitle">אירועים קרובים</div>
 
-                  {eventsLoading ? (
-                    <div className="emptyState ed__loading" style={{ marginTop: 10 }}>
-                      <div className="ed__emoji">⏳</div>
-                      טוען אירועים...
-                    </div>
-                  ) : eventsErr ? (
-                    <div className="box boxPad ed__error" style={{ marginTop: 10 }}>
-                      <div className="ed__errorTitle">אופס 😅</div>
-                      <div className="ed__errorText">{eventsErr}</div>
-                    </div>
-                  ) : events.length === 0 ? (
+                  {events.length === 0 ? (
                     <p className="ed__desc" style={{ marginTop: 10 }}>
                       כרגע אין אירועים קרובים לעמותה הזו — אבל זה בדרך 💪
                     </p>
@@ -502,6 +383,31 @@ export default function OrganizationDetails() {
                   </div>
                 </div>
 
+                {stats ? (
+                  <div className="ed__quick" style={{ marginTop: 12 }}>
+                    <div className="ed__quickTitle">במספרים</div>
+                    <div className="ed__quickList">
+                      <div>📅 {stats.upcoming_events} אירועים קרובים</div>
+                      <div>🙋 {stats.volunteers} מתנדבים</div>
+                      <div>⏱️ {Number(stats.volunteer_hours || 0)} שעות התנדבות</div>
+                    </div>
+                  </div>
+                ) : null}
+
+                {campaigns.length > 0 ? (
+                  <div className="ed__quick" style={{ marginTop: 12 }}>
+                    <div className="ed__quickTitle">קמפיינים פעילים</div>
+                    <div className="ed__quickList">
+                      {campaigns.map((c) => (
+                        <div key={c.id}>
+                          💝 {c.title}
+                          {c.progress_percent != null ? ` • ${c.progress_percent}%` : ""}
+                        </div>
+                      ))}
+                    </div>
+                  </div>
+                ) : null}
+
                 <div className="ed__quick" style={{ marginTop: 12 }}>
                   <div className="ed__quickTitle">לא מצאת מה חיפשת?</div>
                   <div className="ed__quickList">
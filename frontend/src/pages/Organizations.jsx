@@ -9,7 +9,10 @@ async function fetchJson(path, { token, signal, method = "GET", body } = {}) {
   const headers = { "Content-Type": "application/json" };
   if (token) headers.Authorization = `Bearer ${token}`;
 
-  const res = await fetch(`${API_BASE}${path}`, {
+  // next של ה-cursor pagination מגיע כ-URL מלא
+  const url = /^https?:\/\//.test(path) ? path : `${API_BASE}${path}`;
+
+  const res = await fetch(url, {
     method,
     headers,
     body: body ? JSON.stringify(body) : undefined,
@@ -55,6 +58,8 @@ function pickDonationUrl(o) {
   );
 }
 
+const PAGE_SIZE = 24;
+
 function initials(text) {
   const s = (text || "").trim();
   if (!s) return "VT";
@@ -69,6 +74,17 @@ export default function Organizations() {
   const [loading, setLoading] = useState(true);
   const [err, setErr] = useState("");
   const [orgs, setOrgs] = useState([]);
+  const [nextUrl, setNextUrl] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // חיפוש לפי שם (בשרת, ?q=)
+  const [searchInput, setSearchInput] = useState("");
+  const [query, setQuery] = useState("");
+
+  useEffect(() => {
+    const t = setTimeout(() => setQuery(searchInput.trim()), 300);
+    return () => clearTimeout(t);
+  }, [searchInput]);
 
   // דמו (למקרה שאין API_BASE)
   const demo = useMemo(
@@ -115,13 +131,17 @@ export default function Organizations() {
           return;
         }
 
-        const data = await fetchJson("/api/organizations/", {
+        const params = new URLSearchParams({ page_size: String(PAGE_SIZE) });
+        if (query) params.set("q", query);
+
+        const data = await fetchJson(`/api/organizations/?${params}`, {
           token: token || undefined,
           signal: controller.signal,
         });
 
         const items = Array.isArray(data) ? data : data?.results || [];
         setOrgs(items);
+        setNextUrl(data?.next || null);
       } catch (e) {
         if (e?.name !== "AbortError") setErr(e?.message || "שגיאה בטעינת עמותות");
       } finally {
@@ -131,7 +151,21 @@ export default function Organizations() {
 
     load();
     return () => controller.abort();
-  }, [demo, token]);
+  }, [demo, token, query]);
+
+  async function loadMore() {
+    if (!nextUrl || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchJson(nextUrl, { token: token || undefined });
+      setOrgs((prev) => [...prev, ...(data?.results || [])]);
+      setNextUrl(data?.next || null);
+    } catch (e) {
+      setErr(e?.message || "שגיאה בטעינת עמותות");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
 
   return (
     <main className="page orgs" dir="rtl">
@@ -149,6 +183,14 @@ export default function Organizations() {
           </div>
 
           <div className="orgs__hintRow">
+            <input
+              className="orgs__search"
+              type="search"
+              placeholder="חיפוש עמותה לפי שם..."
+              value={searchInput}
+              onChange={(e) => setSearchInput(e.target.value)}
+            />
+
             <span className="orgs__hint">טיפ: כנסי לפרטי עמותה כדי לראות אירועים קרובים ולתרום בקליק.</span>
           </div>
         </header>
@@ -224,6 +266,14 @@ export default function Organizations() {
 
                   <p className="orgs__desc">{description}</p>
 
+                  {o.upcoming_events_count != null ? (
+                    <div className="orgs__meta">
+                      <span className="orgs__chip">📅 {o.upcoming_events_count} אירועים קרובים</span>
+                      <span className="orgs__chip">🙋 {o.volunteers_count} מתנדבים</span>
+                      <span className="orgs__chip">💝 {o.active_campaigns_count} קמפיינים פעילים</span>
+                    </div>
+                  ) : null}
+
                   <div className="orgs__actions">
                     {detailsTo ? (
                       <Link className="orgs__btnSmall" to={detailsTo}>
@@ -254,6 +304,14 @@ export default function Organizations() {
             })}
           </section>
         )}
+
+        {!loading && !err && nextUrl ? (
+          <div className="orgs__hintRow">
+            <button className="orgs__btnSmall" type="button" onClick={loadMore} disabled={loadingMore}>
+              {loadingMore ? "טוען..." : "עוד עמותות"}
+            </button>
+          </div>
+        ) : null}
       </div>
     </main>
   );
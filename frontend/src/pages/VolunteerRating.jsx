@@ -8,6 +8,7 @@ import "../styles/VolunteerRating.css";
 const EVENT_DETAILS_ENDPOINT = (eventId) => `/api/events/${eventId}/`;
 const SIGNUPS_ENDPOINT = (eventId) => `/api/events/${eventId}/signups/`;
 const SAVE_RATING_ENDPOINT = (eventId) => `/api/events/${eventId}/rate/`;
+const SAVE_RATINGS_BULK_ENDPOINT = (eventId) => `/api/events/${eventId}/rate-bulk/`;
 
 function asList(payload) {
   if (Array.isArray(payload)) return payload;
@@ -206,6 +207,23 @@ export default function VolunteerRating() {
   return "";
 }
 
+  // ✅ payload שמותאם ל-RateSignupSerializer שלך
+  function buildPayload(sid, r) {
+    const payload = {
+      signup_id: sid,
+      rating_reliability: Number(r.reliability),
+      rating_execution: Number(r.execution),
+      rating_teamwork: Number(r.teamwork),
+    };
+
+    // אופציונלי – רק אם מולא:
+    if (r.role) payload.role = r.role;
+    if (r.hours) payload.hours = r.hours;
+    if (r.taskDesc) payload.task_desc = r.taskDesc;
+    if (r.notes) payload.notes = r.notes;
+    return payload;
+  }
+
   async function saveOne(signup) {
     const sid = signup.id;
     console.log("SAVE CLICK", {
@@ -230,19 +248,7 @@ export default function VolunteerRating() {
     }));
 
     try {
-      // ✅ payload שמותאם ל-RateSignupSerializer שלך
-      const payload = {
-          signup_id: sid,
-          rating_reliability: Number(r.reliability),
-          rating_execution: Number(r.execution),
-          rating_teamwork: Number(r.teamwork),
-        };
-
-        // אופציונלי – רק אם מולא:
-        if (r.role) payload.role = r.role;
-        if (r.hours) payload.hours = r.hours;
-        if (r.taskDesc) payload.task_desc = r.taskDesc;
-        if (r.notes) payload.notes = r.notes;
+      const payload = buildPayload(sid, r);
 
       const res = await apiFetch(SAVE_RATING_ENDPOINT(eventId), {
         method: "POST",
@@ -313,11 +319,75 @@ export default function VolunteerRating() {
     // const targets = signups;
     const targets = signups.filter((s) => !ratings[s.id]?.saved);
 
+    // ✅ בקשה אחת לכל הדירוגים (rate-bulk); שגיאות מוחזרות לכל פריט בנפרד
+    const payloads = [];
+    const localErrors = {};
     for (const s of targets) {
-      // eslint-disable-next-line no-await-in-loop
-      await saveOne(s);
+      const r = ratings[s.id] || emptyRating();
+      const err = validateOne(r);
+      if (err) {
+        localErrors[s.id] = err;
+        continue;
+      }
+      payloads.push(buildPayload(s.id, r));
     }
 
+    setRatings((prev) => {
+      const next = { ...prev };
+      for (const p of payloads) {
+        next[p.signup_id] = { ...(next[p.signup_id] || emptyRating()), saving: true, error: "" };
+      }
+      for (const [sid, err] of Object.entries(localErrors)) {
+        next[sid] = { ...(next[sid] || emptyRating()), error: err };
+      }
+      return next;
+    });
+
+    if (!payloads.length) {
+      setSavingAll(false);
+      return;
+    }
+
+    let res = null;
+    let requestError = "";
+    try {
+      res = await apiFetch(SAVE_RATINGS_BULK_ENDPOINT(eventId), {
+        method: "POST",
+        body: payloads,
+      });
+    } catch (e) {
+      requestError = typeof e?.message === "string" ? e.message : "שמירה נכשלה";
+    }
+
+    setRatings((prev) => {
+      const next = { ...prev };
+
+      for (const p of payloads) {
+        next[p.signup_id] = {
+          ...(next[p.signup_id] || emptyRating()),
+          saving: false,
+          error: res ? "" : requestError,
+        };
+      }
+
+      for (const item of res?.results || []) {
+        const patch = { saved: true };
+        if (item.rating != null) patch.ratingAvg = item.rating;
+        if (item.rated_at != null) patch.ratedAt = item.rated_at;
+        next[item.signup_id] = { ...(next[item.signup_id] || emptyRating()), ...patch };
+      }
+
+      for (const item of res?.errors || []) {
+        if (item.signup_id == null) continue;
+        next[item.signup_id] = {
+          ...(next[item.signup_id] || emptyRating()),
+          error: Object.values(item.errors || {}).flat().join(" ") || "שמירה נכשלה",
+        };
+      }
+
+      return next;
+    });
+
     setSavingAll(false);
   }
 